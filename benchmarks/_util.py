@@ -0,0 +1,16 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+import time
+from typing import Any, Callable
+
+_UNITS = {"ms": 1e3, "us": 1e6}
+
+
+def timed(name: str, fn: Callable[[], Any], *, count: int = 1, unit: str = "ms") -> Any:
+    """Run `fn` once, and print its time (divided by `count`, for the time per operation)"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) / count
+    print(f"{name:<40}{elapsed * _UNITS[unit]:>10.1f}{unit}")
+    return result
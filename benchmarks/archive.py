@@ -0,0 +1,86 @@
+import json
+import os
+import random
+import tempfile
+
+import click
+from _util import timed
+
+from cfutils.api.archive import ArchiveWriter, SubmissionArchive
+from cfutils.api.decoders import decode
+from cfutils.api.objects import Submission
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--contests",
+    default=200,
+    show_default=True,
+    help="number of contests in the archive (copies of the data file)",
+)
+@click.option("--lookups", default=100, show_default=True)
+def benchmark(data_file: str, contests: int, lookups: int):
+    """Submissions of one team in one contest, for random (contest, team) pairs:
+    parsing the `contest.status` JSON file of the contest vs. a lookup in a `SubmissionArchive`.
+    """
+    with open(data_file) as inf:
+        data = json.load(inf)
+    handles = sorted(
+        {
+            member["handle"]
+            for sub in data["result"]
+            for member in sub["author"]["members"]
+        }
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "submissions.archive")
+        with ArchiveWriter(path) as writer:
+            for contestId in range(contests):
+                with open(
+                    os.path.join(tmpdir, f"status_{contestId}.json"), "w"
+                ) as outf:
+                    json.dump(data, outf)
+                writer.add(contestId, data["result"])
+        print(
+            f"{contests} contests, {len(data['result']) * contests} submissions, "
+            + f"archive: {os.path.getsize(path) >> 10} KiB"
+        )
+
+        rng = random.Random(0)
+        queries = [
+            (rng.randrange(contests), rng.choice(handles)) for _ in range(lookups)
+        ]
+
+        def from_json():
+            result = []
+            for contestId, handle in queries:
+                with open(os.path.join(tmpdir, f"status_{contestId}.json")) as inf:
+                    submissions = decode(list[Submission], json.load(inf)["result"])
+                result.append(
+                    [
+                        sub
+                        for sub in submissions
+                        if handle in [member.handle for member in sub.author.members]
+                    ]
+                )
+            return result
+
+        def from_archive():
+            with SubmissionArchive(path) as archive:
+                return [
+                    archive.submissions(contestId, handle=handle)
+                    for contestId, handle in queries
+                ]
+
+        expected = timed(f"{lookups} lookups: parse JSON files", from_json)
+        assert timed(f"{lookups} lookups: archive", from_archive) == expected
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
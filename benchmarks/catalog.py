@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+
+import click
+from _util import timed
+
+from cfutils.api.catalog import ProblemCatalog
+from cfutils.api.methods import Problemset_Problems
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/api/problemset.problems.json",
+    show_default=True,
+)
+@click.option("--queries", default=1000, show_default=True)
+def benchmark(data_file: str, queries: int):
+    """Filtered problem queries (tags, rating range, not solved): a `ProblemCatalog` vs. scanning the problem list.
+    Also reports the startup time: building the catalog from the JSON file vs. loading its snapshot.
+    """
+
+    def build():
+        return ProblemCatalog(
+            Problemset_Problems(tags=[]).get(load_from_file=data_file)
+        )
+
+    catalog = timed("startup: parse JSON and build", build, unit="us")
+    result = Problemset_Problems(tags=[]).get(load_from_file=data_file)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.snapshot")
+        catalog.save(path)
+        timed("startup: load snapshot", lambda: ProblemCatalog.load(path), unit="us")
+    print(f"{len(catalog)} problems")
+
+    rng = random.Random(0)
+    tags = catalog.tags()
+    solved = set(rng.sample(range(len(catalog)), len(catalog) // 5))
+    exclude = sum(1 << i for i in solved)
+    filters = [
+        (rng.sample(tags, rng.randrange(1, 3)), lo, lo + rng.randrange(0, 800, 100))
+        for lo in (rng.randrange(800, 3000, 100) for _ in range(queries))
+    ]
+
+    def scan():
+        return [
+            [
+                problem
+                for i, problem in enumerate(result.problems)
+                if all(tag in problem.tags for tag in query_tags)
+                and problem.rating is not None
+                and lo <= problem.rating <= hi
+                and i not in solved
+            ]
+            for query_tags, lo, hi in filters
+        ]
+
+    def query():
+        return [
+            catalog.query(
+                tags=query_tags, min_rating=lo, max_rating=hi, exclude=exclude
+            )
+            for query_tags, lo, hi in filters
+        ]
+
+    expected = timed("per query: scan", scan, count=queries, unit="us")
+    found = timed("per query: catalog", query, count=queries, unit="us")
+    assert found == expected
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
@@ -0,0 +1,110 @@
+import json
+import time
+import tracemalloc
+import typing
+from typing import Any, Callable
+
+import click
+
+from cfutils.api.decoders import decode
+from cfutils.api.methods_test import methodExamples
+
+
+def from_dict(resultType: Any, data: Any) -> Any:
+    """The previous parsing path: `from_dict` of dataclass_wizard."""
+    if typing.get_origin(resultType) is list:
+        baseType = typing.get_args(resultType)[0]
+        if baseType in (str, int):
+            return data
+        return [baseType.from_dict(elem) for elem in data]
+    return resultType.from_dict(data)
+
+
+PROJECTIONS: dict[str, list[str]] = {
+    "contest.status": [
+        "id",
+        "verdict",
+        "relativeTimeSeconds",
+        "problem.index",
+        "author.members",
+    ],
+    "user.ratedList": ["handle", "rating"],
+}
+"""Fields selected in the `fields=` benchmark"""
+
+
+def allocated(parse: Callable[[], Any]) -> int:
+    """Memory held by the result of `parse()`"""
+    tracemalloc.start()
+    result = parse()  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def run(parse: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@click.command()  # type: ignore
+@click.option("--datadir", default="data/examples/api", show_default=True)
+@click.option("--repeat", default=20, show_default=True, help="runs per method")
+def benchmark(datadir, repeat):
+    """Parse time (best of `repeat` runs) of the example API responses, using `from_dict` vs. the generated decoders.
+    Then, time and memory of decoding only some fields (`fields=`) of large results.
+    """
+    print(
+        f"{'method':<24}{'from_dict':>12}{'compiled':>12}{'trusted':>12}{'speedup':>10}"
+    )
+    for example in methodExamples.values():
+        method = example.method
+        resultType = method.resultType()
+        with open(f"{datadir}/{method.name()}.json") as inf:
+            data = json.load(inf)["result"]
+
+        times = [
+            run(lambda: from_dict(resultType, data), repeat),
+            run(lambda: decode(resultType, data), repeat),
+            run(lambda: decode(resultType, data, trusted=True), repeat),
+        ]
+        print(
+            f"{method.name():<24}"
+            + "".join(f"{t * 1000:>10.2f}ms" for t in times)
+            + f"{times[0] / times[2]:>9.1f}x"
+        )
+
+    print()
+    print(
+        f"{'method (fields=)':<24}{'full':>12}{'fields':>12}{'full':>12}{'fields':>12}"
+    )
+    for name, fields in PROJECTIONS.items():
+        with open(f"{datadir}/{name}.json") as inf:
+            data = json.load(inf)["result"]
+        resultType = next(
+            example.method.resultType()
+            for example in methodExamples.values()
+            if example.method.name() == name
+        )
+
+        def full():
+            return decode(resultType, data)
+
+        def projected():
+            return decode(resultType, data, fields=fields)
+
+        times = [run(full, repeat), run(projected, repeat)]
+        sizes = [allocated(full), allocated(projected)]
+        print(
+            f"{name:<24}"
+            + "".join(f"{t * 1000:>10.2f}ms" for t in times)
+            + "".join(f"{size // 1024:>9} KiB" for size in sizes)
+        )
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
@@ -0,0 +1,104 @@
+import dataclasses
+import json
+from typing import Any
+
+import click
+from _util import timed
+
+import cfutils.api as cf
+from cfutils.icpctools.event_encoders import serialize_event
+from cfutils.icpctools.event_feed import Event
+from cfutils.icpctools.feed_generator import CFContestConfig, EventFeedFromCFContest
+
+
+def serialize_asdict(event: Event) -> str:
+    """The previous serialization of `EventFeedFromCFContest`"""
+    return json.dumps(
+        dataclasses.asdict(
+            event,
+            dict_factory=lambda x: {
+                k: v for (k, v) in x if k in ["id", "icpc_id"] or v is not None
+            },
+        ),
+        default=lambda x: x.value,
+    )
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--status-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--standings-file",
+    default="data/examples/resolverfeed/standings_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=50,
+    show_default=True,
+    help="copies of the submissions",
+)
+def benchmark(status_file: str, standings_file: str, scale: int):
+    """Event feed serialization: `dataclasses.asdict` (the previous serializer) vs. the generated encoders of `cfutils.icpctools.event_encoders`.
+    Checks that both feeds are byte-for-byte equal.
+    """
+    standings = cf.Contest_Standings(
+        contestId=104491, From=1, count=1, showUnofficial=True
+    ).get(load_from_file=standings_file)
+    base = cf.Contest_Status(contestId=104491, From=1, count=1).get(
+        load_from_file=status_file
+    )
+    submissions = [
+        dataclasses.replace(sub, id=sub.id * scale + i)
+        for i in range(scale)
+        for sub in base
+    ]
+    print(f"{len(standings.rows)} teams, {len(submissions)} submissions")
+
+    events: list[Event] = []
+
+    class Recorder(EventFeedFromCFContest):
+        @staticmethod
+        def _serialize(event: Event) -> str:
+            events.append(event)
+            return ""
+
+    class Previous(EventFeedFromCFContest):
+        @staticmethod
+        def _serialize(event: Event) -> str:
+            return serialize_asdict(event)
+
+    config = CFContestConfig(
+        freezeDurationSeconds=60 * 60, include_virtual=True, include_out_of_comp=True
+    )
+    kwargs: dict[str, Any] = {
+        "contest": standings.contest,
+        "problems": standings.problems,
+        "ranklist": standings.rows,
+        "submissions": submissions,
+    }
+    Recorder(config=config).generate(**kwargs)
+    print(f"{len(events)} events")
+
+    expected = timed(
+        "serialize: asdict", lambda: [serialize_asdict(event) for event in events]
+    )
+    found = timed(
+        "serialize: generated encoders",
+        lambda: [serialize_event(event) for event in events],
+    )
+    assert found == expected
+
+    expected = timed("feed: asdict", lambda: Previous(config=config).generate(**kwargs))
+    found = timed(
+        "feed: generated encoders",
+        lambda: EventFeedFromCFContest(config=config).generate(**kwargs),
+    )
+    assert "\n".join(found).encode() == "\n".join(expected).encode()
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
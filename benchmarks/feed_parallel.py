@@ -0,0 +1,53 @@
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+import click
+from feed_scale import GroupsConfig, synthesize
+
+from cfutils.icpctools.feed_generator import EventFeedFromCFContest
+
+
+@click.command()  # type: ignore
+@click.option("--teams", default=10000, show_default=True)
+@click.option("--submissions", default=500000, show_default=True)
+@click.option(
+    "--processes",
+    default=",".join(str(n) for n in [1, 2, 4, 8] if n <= (os.cpu_count() or 1)),
+    show_default=True,
+    help="comma separated numbers of worker processes",
+)
+@click.option("--chunk-size", default=5000, show_default=True)
+def benchmark(teams: int, submissions: int, processes: str, chunk_size: int):
+    """Event feed of a synthetic contest (see `feed_scale.py`): sequential vs. serialized by a process pool.
+    Checks that the feeds are byte-for-byte equal.
+    """
+    print(f"{os.cpu_count()} CPUs, {teams} teams, {submissions} submissions")
+    standings, subs = synthesize(teams, submissions)
+    config = GroupsConfig(100)
+    kwargs: dict[str, Any] = {
+        "contest": standings.contest,
+        "problems": standings.problems,
+        "ranklist": standings.rows,
+        "submissions": subs,
+    }
+
+    def run(name: str, executor: Optional[ProcessPoolExecutor]) -> str:
+        out = io.StringIO()
+        start = time.perf_counter()
+        EventFeedFromCFContest(config=config).write(
+            out, executor=executor, chunk_size=chunk_size, **kwargs
+        )
+        print(f"{name:<40}{time.perf_counter() - start:>10.2f}s")
+        return out.getvalue()
+
+    expected = run("sequential", None)
+    for n in map(int, processes.split(",")):
+        with ProcessPoolExecutor(n) as executor:
+            assert run(f"{n} processes", executor) == expected
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
@@ -0,0 +1,331 @@
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+from typing import Any, Callable, Optional
+
+import click
+
+import cfutils.api as cf
+from cfutils.icpctools.feed_generator import (
+    CFContestConfig,
+    ContestTeam,
+    EventFeedFromCFContest,
+)
+
+_VERDICTS = [
+    (cf.Verdict.OK, 40),
+    (cf.Verdict.WRONG_ANSWER, 35),
+    (cf.Verdict.TIME_LIMIT_EXCEEDED, 10),
+    (cf.Verdict.RUNTIME_ERROR, 5),
+    (cf.Verdict.MEMORY_LIMIT_EXCEEDED, 2),
+    (cf.Verdict.COMPILATION_ERROR, 5),
+    (cf.Verdict.SKIPPED, 1),
+    (cf.Verdict.TESTING, 2),
+]
+
+_CHUNK = 10000
+
+
+def synthesize(
+    teams: int, submissions: int, problems: int = 13, seed: int = 0
+) -> tuple[cf.Contest_Standings.Result, list[cf.Submission]]:
+    """A random ICPC contest: its standings (CF teams, individuals, ghosts, and some virtual/practice parties) and submissions.
+
+    As with a shared `Interner`, the submissions of a party share its `Party` object.
+    """
+    rng = random.Random(seed)
+    duration = 5 * 60 * 60
+    contest = cf.Contest(
+        id=1,
+        name=f"Synthetic contest ({teams} teams)",
+        type=cf.ContestType.ICPC,
+        phase=cf.ContestPhase.FINISHED,
+        frozen=False,
+        durationSeconds=duration,
+    )
+    problem_list = [
+        cf.Problem(
+            index=chr(ord("A") + i) if i < 26 else f"Z{i}",
+            name=f"Problem {i}",
+            type=cf.ProblemType.PROGRAMMING,
+            tags=[],
+            contestId=contest.id,
+        )
+        for i in range(problems)
+    ]
+
+    parties = []
+    for i in range(teams):
+        participantType = rng.choices(
+            [
+                cf.ParticipantType.CONTESTANT,
+                cf.ParticipantType.VIRTUAL,
+                cf.ParticipantType.PRACTICE,
+            ],
+            [90, 8, 2],
+        )[0]
+        kind = rng.randrange(10)
+        if kind < 4:
+            party = cf.Party(
+                members=[cf.Member(handle=f"user{i}_{j}") for j in range(3)],
+                participantType=participantType,
+                contestId=contest.id,
+                teamId=i,
+                teamName=f"team {i}",
+            )
+        elif kind < 5:
+            party = cf.Party(
+                members=[],
+                participantType=cf.ParticipantType.CONTESTANT,
+                contestId=contest.id,
+                teamName=f"ghost {i}",
+                ghost=True,
+            )
+        else:
+            party = cf.Party(
+                members=[cf.Member(handle=f"user{i}")],
+                participantType=participantType,
+                contestId=contest.id,
+            )
+        parties.append(party)
+
+    verdicts, weights = zip(*_VERDICTS)
+    submission_list = []
+    for i in range(submissions):
+        time = rng.randrange(duration)
+        submission_list.append(
+            cf.Submission(
+                id=i + 1,
+                creationTimeSeconds=time,
+                relativeTimeSeconds=time,
+                problem=rng.choice(problem_list),
+                author=rng.choice(parties),
+                programmingLanguage="GNU C++17",
+                testset=cf.Testset.TESTS,
+                passedTestCount=0,
+                timeConsumedMillis=0,
+                memoryConsumedBytes=0,
+                verdict=rng.choices(verdicts, weights)[0],
+                contestId=contest.id,
+            )
+        )
+    submission_list.sort(key=lambda sub: sub.relativeTimeSeconds)
+
+    rows = [
+        cf.RanklistRow(
+            party=party,
+            rank=i + 1,
+            points=0.0,
+            penalty=0,
+            successfulHackCount=0,
+            unsuccessfulHackCount=0,
+            problemResults=[],
+        )
+        for i, party in enumerate(parties)
+    ]
+    standings = cf.Contest_Standings.Result(
+        contest=contest, problems=problem_list, rows=rows
+    )
+    return standings, submission_list
+
+
+class GroupsConfig(CFContestConfig):
+    """Many groups (e.g. one per institute), each team in one of them"""
+
+    def __init__(self, groups: int):
+        super().__init__(
+            freezeDurationSeconds=60 * 60,
+            include_virtual=True,
+            include_out_of_comp=True,
+        )
+        self._groups = [f"group {i}" for i in range(groups)]
+
+    @property
+    def groups(self) -> list[str]:
+        return self._groups
+
+    def getGroups(self, team: ContestTeam) -> list[str]:
+        return [self._groups[zlib.crc32(team.Id.encode()) % len(self._groups)]]
+
+
+def phases(
+    standings: cf.Contest_Standings.Result,
+    submissions: list[cf.Submission],
+    config: CFContestConfig,
+) -> dict[str, float]:
+    """Time of each phase of `EventFeedFromCFContest.generate`, in seconds"""
+    gen = EventFeedFromCFContest(config=config)
+    result: dict[str, float] = {}
+
+    def phase(name: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        value = fn()
+        result[name] = time.perf_counter() - start
+        return value
+
+    ranklist, subs = phase(
+        "filter",
+        lambda: (
+            [
+                row
+                for row in standings.rows
+                if gen._participantAllowed(row.party.participantType)
+            ],
+            [
+                sub
+                for sub in submissions
+                if gen._participantAllowed(sub.author.participantType)
+            ],
+        ),
+    )
+    phase("populate teams", lambda: gen._populate_teams(ranklist))
+
+    def team_events():
+        gen._add_contest_events(standings.contest, standings.problems)
+        for row in ranklist:
+            gen._add_team_event(row.party)
+
+    phase("team events", team_events)
+    phase("serialize", lambda: sum(1 for _ in gen._flush()))
+
+    # serialize in chunks, so that the events of all submissions are not in memory at once
+    result["submission events"] = 0.0
+    for i in range(0, len(subs), _CHUNK):
+        start = time.perf_counter()
+        for sub in subs[i : i + _CHUNK]:
+            gen._add_submission_events(sub)
+        middle = time.perf_counter()
+        sum(1 for _ in gen._flush())
+        result["submission events"] += middle - start
+        result["serialize"] += time.perf_counter() - middle
+    return result
+
+
+def measure(
+    standings: cf.Contest_Standings.Result,
+    submissions: list[cf.Submission],
+    config: CFContestConfig,
+    memory: bool,
+) -> dict[str, float]:
+    result = phases(standings, submissions, config)
+
+    kwargs: dict[str, Any] = {
+        "contest": standings.contest,
+        "problems": standings.problems,
+        "ranklist": standings.rows,
+        "submissions": submissions,
+    }
+
+    def write():
+        with open(os.devnull, "w") as out:
+            EventFeedFromCFContest(config=config).write(out, **kwargs)
+
+    def generate():
+        EventFeedFromCFContest(config=config).generate(**kwargs)
+
+    for name, fn in [("write", write), ("generate", generate)]:
+        start = time.perf_counter()
+        fn()
+        result[name] = time.perf_counter() - start
+        if memory:
+            tracemalloc.start()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result[f"{name} peak MiB"] = peak / (1 << 20)
+    return result
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--sizes",
+    default="1000:20000,10000:200000,100000:2000000",
+    show_default=True,
+    help="comma separated `teams:submissions` contest sizes",
+)
+@click.option("--problems", default=13, show_default=True)
+@click.option(
+    "--groups",
+    default=1000,
+    show_default=True,
+    help="number of team groups in the config",
+)
+@click.option(
+    "--memory/--no-memory",
+    default=True,
+    show_default=True,
+    help="also measure the peak memory (traced, so slower)",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="write the results to this JSON file",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False, exists=True),
+    default=None,
+    help="results of an earlier run (see --output): report (and fail on) regressions",
+)
+@click.option(
+    "--tolerance",
+    default=1.25,
+    show_default=True,
+    help="ratio to the baseline above which a result is a regression",
+)
+def benchmark(
+    sizes: str,
+    problems: int,
+    groups: int,
+    memory: bool,
+    output: Optional[str],
+    baseline: Optional[str],
+    tolerance: float,
+):
+    """Time (and peak memory) of each phase of the event feed generation, on synthetic contests of increasing sizes.
+
+    Times should grow linearly with the size of the contest. Save the results of a release with `--output`,
+    and compare later versions with `--baseline`.
+    """
+    config = GroupsConfig(groups)
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes.split(","):
+        teams, submissions = map(int, size.split(":"))
+        standings, subs = synthesize(teams, submissions, problems)
+        results[size] = measure(standings, subs, config, memory)
+
+        print(f"{teams} teams, {submissions} submissions")
+        for name, value in results[size].items():
+            unit = "" if name.endswith("MiB") else "s"
+            print(f"  {name:<30}{value:>10.3f}{unit}")
+
+    if output is not None:
+        with open(output, "w") as outf:
+            json.dump(results, outf, indent=2)
+
+    if baseline is not None:
+        with open(baseline) as inf:
+            previous: dict[str, dict[str, float]] = json.load(inf)
+        regressions = [
+            f"{size} {name}: {previous[size][name]:.3f} -> {value:.3f}"
+            for size, values in results.items()
+            for name, value in values.items()
+            if name in previous.get(size, {})
+            and value > tolerance * previous[size][name]
+            # too short to be measured reliably
+            and value - previous[size][name] > 0.05
+        ]
+        print(f"{len(regressions)} regressions (tolerance {tolerance}x)")
+        for regression in regressions:
+            print(f"  {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
@@ -0,0 +1,109 @@
+import dataclasses
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import click
+
+import cfutils.api as cf
+from cfutils.icpctools.feed_generator import CFContestConfig, EventFeedFromCFContest
+
+
+def measured(name: str, fn: Callable[[], None]):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<40}{elapsed * 1000:>10.1f}ms{peak >> 10:>12} KiB peak")
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--status-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--standings-file",
+    default="data/examples/resolverfeed/standings_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=100,
+    show_default=True,
+    help="copies of the submissions",
+)
+def benchmark(status_file: str, standings_file: str, scale: int):
+    """Event feed of a contest: `generate` (and writing the returned list) vs. streaming it with `write`.
+    The feed is discarded, and the peak memory excludes the submissions,
+    except when they are streamed from the response with `Contest_Status.stream` (without an `Interner`, so each submission has its own `Party`).
+    """
+    standings = cf.Contest_Standings(
+        contestId=104491, From=1, count=1, showUnofficial=True
+    ).get(load_from_file=standings_file)
+    base = cf.Contest_Status(contestId=104491, From=1, count=1).get(
+        load_from_file=status_file
+    )
+    submissions = [
+        dataclasses.replace(sub, id=sub.id * scale + i)
+        for i in range(scale)
+        for sub in base
+    ]
+    print(f"{len(standings.rows)} teams, {len(submissions)} submissions")
+
+    config = CFContestConfig(
+        freezeDurationSeconds=60 * 60, include_virtual=True, include_out_of_comp=True
+    )
+    kwargs: dict[str, Any] = {
+        "contest": standings.contest,
+        "problems": standings.problems,
+        "ranklist": standings.rows,
+        "submissions": submissions,
+    }
+
+    def generate():
+        with open(os.devnull, "w") as out:
+            for event in EventFeedFromCFContest(config=config).generate(**kwargs):
+                out.write(event)
+                out.write("\n")
+
+    def write():
+        with open(os.devnull, "w") as out:
+            EventFeedFromCFContest(config=config).write(out, **kwargs)
+
+    with open(status_file) as inf:
+        items = json.load(inf)["result"]
+    with tempfile.TemporaryDirectory() as tmp:
+        response = os.path.join(tmp, "status.json")
+        with open(response, "w") as outf:
+            result = [
+                {**item, "id": item["id"] * scale + i}
+                for i in range(scale)
+                for item in items
+            ]
+            json.dump({"status": "OK", "result": result}, outf)
+            del result
+
+        def write_streamed():
+            submissions = cf.Contest_Status(contestId=104491, From=1, count=1).stream(
+                load_from_file=response
+            )
+            with open(os.devnull, "w") as out:
+                EventFeedFromCFContest(config=config).write(
+                    out, **(kwargs | {"submissions": submissions})
+                )
+
+        measured("generate", generate)
+        measured("write (streaming)", write)
+        measured("write (streamed from the response)", write_streamed)
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
@@ -0,0 +1,79 @@
+import dataclasses
+import functools
+import json
+import tracemalloc
+import typing
+from typing import Any
+
+import click
+
+from cfutils.api.decoders import Interner, decode
+from cfutils.api.objects import Submission
+
+
+@functools.cache
+def unslotted(tp: Any) -> Any:
+    """Copy of the type `tp` where all dataclasses keep their fields in a per-instance `__dict__`,
+    like `cfutils.api.objects` did before using `slots=True`.
+    """
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, list):
+        return origin[tuple(unslotted(arg) for arg in typing.get_args(tp))]
+    if not (isinstance(tp, type) and dataclasses.is_dataclass(tp)):
+        return tp
+
+    hints = typing.get_type_hints(tp)
+    return dataclasses.make_dataclass(
+        tp.__name__,
+        [(f.name, unslotted(hints[f.name]), f) for f in dataclasses.fields(tp)],
+    )
+
+
+def bytes_per_item(tp: Any, data: list, interner: Interner | None = None) -> float:
+    """Memory allocated per element when decoding `data` into `list[tp]`."""
+    # generate the decoder before measuring
+    decoder = interner.decoder_for(list[tp]) if interner else decode_list(tp)
+
+    tracemalloc.start()
+    result = decoder(data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(result) == len(data)
+    return size / len(data)
+
+
+def decode_list(tp: Any):
+    return lambda data: decode(list[tp], data)
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=1,
+    show_default=True,
+    help="repeat the submissions this many times",
+)
+def benchmark(data_file: str, scale: int):
+    """Memory used per decoded `Submission` (with its `Party`, `Member` and `Problem`):
+    with and without `__slots__`, and sharing equal objects using an `Interner`.
+    """
+    with open(data_file) as inf:
+        data = json.load(inf)["result"] * scale
+
+    variants = {
+        "__dict__": bytes_per_item(unslotted(Submission), data),
+        "__slots__": bytes_per_item(Submission, data),
+        "interned": bytes_per_item(Submission, data, Interner()),
+    }
+    for name, size in variants.items():
+        print(f"{name:<12}{size:>10.0f} bytes/submission")
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
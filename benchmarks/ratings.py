@@ -0,0 +1,95 @@
+import json
+import random
+import tracemalloc
+
+import click
+from _util import timed
+
+from cfutils.api.decoders import decode
+from cfutils.api.objects import RatingChange
+from cfutils.api.ratings import RatingWarehouse
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/api/contest.ratingChanges.json",
+    show_default=True,
+)
+@click.option(
+    "--contests",
+    default=500,
+    show_default=True,
+    help="number of contests (copies of the rating changes in the data file)",
+)
+@click.option("--queries", default=100000, show_default=True)
+def benchmark(data_file: str, contests: int, queries: int):
+    """Rating of a handle at a time: a `RatingWarehouse` vs. per-handle lists of `RatingChange` objects (like `user.rating` results).
+    Also reports the memory of both.
+    """
+    with open(data_file) as inf:
+        base = json.load(inf)["result"]
+    week = 7 * 24 * 60 * 60
+    changes = {
+        contestId: [
+            {
+                **c,
+                "contestId": contestId,
+                "ratingUpdateTimeSeconds": c["ratingUpdateTimeSeconds"]
+                + contestId * week,
+            }
+            for c in base
+        ]
+        for contestId in range(contests)
+    }
+    print(f"{contests} contests, {len(base)} handles")
+
+    def build_lists():
+        histories: dict[str, list[RatingChange]] = {}
+        for contest in changes.values():
+            for c in decode(list[RatingChange], contest):
+                histories.setdefault(c.handle, []).append(c)
+        return histories
+
+    def build_warehouse():
+        warehouse = RatingWarehouse()
+        for contestId, contest in changes.items():
+            warehouse.add(contestId, decode(list[RatingChange], contest))
+        return warehouse
+
+    histories = timed("build: lists", build_lists)
+    warehouse = timed("build: warehouse", build_warehouse)
+    for name, build in [("lists", build_lists), ("warehouse", build_warehouse)]:
+        tracemalloc.start()
+        built = build()  # noqa: F841
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{'memory: ' + name:<40}{size >> 10:>8} KiB")
+
+    rng = random.Random(0)
+    start = base[0]["ratingUpdateTimeSeconds"]
+    points = [
+        (rng.choice(base)["handle"], rng.randrange(start, start + contests * week))
+        for _ in range(queries)
+    ]
+
+    def scan():
+        result = []
+        for handle, at in points:
+            rating = None
+            for c in histories[handle]:
+                if c.ratingUpdateTimeSeconds > at:
+                    break
+                rating = c.newRating
+            result.append(rating)
+        return result
+
+    def query():
+        return [warehouse.rating(handle, at) for handle, at in points]
+
+    expected = timed(f"{queries} queries: scan lists", scan)
+    assert timed(f"{queries} queries: warehouse", query) == expected
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
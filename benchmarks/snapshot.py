@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable
+
+import click
+
+from cfutils.api.decoders import Interner
+from cfutils.api.methods import Contest_Status
+from cfutils.api.snapshot import load_snapshot
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=100,
+    show_default=True,
+    help="repeat the submissions this many times",
+)
+@click.option("--repeat", default=3, show_default=True)
+def benchmark(data_file: str, scale: int, repeat: int):
+    """Reload time of a `contest.status` response:
+    parsing the JSON file (`load_from_file`) vs. loading a binary snapshot of the parsed result (`snapshot`).
+    """
+    method = Contest_Status(contestId=104491, From=1, count=10000)
+    with open(data_file) as inf:
+        data = json.load(inf)
+    data["result"] *= scale
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = os.path.join(tmpdir, "status.json")
+        with open(source, "w") as outf:
+            json.dump(data, outf)
+        print(f"{len(data['result'])} submissions, {os.path.getsize(source) >> 10} KiB")
+
+        print(f"{'':<12}{'json':>12}{'snapshot':>12}{'size':>14}{'speedup':>10}")
+        for name, interned in [("plain", False), ("interned", True)]:
+            path = os.path.join(tmpdir, f"{name}.snapshot")
+
+            def parse():
+                return method.get(
+                    load_from_file=source, interner=Interner() if interned else None
+                )
+
+            method.get(
+                load_from_file=source,
+                interner=Interner() if interned else None,
+                snapshot=path,
+            )
+            snapshot = best_of(
+                lambda: load_snapshot(
+                    path,
+                    method.resultType(),
+                    request=method.canonicalRequest(),
+                    source=source,
+                ),
+                repeat,
+            )
+            parsed = best_of(parse, repeat)
+            print(
+                f"{name:<12}{parsed * 1000:>10.1f}ms{snapshot * 1000:>10.1f}ms"
+                + f"{os.path.getsize(path) >> 10:>10} KiB{parsed / snapshot:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
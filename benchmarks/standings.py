@@ -0,0 +1,98 @@
+import bisect
+import dataclasses
+import time
+from typing import Callable
+
+import click
+
+import cfutils.api as cf
+from cfutils.icpctools.standings import StandingsEngine
+
+
+def per_update(name: str, fn: Callable[[], None], count: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40}{elapsed / count * 1e6:>10.1f}us per submission")
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--status-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--standings-file",
+    default="data/examples/resolverfeed/standings_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=500,
+    show_default=True,
+    help="copies of the teams (and their submissions)",
+)
+@click.option(
+    "--recompute",
+    "recompute_count",
+    default=200,
+    show_default=True,
+    help="number of submissions for the full recomputation, which is slow",
+)
+def benchmark(status_file: str, standings_file: str, scale: int, recompute_count: int):
+    """Rank of a team after each of its submissions, in time order:
+    incremental `StandingsEngine` vs. sorting all the teams after each submission.
+    """
+    standings = cf.Contest_Standings(contestId=104491, From=1, count=1).get(
+        load_from_file=standings_file
+    )
+    base = cf.Contest_Status(contestId=104491, From=1, count=1).get(
+        load_from_file=status_file
+    )
+
+    def copy(party: cf.Party, i: int) -> cf.Party:
+        members = [cf.Member(handle=f"{m.handle}#{i}") for m in party.members]
+        name = party.teamName and f"{party.teamName}#{i}"
+        return dataclasses.replace(party, members=members, teamName=name)
+
+    parties = [copy(row.party, i) for i in range(scale) for row in standings.rows]
+    submissions = sorted(
+        (
+            dataclasses.replace(sub, id=sub.id * scale + i, author=copy(sub.author, i))
+            for i in range(scale)
+            for sub in base
+        ),
+        key=lambda sub: sub.relativeTimeSeconds,
+    )
+    print(f"{len(parties)} teams, {len(submissions)} submissions")
+
+    def fresh() -> StandingsEngine:
+        engine = StandingsEngine(standings.problems)
+        for party in parties:
+            engine.add_party(party)
+        return engine
+
+    def incremental():
+        engine = fresh()
+        for sub in submissions:
+            engine.add(sub)
+            engine.rank(sub.author)
+
+    def recompute():
+        engine = fresh()
+        scores = {cf.party_key(party): (0.0, 0) for party in parties}
+        for sub in submissions[:count]:
+            engine.add(sub)
+            row = engine.row(sub.author)
+            scores[cf.party_key(sub.author)] = (-row.points, row.penalty)
+            ranking = sorted(scores.values())
+            bisect.bisect_left(ranking, scores[cf.party_key(sub.author)])
+
+    count = min(recompute_count, len(submissions))
+    per_update("incremental engine", incremental, len(submissions))
+    per_update("sort all teams", recompute, count)
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+from collections import Counter
+
+import click
+from _util import timed
+
+from cfutils.api.decoders import decode
+from cfutils.api.objects import Submission
+from cfutils.api.store import Store, problem_key
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=100,
+    show_default=True,
+    help="repeat the submissions this many times (with new ids)",
+)
+def benchmark(data_file: str, scale: int):
+    """Verdicts per problem: parsing the `contest.status` JSON file vs. a SQL query on a `Store`.
+    Also reports the time to upsert the submissions in the store.
+    """
+    with open(data_file) as inf:
+        data = json.load(inf)
+    base = data["result"]
+    data["result"] = [
+        {**sub, "id": sub["id"] + copy * 10**9}
+        for copy in range(scale)
+        for sub in base
+    ]
+    print(f"{len(data['result'])} submissions")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = os.path.join(tmpdir, "status.json")
+        with open(source, "w") as outf:
+            json.dump(data, outf)
+
+        submissions = decode(list[Submission], data["result"])
+        store = Store(os.path.join(tmpdir, "store.sqlite"))
+        timed("upsert submissions", lambda: store.add(submissions))
+
+        def from_json():
+            with open(source) as inf:
+                subs = decode(list[Submission], json.load(inf)["result"])
+            return Counter(
+                (problem_key(sub.problem), sub.verdict and sub.verdict.value)
+                for sub in subs
+            )
+
+        def from_store():
+            rows = store.connection.execute(
+                "SELECT problem, verdict, COUNT(*) FROM submissions"
+                " WHERE contestId = ? GROUP BY problem, verdict",
+                [104491],
+            )
+            return Counter({(problem, verdict): n for problem, verdict, n in rows})
+
+        expected = timed("verdicts per problem: parse JSON", from_json)
+        assert timed("verdicts per problem: SQL", from_store) == expected
+        store.close()
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
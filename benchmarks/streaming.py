@@ -0,0 +1,81 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import typing
+
+import click
+
+from cfutils.api.methods_test import methodExamples
+
+
+def peak_rss_kib(mode: str, name: str, data_file: str) -> int:
+    """Run one decode in a fresh interpreter, and return its peak RSS."""
+    out = subprocess.run(
+        [sys.executable, __file__, "run", mode, name, data_file],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return int(out.stdout)
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.argument("mode", type=click.Choice(["baseline", "get", "stream"]))
+@click.argument("name")
+@click.argument("data_file")
+def run(mode, name, data_file):
+    """(internal) decode one file and print the peak RSS in KiB."""
+    method = methodExamples[name].method
+
+    count = 0
+    if mode == "get":
+        count = len(method.get(load_from_file=data_file))
+    elif mode == "stream":
+        for _ in method.stream(load_from_file=data_file):
+            count += 1
+
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+@cli.command()
+@click.option("--datadir", default="data/examples/api", show_default=True)
+@click.option(
+    "--scale",
+    default=1,
+    show_default=True,
+    help="repeat the result list of each response this many times",
+)
+def benchmark(datadir, scale):
+    """Peak RSS of `get()` (whole response) vs. `stream()` (one element at a time) on the example API responses.
+    Reported as the increase over an interpreter that only imports cfutils.
+    """
+    print(f"{'method':<24}{'size':>12}{'get':>12}{'stream':>12}")
+    for name, example in methodExamples.items():
+        method = example.method
+        if typing.get_origin(method.resultType()) is not list:
+            continue
+
+        with open(f"{datadir}/{method.name()}.json") as inf:
+            data = json.load(inf)
+        data["result"] *= scale
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as outf:
+            json.dump(data, outf, indent=2)
+        size = os.path.getsize(outf.name) // 1024
+
+        baseline = peak_rss_kib("baseline", name, outf.name)
+        get = peak_rss_kib("get", name, outf.name) - baseline
+        stream = peak_rss_kib("stream", name, outf.name) - baseline
+        os.unlink(outf.name)
+        print(f"{method.name():<24}{size:>8} KiB{get:>8} KiB{stream:>8} KiB")
+
+
+if __name__ == "__main__":
+    cli()
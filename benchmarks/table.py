@@ -0,0 +1,72 @@
+import json
+from collections import Counter
+
+import click
+from _util import timed
+
+from cfutils.api.decoders import Interner
+from cfutils.api.objects import Submission, Verdict
+from cfutils.api.table import SubmissionTable
+
+
+def count_verdicts(submissions: list[Submission]) -> Counter:
+    return Counter((sub.problem.index, sub.verdict) for sub in submissions)
+
+
+def first_accepted(submissions: list[Submission]) -> dict:
+    first: dict = {}
+    for sub in sorted(submissions, key=lambda sub: sub.relativeTimeSeconds):
+        if sub.verdict == Verdict.OK:
+            first.setdefault((id(sub.author), sub.problem.index), sub)
+    return first
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--data-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--scale",
+    default=2000,
+    show_default=True,
+    help="repeat the submissions this many times",
+)
+def benchmark(data_file: str, scale: int):
+    """Per-problem verdict counts and per-team first accepted submissions:
+    Python loops over `Submission` objects vs. a columnar `SubmissionTable`.
+    Both share the parties and problems using an `Interner`.
+    """
+    with open(data_file) as inf:
+        data = json.load(inf)["result"] * scale
+    print(f"{len(data)} submissions")
+
+    interner = Interner()
+    table = timed(
+        "build SubmissionTable",
+        lambda: SubmissionTable.from_json(data, interner=Interner()),
+    )
+    submissions = timed(
+        "decode list[Submission]",
+        lambda: interner.decode(list[Submission], data),
+    )
+
+    expected = timed(
+        "objects: verdicts per problem", lambda: count_verdicts(submissions)
+    )
+    counts = timed(
+        "table: verdicts per problem", lambda: table.count_by("index", "verdict")
+    )
+    assert counts == expected
+
+    expected = timed("objects: first AC per team", lambda: first_accepted(submissions))
+    first = timed(
+        "table: first AC per team",
+        lambda: table.where(verdict=Verdict.OK).first_by("party", "index"),
+    )
+    assert len(first) == len(expected)
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
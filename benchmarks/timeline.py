@@ -0,0 +1,61 @@
+import random
+
+import click
+from _util import timed
+
+import cfutils.api as cf
+from cfutils.icpctools.standings import StandingsEngine, StandingsTimeline
+
+
+@click.command()  # type: ignore
+@click.option(
+    "--status-file",
+    default="data/examples/resolverfeed/status_104491.json",
+    show_default=True,
+)
+@click.option(
+    "--standings-file",
+    default="data/examples/resolverfeed/standings_104491.json",
+    show_default=True,
+)
+@click.option("--queries", default=200, show_default=True)
+def benchmark(status_file: str, standings_file: str, queries: int):
+    """Rank of a team at a random time: a `StandingsTimeline` vs. replaying the submissions up to that time in a `StandingsEngine`."""
+    standings = cf.Contest_Standings(contestId=104491, From=1, count=1).get(
+        load_from_file=standings_file
+    )
+    submissions = cf.Contest_Status(contestId=104491, From=1, count=1).get(
+        load_from_file=status_file
+    )
+    parties = [row.party for row in standings.rows]
+    rng = random.Random(0)
+    points = [
+        (rng.choice(parties), rng.randrange(standings.contest.durationSeconds))
+        for _ in range(queries)
+    ]
+    print(f"{len(parties)} teams, {len(submissions)} submissions")
+
+    def replay():
+        ranks = []
+        for party, at in points:
+            engine = StandingsEngine(standings.problems)
+            for p in parties:
+                engine.add_party(p)
+            engine.extend(sub for sub in submissions if sub.relativeTimeSeconds <= at)
+            ranks.append(engine.rank(party))
+        return ranks
+
+    timeline = timed(
+        "build: timeline",
+        lambda: StandingsTimeline(standings.problems, parties, submissions),
+    )
+    expected = timed(f"{queries} queries: replay", replay)
+    ranks = timed(
+        f"{queries} queries: timeline",
+        lambda: [timeline.rank(party, at) for party, at in points],
+    )
+    assert ranks == expected
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
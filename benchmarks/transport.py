@@ -0,0 +1,83 @@
+import functools
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import click
+
+from cfutils.api.transport import CurlTransport, HTTPTransport, Transport
+
+
+def serve_directory(datadir: str) -> ThreadingHTTPServer:
+    """Local stand-in for the CF API: serves `<datadir>/<method>.json` at `/api/<method>`."""
+
+    @functools.cache
+    def load(method: str, compress: bool) -> bytes:
+        with open(f"{datadir}/{method}.json", "rb") as inf:
+            body = inf.read()
+        return gzip.compress(body) if compress else body
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            method = self.path.split("?")[0].removeprefix("/api/")
+            compress = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = load(method, compress)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run(transport: Transport, url: str, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        with transport.open(url) as body:
+            data = json.load(body)
+        assert data["status"] == "OK"
+    return (time.perf_counter() - start) / calls
+
+
+@click.command()  # type: ignore
+@click.option("--datadir", default="data/examples/api", show_default=True)
+@click.option("--calls", default=50, show_default=True, help="calls per method")
+def benchmark(datadir, calls):
+    """Compare the pooled in-process transport with the `curl` subprocess backend."""
+    httpd = serve_directory(datadir)
+    base = f"http://127.0.0.1:{httpd.server_port}/api"
+
+    transports: dict[str, Transport] = {
+        "curl": CurlTransport(),
+        "http": HTTPTransport(compress=False),
+        "http+gzip": HTTPTransport(),
+    }
+
+    print(f"{'method':<24}" + "".join(f"{name:>12}" for name in transports))
+    for method in [
+        "user.info",
+        "contest.standings",
+        "contest.status",
+        "user.ratedList",
+    ]:
+        times = [run(t, f"{base}/{method}", calls) for t in transports.values()]
+        print(f"{method:<24}" + "".join(f"{t * 1000:>10.2f}ms" for t in times))
+
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    benchmark()  # type: ignore
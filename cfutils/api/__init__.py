@@ -1,2 +1,15 @@
 from cfutils.api.objects import *
+from cfutils.api.decoders import *
 from cfutils.api.methods import *
+from cfutils.api.store import *
+from cfutils.api.ratings import *
+from cfutils.api.catalog import *
+from cfutils.api.cache import *
+from cfutils.api.memo import *
+from cfutils.api.snapshot import *
+from cfutils.api.streaming import *
+from cfutils.api.table import *
+from cfutils.api.archive import *
+from cfutils.api.sync import *
+from cfutils.api.ratelimit import *
+from cfutils.api.transport import *
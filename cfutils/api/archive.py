@@ -0,0 +1,273 @@
+"""
+Memory-mapped archive of the submissions of many contests, indexed by contest, party and problem.
+
+Lookups only read (and decode) the matching submissions, instead of loading and parsing a whole `contest.status` response per contest.
+
+File layout (integers are little-endian):
+
+- header: magic, then the offset and length of the directory (`<QQ`).
+- records: the submissions, each as compact JSON, contest by contest.
+- offsets: the start of every record, and the end of the last one (`<Q` each).
+- per contest: an index of its records by member handle, team name and problem index, which is read in place (see :func:`_index_block`).
+- directory: the offset of the offsets table, and for every contest its records, and the position and number of entries of its index (JSON).
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from cfutils.api.decoders import Interner, decoder_for, encoder_for
+from cfutils.api.objects import Submission
+
+_MAGIC = b"cfutils-archive\n"
+_HEADER = struct.Struct("<QQ")
+_OFFSET = struct.Struct("<Q")
+_OFFSETS = struct.Struct("<QQ")
+_ENTRY = struct.Struct("<IIII")
+_VERSION = 2
+
+_KINDS = {"handles": b"h", "teams": b"t", "problems": b"p"}
+"""Prefix of the index keys of each kind of value"""
+
+
+def _index_block(records: dict[bytes, list[int]]) -> bytes:
+    """Index of the records of a contest, by key (a prefix from `_KINDS`, then the value in UTF-8).
+
+    Layout: one fixed-width entry per key (`<IIII`: offset and length of the key, offset and number of its records),
+    sorted by key, so that a lookup is a binary search; then the keys and the lists of record numbers (`<I` each).
+    Offsets are relative to the start of the block.
+    """
+    keys = sorted(records)
+    entries = bytearray()
+    data = bytearray()
+    base = len(keys) * _ENTRY.size
+    for key in keys:
+        numbers = array("I", records[key])
+        if sys.byteorder != "little":
+            numbers.byteswap()
+        key_at = base + len(data)
+        data += key
+        entries += _ENTRY.pack(key_at, len(key), base + len(data), len(numbers))
+        data += numbers.tobytes()
+    return bytes(entries + data)
+
+
+class ArchiveWriter:
+    """Writes a :class:`SubmissionArchive`, one contest at a time. The file is replaced atomically when the writer is closed.
+
+    Example:
+
+    .. code::
+
+        with ArchiveWriter("submissions.archive") as writer:
+            for contestId in contestIds:
+                with open(f"status_{contestId}.json") as inf:
+                    writer.add(contestId, json.load(inf)["result"])
+
+    Args:
+        path: archive file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd, self._tmp = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", suffix=".tmp"
+        )
+        self._out = os.fdopen(self._fd, "wb")
+        self._out.write(_MAGIC + _HEADER.pack(0, 0))
+        self._offsets = array("Q", [self._out.tell()])
+        self._contests: dict[str, list[int]] = {}
+        self._indexes: list[tuple[str, int, bytes]] = []
+
+    def add(self, contestId: int, submissions: Iterable[Submission | dict]):
+        """Append the submissions of a contest, as `Submission` objects or JSON (like the result of `contest.status`)."""
+        key = str(contestId)
+        if key in self._contests:
+            raise ValueError(f"contest {contestId} is already in the archive")
+
+        first = len(self._offsets) - 1
+        records: dict[bytes, list[int]] = {}
+
+        def index(kind: str, value: str, i: int):
+            records.setdefault(_KINDS[kind] + value.encode("utf-8"), []).append(i)
+
+        encode = encoder_for(Submission)
+        for i, sub in enumerate(submissions):
+            data = encode(sub) if isinstance(sub, Submission) else sub
+            author = data["author"]
+            for member in author["members"]:
+                index("handles", member["handle"], i)
+            if author.get("teamName") is not None:
+                index("teams", author["teamName"], i)
+            index("problems", data["problem"]["index"], i)
+
+            self._out.write(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+            self._offsets.append(self._out.tell())
+
+        self._contests[key] = [first, len(self._offsets) - 1]
+        self._indexes.append((key, len(records), _index_block(records)))
+
+    def close(self):
+        """Write the indexes, and move the archive to `path`."""
+        offsets = self._out.tell()
+        if sys.byteorder != "little":
+            self._offsets.byteswap()
+        self._out.write(self._offsets.tobytes())
+
+        for key, entries, block in self._indexes:
+            self._contests[key] += [self._out.tell(), entries]
+            self._out.write(block)
+
+        directory = self._out.tell()
+        payload = {"version": _VERSION, "offsets": offsets, "contests": self._contests}
+        self._out.write(json.dumps(payload).encode("utf-8"))
+        size = self._out.tell() - directory
+        self._out.seek(len(_MAGIC))
+        self._out.write(_HEADER.pack(directory, size))
+        self._out.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """Discard the archive."""
+        self._out.close()
+        os.unlink(self._tmp)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class SubmissionArchive:
+    """Read-only, memory-mapped archive of submissions written by :class:`ArchiveWriter`.
+
+    Opening the archive only reads its directory, and a lookup only reads the matching submissions,
+    after a binary search in the index of its contest (read in place, without loading the whole index).
+
+    Args:
+        path: archive file.
+        interner (optional): decode the submissions using this interner, see :class:`Interner`.
+    """
+
+    def __init__(self, path: str, *, interner: Interner | None = None):
+        self.path = path
+        self._interner = interner
+        with open(path, "rb") as inf:
+            self._mmap = mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"not a submission archive: {path}")
+        position, size = _HEADER.unpack_from(self._mmap, len(_MAGIC))
+        directory = json.loads(self._mmap[position : position + size])
+        if directory["version"] != _VERSION:
+            self._mmap.close()
+            raise ValueError(f"unsupported archive version {directory['version']}")
+        self._offsets: int = directory["offsets"]
+        self._contests: dict[str, list[int]] = directory["contests"]
+
+    def contests(self) -> list[int]:
+        """Ids of the archived contests, in the order they were added."""
+        return [int(key) for key in self._contests]
+
+    def __contains__(self, contestId: int) -> bool:
+        return str(contestId) in self._contests
+
+    def __len__(self) -> int:
+        """Total number of archived submissions."""
+        return sum(end - first for first, end, *_ in self._contests.values())
+
+    def _lookup(self, key: str, kind: str, value: str) -> array:
+        """Numbers of the records of contest `key` with this value, by binary search in its index (see :func:`_index_block`)"""
+        _, _, position, entries = self._contests[key]
+        target = _KINDS[kind] + value.encode("utf-8")
+        lo, hi = 0, entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_at, size, numbers_at, count = _ENTRY.unpack_from(
+                self._mmap, position + mid * _ENTRY.size
+            )
+            found = self._mmap[position + key_at : position + key_at + size]
+            if found < target:
+                lo = mid + 1
+            elif found > target:
+                hi = mid
+            else:
+                numbers = array("I")
+                start = position + numbers_at
+                numbers.frombytes(self._mmap[start : start + count * numbers.itemsize])
+                if sys.byteorder != "little":
+                    numbers.byteswap()
+                return numbers
+        return array("I")
+
+    def _decoder(self, fields: Optional[Sequence[str]]) -> Callable[[Any], Any]:
+        if self._interner is not None:
+            return self._interner.decoder_for(Submission, trusted=True, fields=fields)
+        return decoder_for(Submission, trusted=True, fields=fields)
+
+    def submissions(
+        self,
+        contestId: int,
+        *,
+        handle: str | None = None,
+        team: str | None = None,
+        problem: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[Any]:
+        """Submissions of a contest, in the order they were added, optionally only those matching all of the given filters.
+
+        Args:
+            contestId: contest id.
+            handle (optional): only the submissions of parties with this member (all submissions of a team, for team contests).
+            team (optional): only the submissions of parties with this team name.
+            problem (optional): only the submissions to the problem with this index (for example `"A"`).
+            fields (optional): only decode these fields, see :func:`decoder_for`.
+
+        Raises:
+            KeyError: if the contest is not in the archive.
+        """
+        key = str(contestId)
+        if key not in self._contests:
+            raise KeyError(contestId)
+        first, end, *_ = self._contests[key]
+
+        selected: Optional[set[int]] = None
+        for name, value in [
+            ("handles", handle),
+            ("teams", team),
+            ("problems", problem),
+        ]:
+            if value is not None:
+                matches = set(self._lookup(key, name, value))
+                selected = matches if selected is None else selected & matches
+        records = range(end - first) if selected is None else sorted(selected)
+
+        decoder = self._decoder(fields)
+        result = []
+        for i in records:
+            start, stop = _OFFSETS.unpack_from(
+                self._mmap, self._offsets + (first + i) * _OFFSET.size
+            )
+            result.append(decoder(json.loads(self._mmap[start:stop])))
+        return result
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self) -> "SubmissionArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+__all__ = ["ArchiveWriter", "SubmissionArchive"]
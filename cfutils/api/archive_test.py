@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from cfutils.api.archive import ArchiveWriter, SubmissionArchive
+from cfutils.api.decoders import Interner
+from cfutils.api.methods import Contest_Status
+
+STATUS_FILES = {
+    566: "data/examples/api/contest.status.json",
+    104491: "data/examples/resolverfeed/status_104491.json",
+}
+
+
+def load(contestId: int):
+    method = Contest_Status(contestId=contestId, From=1, count=10000)
+    return method.get(load_from_file=STATUS_FILES[contestId])
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = str(tmp_path / "submissions.archive")
+    with ArchiveWriter(path) as writer:
+        with open(STATUS_FILES[566]) as inf:
+            writer.add(566, json.load(inf)["result"])
+        writer.add(104491, load(104491))
+    with SubmissionArchive(path) as archive:
+        yield archive
+
+
+def test_archive_contests(archive):
+    assert archive.contests() == [566, 104491]
+    assert 566 in archive and 1 not in archive
+    assert archive.submissions(566) == load(566)
+    assert archive.submissions(104491) == load(104491)
+    assert len(archive) == len(load(566)) + len(load(104491))
+    with pytest.raises(KeyError):
+        archive.submissions(1)
+
+
+def test_archive_lookups(archive):
+    submissions = load(104491)
+    team = next(sub.author for sub in submissions if sub.author.teamName)
+    handle = team.members[0].handle
+
+    assert archive.submissions(104491, handle=handle) == [
+        sub for sub in submissions if handle in [m.handle for m in sub.author.members]
+    ]
+    assert archive.submissions(104491, team=team.teamName) == [
+        sub for sub in submissions if sub.author.teamName == team.teamName
+    ]
+    assert archive.submissions(104491, handle=handle, problem="A") == [
+        sub
+        for sub in archive.submissions(104491, handle=handle)
+        if sub.problem.index == "A"
+    ]
+    assert archive.submissions(104491, handle="nobody") == []
+    assert archive.submissions(566, handle=handle) == []
+
+    records = archive.submissions(104491, problem="B", fields=["id", "verdict"])
+    assert [r.id for r in records] == [
+        sub.id for sub in submissions if sub.problem.index == "B"
+    ]
+
+
+def test_archive_index(archive):
+    # every key is found by the binary search in the index, and only in its kind
+    submissions = load(104491)
+    handles = {m.handle for sub in submissions for m in sub.author.members}
+    for handle in sorted(handles):
+        assert [sub.id for sub in archive.submissions(104491, handle=handle)] == [
+            sub.id
+            for sub in submissions
+            if handle in [m.handle for m in sub.author.members]
+        ]
+        assert archive.submissions(104491, team=handle, problem="A") == [
+            sub
+            for sub in submissions
+            if sub.author.teamName == handle and sub.problem.index == "A"
+        ]
+    assert archive.submissions(104491, handle="") == []
+    assert archive.submissions(104491, handle="\U0010ffff") == []
+
+
+def test_archive_interner(tmp_path):
+    path = str(tmp_path / "submissions.archive")
+    with ArchiveWriter(path) as writer:
+        writer.add(104491, load(104491))
+        with pytest.raises(ValueError):
+            writer.add(104491, [])
+
+    with SubmissionArchive(path, interner=Interner()) as archive:
+        submissions = archive.submissions(104491)
+        assert submissions[0].author is archive.submissions(104491)[0].author
+
+    with pytest.raises(ValueError):
+        SubmissionArchive(STATUS_FILES[566])
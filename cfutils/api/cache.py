@@ -0,0 +1,235 @@
+"""
+Persistent on-disk cache for Codeforces API responses.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+from cfutils.api.objects import Contest, ContestPhase
+
+if TYPE_CHECKING:
+    from cfutils.api.methods import APIMethod
+
+
+DEFAULT_TTLS: dict[str, Optional[float]] = {
+    "blogEntry.comments": 60 * 60,
+    "blogEntry.view": 60 * 60,
+    "contest.hacks": 5 * 60,
+    "contest.list": 60 * 60,
+    "contest.ratingChanges": 60 * 60,
+    "contest.standings": 60,
+    "contest.status": 60,
+    "problemset.problems": 24 * 60 * 60,
+    "problemset.recentStatus": 0,
+    "recentActions": 0,
+    "user.blogEntries": 60 * 60,
+    "user.friends": 60 * 60,
+    "user.info": 60 * 60,
+    "user.ratedList": 24 * 60 * 60,
+    "user.rating": 60 * 60,
+    "user.status": 5 * 60,
+}
+"""Default time-to-live (in seconds) of cached responses, per API method. `None` never expires."""
+
+FINAL_WHEN_FINISHED = frozenset(["contest.standings", "contest.status"])
+"""API methods whose responses do not change any more once their contest is in phase `FINISHED`.
+Others do, for example `contest.ratingChanges` is empty until the ratings are applied, some time after the contest is finished."""
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class ResponseCache:
+    """Directory of cached API responses, keyed by the canonical request (see :meth:`APIMethod.canonicalRequest`).
+
+    - Each entry expires after the TTL of its API method.
+      Entries of the methods in `FINAL_WHEN_FINISHED` stored once their contest is known to be in phase `FINISHED` never expire
+      (entries stored while the contest was running still expire, as they can be partial).
+      A contest is known to be finished once a cached `contest.standings` or `contest.list` response says so.
+    - When the directory grows beyond `max_bytes`, the least recently used entries are evicted.
+    - Entries are written atomically, so that several processes can share the same directory.
+
+    Args:
+        directory: cache directory, created if it does not exist.
+        max_bytes: maximum total size of cached responses.
+        ttls (optional): per-method TTL overrides (in seconds, or `None` to never expire). See `DEFAULT_TTLS`.
+        default_ttl: TTL for methods not listed in `ttls` or `DEFAULT_TTLS`.
+    """
+
+    _FINISHED_FILE = "finished_contests.json"
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_bytes: int = 1 << 30,
+        ttls: dict[str, Optional[float]] | None = None,
+        default_ttl: Optional[float] = 60.0,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = DEFAULT_TTLS | (ttls or {})
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._finished_contests: set[int] = set(
+            self._read_json(self._FINISHED_FILE) or []
+        )
+
+    @staticmethod
+    def _key(method: "APIMethod", auth: bool) -> str:
+        request = method.canonicalRequest(auth=auth)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_json(self, name: str) -> Any:
+        try:
+            with open(os.path.join(self.directory, name)) as inf:
+                return json.load(inf)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_atomic(self, path: str, payload: bytes):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as outf:
+                outf.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _ttl(self, method: "APIMethod", header: dict) -> Optional[float]:
+        if header.get("finished") and method.name() in FINAL_WHEN_FINISHED:
+            return None
+        return self.ttls.get(method.name(), self.default_ttl)
+
+    def load(self, method: "APIMethod", *, auth: bool = False) -> bytes | None:
+        """Look up the cached response to an API call.
+
+        Returns:
+            The raw API response, or `None` if it is not cached or has expired.
+        """
+        path = self._path(self._key(method, auth))
+        try:
+            with open(path, "rb") as inf:
+                header = json.loads(inf.readline())
+                payload = inf.read()
+        except (FileNotFoundError, json.JSONDecodeError):
+            payload = None
+
+        if payload is not None:
+            ttl = self._ttl(method, header)
+            if ttl is None or time.time() - header["time"] < ttl:
+                try:
+                    os.utime(path)  # mark as recently used
+                except FileNotFoundError:
+                    pass  # evicted by another process in the meantime
+                with self._lock:
+                    self.stats.hits += 1
+                logging.info("API(%s) cache hit: %s", method.name(), path)
+                return payload
+
+        with self._lock:
+            self.stats.misses += 1
+        return None
+
+    def store(
+        self,
+        method: "APIMethod",
+        payload: bytes | dict,
+        *,
+        auth: bool = False,
+        result: Any = None,
+    ):
+        """Add (or replace) the response to an API call.
+
+        Args:
+            method: the API call.
+            payload: the raw (or JSON-decoded) API response.
+            auth: whether the call was authorized.
+            result (optional): the parsed result, used to learn which contests are finished.
+        """
+        if isinstance(payload, dict):
+            payload = json.dumps(payload).encode("utf-8")
+
+        contests: list[Contest] = []
+        if isinstance(result, list):
+            contests = [c for c in result if isinstance(c, Contest)]
+        elif isinstance(getattr(result, "contest", None), Contest):
+            contests = [result.contest]
+        finished = {c.id for c in contests if c.phase == ContestPhase.FINISHED}
+        if not finished <= self._finished_contests:
+            # merge with contests learnt by other processes sharing the directory
+            self._finished_contests |= finished
+            self._finished_contests |= set(self._read_json(self._FINISHED_FILE) or [])
+            self._write_atomic(
+                os.path.join(self.directory, self._FINISHED_FILE),
+                json.dumps(sorted(self._finished_contests)).encode("utf-8"),
+            )
+
+        header = {
+            "request": method.canonicalRequest(),
+            "time": time.time(),
+            # the contest was already finished: the response is final
+            "finished": method.name() in FINAL_WHEN_FINISHED
+            and getattr(method, "contestId", None) in self._finished_contests,
+        }
+        self._write_atomic(
+            self._path(self._key(method, auth)),
+            json.dumps(header).encode("utf-8") + b"\n" + payload,
+        )
+
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.name != self._FINISHED_FILE:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue  # already evicted by another process
+            total -= size
+            with self._lock:
+                self.stats.evictions += 1
+
+    def clear(self):
+        """Remove all cached responses."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    os.unlink(entry.path)
+        self._finished_contests = set()
+
+
+__all__ = ["CacheStats", "ResponseCache", "DEFAULT_TTLS", "FINAL_WHEN_FINISHED"]
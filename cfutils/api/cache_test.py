@@ -0,0 +1,85 @@
+import json
+import time
+
+from cfutils.api.cache import ResponseCache
+from cfutils.api.fake_transport_test import FakeTransport
+from cfutils.api.methods import (
+    Contest_RatingChanges,
+    Contest_Standings,
+    Contest_Status,
+    User_Info,
+)
+from cfutils.api.ratelimit import RateLimiter
+
+STANDINGS_FILE = "data/examples/api/contest.standings.json"
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    method = User_Info(handles=["codelegend"])
+    assert cache.load(method) is None
+
+    cache.store(method, b'{"status": "OK", "result": []}')
+    assert cache.load(method) == b'{"status": "OK", "result": []}'
+    assert cache.load(method, auth=True) is None
+    assert cache.load(User_Info(handles=["tourist"])) is None
+
+    assert (cache.stats.hits, cache.stats.misses) == (1, 3)
+
+
+def test_cache_ttl_and_finished_contests(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttls={"contest.status": 0})
+    status = Contest_Status(contestId=566, From=1, count=10)
+    cache.store(status, b"{}")
+    assert cache.load(status) is None
+
+    # learn that the contest is finished from its standings.
+    standings = Contest_Standings(contestId=566, From=1, count=5)
+    result = standings.get(load_from_file=STANDINGS_FILE)
+    cache.store(standings, b"{}", result=result)
+
+    # the entry stored while the contest was running still expires
+    assert cache.load(status) is None
+
+    # entries stored once the contest is finished never expire
+    cache.store(status, b"{}")
+    assert cache.load(status) == b"{}"
+    assert ResponseCache(str(tmp_path), ttls={"contest.status": 0}).load(status)
+
+    # rating changes are applied after the contest is finished: they still expire
+    changes = Contest_RatingChanges(contestId=566)
+    cache.ttls["contest.ratingChanges"] = 0
+    cache.store(changes, b'{"status": "OK", "result": []}')
+    assert cache.load(changes) is None
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=2500)
+    methods = [User_Info(handles=[f"user{i}"]) for i in range(3)]
+
+    cache.store(methods[0], b"0" * 1000)
+    time.sleep(0.01)
+    cache.store(methods[1], b"1" * 1000)
+    time.sleep(0.01)
+    assert cache.load(methods[0]) is not None
+    time.sleep(0.01)
+    cache.store(methods[2], b"2" * 1000)
+
+    assert cache.stats.evictions == 1
+    assert cache.load(methods[1]) is None
+    assert cache.load(methods[0]) is not None
+    assert cache.load(methods[2]) is not None
+
+
+def test_get_uses_cache(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    with open("data/examples/api/user.info.json") as inf:
+        transport = FakeTransport({"user.info": json.load(inf)["result"]})
+    method = User_Info(handles=["DmitriyH", "Fefer_Ivan", "codelegend"])
+    limiter = RateLimiter(interval=0)
+
+    first = method.get(limiter=limiter, transport=transport, cache=cache)
+    second = method.get(limiter=limiter, transport=transport, cache=cache)
+    assert first == second
+    assert transport.calls == ["user.info"]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
@@ -0,0 +1,192 @@
+"""
+Index of the problemset (the result of `problemset.problems`), for filtering problems by tags, rating and solved status without scanning them.
+"""
+import bisect
+from array import array
+from typing import Iterable, Optional
+
+from cfutils.api.methods import Problemset_Problems
+from cfutils.api.objects import Problem, Submission, Verdict
+from cfutils.api.snapshot import load_snapshot, save_snapshot
+
+
+def _positions(mask: int, limit: Optional[int]) -> Iterable[int]:
+    """Positions of the set bits of `mask`, lowest first"""
+    while mask and limit != 0:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+        if limit is not None:
+            limit -= 1
+
+
+class ProblemCatalog:
+    """Problems of the problemset, with their solved counts, indexed by tag and rating.
+
+    Sets of problems are bitsets (`int`s, bit `i` is the `i`-th problem), so filters are a few bitwise operations:
+
+    - one bitset per tag,
+    - for every rating (in increasing order), the bitset of the problems with at most that rating, so that a rating range is two binary searches,
+    - the problems solved by a user, from their submissions (see :meth:`solved`).
+
+    >>> from cfutils.api.methods import Problemset_Problems
+    >>> result = Problemset_Problems(tags=[]).get(load_from_file="data/examples/api/problemset.problems.json")
+    >>> catalog = ProblemCatalog(result)
+    >>> problem = catalog.query(tags=["dp", "graphs"], min_rating=2000, max_rating=2200, limit=1)[0]
+    >>> "dp" in problem.tags and 2000 <= problem.rating <= 2200
+    True
+
+    Args:
+        result: result of `problemset.problems`.
+    """
+
+    _snapshot_version = 1
+    """Version of the layout of the indexes, bumped when it changes (see :meth:`save`)"""
+
+    def __init__(self, result: Problemset_Problems.Result):
+        self.problems: list[Problem] = result.problems
+        self._positions = {
+            (problem.contestId, problem.index): i
+            for i, problem in enumerate(self.problems)
+        }
+        self.solvedCounts = array("q", [0] * len(self.problems))
+        """`solvedCount` of each problem (joined from `problemStatistics` by contest id and index)"""
+        for stats in result.problemStatistics:
+            i = self._positions.get((stats.contestId, stats.index))
+            if i is not None:
+                self.solvedCounts[i] = stats.solvedCount
+
+        self._tags: dict[str, int] = {}
+        by_rating: dict[int, int] = {}
+        for i, problem in enumerate(self.problems):
+            for tag in problem.tags:
+                self._tags[tag] = self._tags.get(tag, 0) | (1 << i)
+            if problem.rating is not None:
+                by_rating[problem.rating] = by_rating.get(problem.rating, 0) | (1 << i)
+
+        self._ratings = sorted(by_rating)
+        self._at_most: list[int] = []
+        mask = 0
+        for rating in self._ratings:
+            mask |= by_rating[rating]
+            self._at_most.append(mask)
+
+    def __len__(self) -> int:
+        return len(self.problems)
+
+    def tags(self) -> list[str]:
+        return sorted(self._tags)
+
+    def position(self, problem: Problem) -> Optional[int]:
+        """Position (bit) of a problem in the catalog, or `None` if it is not in the catalog"""
+        return self._positions.get((problem.contestId, problem.index))
+
+    def solved(self, submissions: Iterable[Submission]) -> int:
+        """Bitset of the problems with an accepted submission, for example from the result of `user.status`"""
+        mask = 0
+        for sub in submissions:
+            if sub.verdict == Verdict.OK:
+                i = self.position(sub.problem)
+                if i is not None:
+                    mask |= 1 << i
+        return mask
+
+    def _rated_below(self, i: int) -> int:
+        """Bitset of the problems rated below `self._ratings[i]`"""
+        return self._at_most[i - 1] if i else 0
+
+    def mask(
+        self,
+        *,
+        tags: Iterable[str] = (),
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        exclude: int = 0,
+    ) -> int:
+        """Bitset of the problems matching all the filters.
+
+        Args:
+            tags: the problems must have all these tags.
+            min_rating, max_rating (optional): the problems must have a rating in this (inclusive) range. Problems without a rating do not match.
+            exclude: a bitset of problems to leave out, for example the problems solved by a user (see :meth:`solved`).
+        """
+        mask = (1 << len(self.problems)) - 1
+        for tag in tags:
+            mask &= self._tags.get(tag, 0)
+        if min_rating is not None or max_rating is not None:
+            lo = (
+                0
+                if min_rating is None
+                else bisect.bisect_left(self._ratings, min_rating)
+            )
+            hi = (
+                len(self._ratings)
+                if max_rating is None
+                else bisect.bisect_right(self._ratings, max_rating)
+            )
+            mask &= self._rated_below(hi) & ~self._rated_below(lo)
+        return mask & ~exclude
+
+    def problems_in(self, mask: int, *, limit: Optional[int] = None) -> list[Problem]:
+        """Problems of a bitset, in the order of the catalog (at most `limit` of them)"""
+        return [self.problems[i] for i in _positions(mask, limit)]
+
+    def query(
+        self,
+        *,
+        tags: Iterable[str] = (),
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        exclude: int = 0,
+        limit: Optional[int] = None,
+    ) -> list[Problem]:
+        """Problems matching all the filters (see :meth:`mask`), in the order of the catalog (at most `limit` of them)"""
+        mask = self.mask(
+            tags=tags, min_rating=min_rating, max_rating=max_rating, exclude=exclude
+        )
+        return self.problems_in(mask, limit=limit)
+
+    def save(self, path: str):
+        """Write the catalog (with its indexes) to a snapshot file, see :mod:`cfutils.api.snapshot`."""
+        save_snapshot(
+            path,
+            _SnapshotState,
+            (
+                self.problems,
+                self._positions,
+                self.solvedCounts,
+                self._tags,
+                self._ratings,
+                self._at_most,
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ProblemCatalog":
+        """Read a catalog written by :meth:`save`, or an empty one if the file does not exist (or is stale)."""
+        catalog = cls(Problemset_Problems.Result(problems=[], problemStatistics=[]))
+        state = load_snapshot(path, _SnapshotState)
+        if state is not None:
+            (
+                catalog.problems,
+                catalog._positions,
+                catalog.solvedCounts,
+                catalog._tags,
+                catalog._ratings,
+                catalog._at_most,
+            ) = state
+        return catalog
+
+
+_SnapshotState = tuple[
+    ProblemCatalog,
+    list[Problem],
+    dict[tuple[Optional[int], str], int],
+    array,
+    dict[str, int],
+    list[int],
+    list[int],
+]
+"""Type of the snapshots of a catalog: its version, and its problems and indexes"""
+
+__all__ = ["ProblemCatalog"]
@@ -0,0 +1,97 @@
+import dataclasses
+import random
+from typing import Any
+
+from cfutils.api.catalog import ProblemCatalog
+from cfutils.api.methods import Problemset_Problems, User_Status
+from cfutils.api.objects import Verdict
+from cfutils.api.snapshot import schema_hash
+
+PROBLEMS_FILE = "data/examples/api/problemset.problems.json"
+
+
+def load() -> Problemset_Problems.Result:
+    return Problemset_Problems(tags=[]).get(load_from_file=PROBLEMS_FILE)
+
+
+def test_catalog_queries():
+    result = load()
+    catalog = ProblemCatalog(result)
+    assert len(catalog) == len(result.problems)
+    counts = {(s.contestId, s.index): s.solvedCount for s in result.problemStatistics}
+    for problem, count in zip(catalog.problems, catalog.solvedCounts):
+        assert count == counts[problem.contestId, problem.index]
+
+    rng = random.Random(0)
+    tags = catalog.tags()
+    solved = set(rng.sample(range(len(catalog)), 500))
+    exclude = sum(1 << i for i in solved)
+    for _ in range(200):
+        query_tags = rng.sample(tags, rng.randrange(3))
+        lo = rng.choice([None, *range(800, 3600, 100)])
+        hi = rng.choice([None, *range(800, 3600, 100)])
+        expected = [
+            problem
+            for i, problem in enumerate(result.problems)
+            if all(tag in problem.tags for tag in query_tags)
+            and (lo is None and hi is None or problem.rating is not None)
+            and (lo is None or problem.rating >= lo)
+            and (hi is None or problem.rating <= hi)
+            and i not in solved
+        ]
+        found = catalog.query(
+            tags=query_tags, min_rating=lo, max_rating=hi, exclude=exclude
+        )
+        assert found == expected
+        assert catalog.query(tags=query_tags, min_rating=lo, limit=2) == (
+            catalog.query(tags=query_tags, min_rating=lo)[:2]
+        )
+
+
+def test_catalog_solved():
+    catalog = ProblemCatalog(load())
+    submissions = User_Status(handle="tourist", From=1, count=10).get(
+        load_from_file="data/examples/api/user.status.json"
+    )
+    # the example submissions are to problems that are not in the example problemset
+    assert catalog.solved(submissions) == 0
+    submissions = [
+        dataclasses.replace(sub, problem=catalog.problems[7 * i])
+        for i, sub in enumerate(submissions)
+    ]
+
+    mask = catalog.solved(submissions)
+    accepted = {7 * i for i, sub in enumerate(submissions) if sub.verdict == Verdict.OK}
+    assert accepted
+    assert mask == sum(1 << i for i in accepted)
+    unsolved = catalog.query(exclude=mask)
+    assert len(unsolved) == len(catalog) - len(accepted)
+    assert all(catalog.position(problem) not in accepted for problem in unsolved)
+
+
+def test_catalog_save_load(tmp_path):
+    path = str(tmp_path / "catalog.snapshot")
+    assert len(ProblemCatalog.load(path)) == 0
+
+    catalog = ProblemCatalog(load())
+    catalog.save(path)
+    loaded = ProblemCatalog.load(path)
+    assert loaded.problems == catalog.problems
+    assert loaded.solvedCounts == catalog.solvedCounts
+    query: dict[str, Any] = {"tags": ["math"], "min_rating": 1500, "max_rating": 1900}
+    assert loaded.query(**query) == catalog.query(**query)
+
+
+def test_catalog_snapshot_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.snapshot")
+    with monkeypatch.context() as m:
+        m.setattr(ProblemCatalog, "_snapshot_version", 0)
+        schema_hash.cache_clear()
+        ProblemCatalog(load()).save(path)
+        assert len(ProblemCatalog.load(path)) > 0
+    schema_hash.cache_clear()
+
+    # a snapshot of an older layout is stale
+    catalog = ProblemCatalog.load(path)
+    assert len(catalog) == 0
+    assert catalog.query(tags=["math"]) == []
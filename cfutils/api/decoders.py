@@ -0,0 +1,625 @@
+"""
+Fast decoders from JSON dicts into the dataclasses of :mod:`cfutils.api.objects`.
+
+Instead of interpreting the type annotations for every object (as `from_dict` does),
+a specialized function is generated (once) for each dataclass, handling nested dataclasses, `Optional`, lists and enums.
+
+Two variants can be generated:
+
+- validating (default): checks the JSON against the schema, like `from_dict`:
+  unknown keys and invalid enum values are rejected, and scalars are coerced to the annotated type (e.g. `"false"` to `False`).
+- trusted: assumes the JSON matches the schema, and only builds the objects (nested dataclasses and enums).
+  Numbers and strings are used as they are, so, for example, a `float` field can hold an `int`.
+  Booleans are still coerced, as the API sends some of them as strings (e.g. `JudgeProtocol.manual`).
+
+An :class:`Interner` additionally shares equal objects and strings between everything it decodes.
+
+The inverse, :func:`encoder_for`, generates functions that convert the dataclasses back into JSON data.
+"""
+import dataclasses
+import types
+import typing
+from enum import Enum
+from typing import Any, Callable, Hashable, Optional, Sequence, TypeVar, overload
+
+from cfutils.api.objects import PARTY_KEY_FIELDS, Member, Party, Problem, party_key
+
+T = TypeVar("T")
+
+
+class DecodeError(ValueError):
+    """JSON data does not match the dataclass schema"""
+
+
+_TRUTHY = frozenset(["true", "t", "yes", "y", "on", "1"])
+
+
+def _as_int(o: Any) -> int:
+    t = type(o)
+    if t is int:
+        return o
+    if t is str:
+        return int(round(float(o))) if "." in o else int(o)
+    if t is float:
+        return int(round(o))
+    raise TypeError(f"expected an int, got {o!r}")
+
+
+def _as_float(o: Any) -> float:
+    if type(o) is bool:
+        raise TypeError(f"expected a float, got {o!r}")
+    return float(o)
+
+
+def _as_str(o: Any) -> str:
+    return o if type(o) is str else str(o)
+
+
+def _as_bool(o: Any) -> bool:
+    t = type(o)
+    if t is bool:
+        return o
+    if t is str:
+        return o.lower() in _TRUTHY
+    return o == 1
+
+
+_SCALARS: dict[type, str] = {
+    int: "_as_int",
+    float: "_as_float",
+    str: "_as_str",
+    bool: "_as_bool",
+}
+
+
+class _Compiler:
+    def __init__(self, trusted: bool, interner: Optional["Interner"] = None):
+        self.trusted = trusted
+        self.interner = interner
+        self.namespace: dict[str, Any] = {
+            "_as_int": _as_int,
+            "_as_float": _as_float,
+            "_as_str": _as_str,
+            "_as_bool": _as_bool,
+            "DecodeError": DecodeError,
+        }
+        self._counter = 0
+
+    def _name(self, prefix: str, obj: Any) -> str:
+        """Bind `obj` to a fresh name in the namespace of the generated code"""
+        self._counter += 1
+        name = f"_{prefix}{self._counter}"
+        self.namespace[name] = obj
+        return name
+
+    def expr(self, tp: Any, value: str) -> str:
+        """Python expression that converts the JSON `value` (an expression) into type `tp`"""
+        origin = typing.get_origin(tp)
+
+        if origin in (typing.Union, types.UnionType):
+            args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+            if len(args) != 1:
+                raise TypeError(f"unsupported union type: {tp}")
+            inner = self.expr(args[0], "_v")
+            if inner == "_v":
+                return value
+            return f"(None if (_v := {value}) is None else {inner})"
+
+        if origin is list:
+            (arg,) = typing.get_args(tp)
+            inner = self.expr(arg, "_x")
+            if inner == "_x":
+                return value if self.trusted else f"list({value})"
+            return f"[{inner} for _x in {value}]"
+
+        if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+            if self.interner is not None:
+                decoder = self.interner.decoder_for(tp, trusted=self.trusted)
+            else:
+                decoder = decoder_for(tp, trusted=self.trusted)
+            return f"{self._name('decode_', decoder)}({value})"
+
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            members = {member.value: member for member in tp}
+            return f"{self._name('enum_', members)}[{value}]"
+
+        if tp in _SCALARS:
+            if not self.trusted or tp is bool:
+                value = f"{_SCALARS[tp]}({value})"
+            if tp is str and self.interner is not None:
+                strings = self._name("strings_", self.interner._strings)
+                value = f"{strings}.setdefault((_s := {value}), _s)"
+            return value
+
+        if tp is Any:
+            return value
+
+        raise TypeError(f"unsupported field type: {tp}")
+
+    def compile(self, cls: type) -> Callable[[dict], Any]:
+        hints = typing.get_type_hints(cls)
+        fields = [f for f in dataclasses.fields(cls) if f.init]
+
+        args = []
+        for field in fields:
+            key = repr(field.name)
+            if field.default is not dataclasses.MISSING:
+                default = self._name("default_", field.default)
+                value = f"d.get({key}, {default})"
+                conv = self.expr(hints[field.name], "_d")
+                if conv != "_d":
+                    # the default value is already of the right type.
+                    value = f"(_d if (_d := {value}) is {default} else {conv})"
+            elif field.default_factory is not dataclasses.MISSING:
+                factory = self._name("factory_", field.default_factory)
+                conv = self.expr(hints[field.name], f"d[{key}]")
+                value = f"({conv} if {key} in d else {factory}())"
+            else:
+                value = self.expr(hints[field.name], f"d[{key}]")
+            args.append(f"        {field.name}={value},")
+
+        cls_name = self._name("cls_", cls)
+        body = [f"    return {cls_name}(", *args, "    )"]
+        known = frozenset(f.name for f in fields)
+        return self._define(cls, cls.__name__, body, known)
+
+    def _define(
+        self,
+        cls: type,
+        name: str,
+        body: list[str],
+        known: Optional[frozenset[str]] = None,
+    ) -> Callable[[dict], Any]:
+        """Define the decoder function `body` for a JSON object of the dataclass `cls`.
+        Unless trusted, the errors are reported as `DecodeError`, and keys not in `known` are rejected.
+        """
+        if not self.trusted:
+            check_keys = []
+            if known is not None:
+                known_name = self._name("known_", known)
+                check_keys = [
+                    f"        if not {known_name}.issuperset(d):",
+                    f"            raise DecodeError(f'unknown keys {{sorted(set(d) - {known_name})}}')",
+                ]
+            body = [
+                "    try:",
+                "        if type(d) is not dict:",
+                "            raise TypeError(f'expected a JSON object, got {d!r}')",
+                *check_keys,
+                *["    " + line for line in body],
+                "    except DecodeError:",
+                "        raise",
+                "    except (KeyError, TypeError, ValueError) as e:",
+                f"        raise DecodeError(f'{cls.__qualname__}: {{e!r}} in {{d!r}}') from e",
+            ]
+
+        func_name = f"decode_{name}"
+        source = "\n".join([f"def {func_name}(d):", *body])
+        exec(compile(source, f"<cfutils decoder {name}>", "exec"), self.namespace)
+        func = self.namespace[func_name]
+        func.__doc__ = f"Decode a JSON object into a `{name}`\n\n{source}"
+        return func
+
+    def _field_expr(
+        self, cls: type, path: list[str], value: str, depth: int = 0
+    ) -> tuple[str, Any]:
+        """Expression that decodes the field at `path` of the JSON object `value` of the dataclass `cls`, and its type"""
+        name, *rest = path
+        field = {f.name: f for f in dataclasses.fields(cls) if f.init}.get(name)
+        if field is None:
+            raise ValueError(f"{cls.__qualname__} has no field {name!r}")
+        tp = typing.get_type_hints(cls)[name]
+
+        key = repr(name)
+        if field.default is not dataclasses.MISSING:
+            access = f"{value}.get({key}, {self._name('default_', field.default)})"
+        elif field.default_factory is not dataclasses.MISSING:
+            factory = self._name("factory_", field.default_factory)
+            access = f"({value}[{key}] if {key} in {value} else {factory}())"
+        else:
+            access = f"{value}[{key}]"
+
+        if not rest:
+            return self.expr(tp, access), tp
+
+        inner = tp
+        optional = typing.get_origin(tp) in (typing.Union, types.UnionType)
+        if optional:
+            (inner,) = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if not (isinstance(inner, type) and dataclasses.is_dataclass(inner)):
+            raise ValueError(f"{cls.__qualname__}.{name} has no fields: {tp}")
+
+        if not optional:
+            return self._field_expr(inner, rest, access, depth + 1)
+        var = f"_p{depth}"
+        expr, leaf = self._field_expr(inner, rest, var, depth + 1)
+        return f"(None if ({var} := {access}) is None else {expr})", Optional[leaf]
+
+    def project(self, cls: type, fields: tuple[str, ...]) -> Callable[[dict], Any]:
+        """Decoder for only the given fields of a dataclass, into a record (see :func:`decoder_for`)"""
+        exprs = []
+        record_fields = []
+        for path in fields:
+            expr, tp = self._field_expr(cls, path.split("."), "d")
+            exprs.append(f"        {expr},")
+            record_fields.append((path.replace(".", "_"), tp))
+
+        record_name = f"{cls.__name__}Record"
+        record = _records.get((cls, fields))
+        if record is None:
+            record = dataclasses.make_dataclass(record_name, record_fields, slots=True)
+            record.__module__ = cls.__module__
+            _records[(cls, fields)] = record
+        body = [f"    return {self._name('record_', record)}(", *exprs, "    )"]
+        return self._define(cls, record_name, body)
+
+    def build(
+        self, tp: Any, fields: Optional[tuple[str, ...]] = None
+    ) -> Callable[[Any], Any]:
+        """Decoder for a dataclass, or a list/Optional of them"""
+        if fields is not None:
+            element = typing.get_args(tp)[0] if typing.get_origin(tp) is list else tp
+            if not (isinstance(element, type) and dataclasses.is_dataclass(element)):
+                raise TypeError(f"cannot select fields of {tp}")
+            project = self.project(element, fields)
+            if element is tp:
+                return project
+            project_name = self._name("project_", project)
+            return eval(f"lambda d: [{project_name}(_x) for _x in d]", self.namespace)
+
+        if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+            return self.compile(tp)
+        return eval(f"lambda d: {self.expr(tp, 'd')}", self.namespace)
+
+
+_decoders: dict[tuple[Any, bool, Optional[tuple[str, ...]]], Callable[[Any], Any]] = {}
+_records: dict[tuple[type, tuple[str, ...]], type] = {}
+"""Record types of the projections, shared by all decoders so that equal records compare equal"""
+
+
+@overload
+def decoder_for(
+    tp: type[T], *, trusted: bool = False, fields: None = None
+) -> Callable[[Any], T]:
+    ...
+
+
+@overload
+def decoder_for(
+    tp: Any, *, trusted: bool = False, fields: Optional[Sequence[str]] = None
+) -> Callable[[Any], Any]:
+    ...
+
+
+def decoder_for(
+    tp: Any, *, trusted: bool = False, fields: Optional[Sequence[str]] = None
+) -> Callable[[Any], Any]:
+    """Get the (generated, and cached) decoder function for a dataclass, or a list/Optional of them.
+
+    >>> from cfutils.api.objects import Member, Submission
+    >>> decoder_for(Member)({"handle": "tourist"})
+    Member(handle='tourist', name=None)
+
+    With `fields`, only the given fields (of the dataclass, or of the list elements) are decoded, into lightweight records:
+    the attribute of a field `a.b` is `a_b`. The other parts of the JSON are skipped, and not validated.
+
+    >>> decode_sub = decoder_for(Submission, fields=["id", "verdict", "problem.index"])
+    >>> decode_sub({"id": 1, "verdict": "OK", "problem": {"index": "A", "name": "Game"}})
+    SubmissionRecord(id=1, verdict=<Verdict.OK: 'OK'>, problem_index='A')
+
+    Args:
+        tp: type to decode into.
+        trusted: skip validation, see the module description.
+        fields (optional): names of the fields to decode, nested ones are separated by dots (e.g. `author.members`).
+
+    Raises:
+        TypeError: when a field type is not supported.
+        ValueError: when a selected field does not exist.
+
+    Returns:
+        Function that converts JSON data into an instance of `tp`.
+        It raises `DecodeError` when the JSON does not match (only if `trusted` is false).
+    """
+    key = (tp, trusted, None if fields is None else tuple(fields))
+    decoder = _decoders.get(key)
+    if decoder is None:
+        decoder = _decoders[key] = _Compiler(trusted).build(tp, key[2])
+    return decoder
+
+
+@overload
+def decode(tp: type[T], data: Any, *, trusted: bool = False, fields: None = None) -> T:
+    ...
+
+
+@overload
+def decode(
+    tp: Any,
+    data: Any,
+    *,
+    trusted: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> Any:
+    ...
+
+
+def decode(
+    tp: Any,
+    data: Any,
+    *,
+    trusted: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> Any:
+    """Decode JSON data into `tp`, using :func:`decoder_for`.
+
+    >>> from cfutils.api.objects import Member
+    >>> decode(list[Member], [{"handle": "tourist"}, {"handle": "Petr", "name": "Petr"}])
+    [Member(handle='tourist', name=None), Member(handle='Petr', name='Petr')]
+    """
+    return decoder_for(tp, trusted=trusted, fields=fields)(data)
+
+
+class _EncoderCompiler:
+    def __init__(self):
+        self.namespace: dict[str, Any] = {}
+        self._counter = 0
+
+    def _name(self, obj: Any) -> str:
+        self._counter += 1
+        name = f"_encode_{self._counter}"
+        self.namespace[name] = obj
+        return name
+
+    def expr(self, tp: Any, value: str) -> str:
+        """Python expression that converts `value` (an expression of type `tp`) into JSON data"""
+        origin = typing.get_origin(tp)
+
+        if origin in (typing.Union, types.UnionType):
+            args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+            if len(args) != 1:
+                raise TypeError(f"unsupported union type: {tp}")
+            inner = self.expr(args[0], "_v")
+            if inner == "_v":
+                return value
+            return f"(None if (_v := {value}) is None else {inner})"
+
+        if origin is list:
+            (arg,) = typing.get_args(tp)
+            inner = self.expr(arg, "_x")
+            if inner == "_x":
+                return f"list({value})"
+            return f"[{inner} for _x in {value}]"
+
+        if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+            return f"{self._name(encoder_for(tp))}({value})"
+
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return f"{value}.value"
+
+        if tp in _SCALARS or tp is Any:
+            return value
+
+        raise TypeError(f"unsupported field type: {tp}")
+
+    def build(self, tp: Any) -> Callable[[Any], Any]:
+        if not (isinstance(tp, type) and dataclasses.is_dataclass(tp)):
+            return eval(f"lambda o: {self.expr(tp, 'o')}", self.namespace)
+
+        hints = typing.get_type_hints(tp)
+        items = [
+            f"        {f.name!r}: {self.expr(hints[f.name], f'o.{f.name}')},"
+            for f in dataclasses.fields(tp)
+        ]
+        source = "\n".join(
+            [f"def encode_{tp.__name__}(o):", "    return {", *items, "    }"]
+        )
+        exec(
+            compile(source, f"<cfutils encoder {tp.__name__}>", "exec"), self.namespace
+        )
+        func = self.namespace[f"encode_{tp.__name__}"]
+        func.__doc__ = f"Encode a `{tp.__name__}` into a JSON object\n\n{source}"
+        return func
+
+
+_encoders: dict[Any, Callable[[Any], Any]] = {}
+
+
+def encoder_for(tp: Any) -> Callable[[Any], Any]:
+    """Get the (generated, and cached) encoder function for a dataclass, or a list/Optional of them:
+    the inverse of :func:`decoder_for`, which converts objects back into JSON data (dicts, lists and scalars).
+    Fields that are `None` are kept, as `null`.
+
+    >>> from cfutils.api.objects import Member
+    >>> encoder_for(list[Member])([Member(handle="tourist")])
+    [{'handle': 'tourist', 'name': None}]
+
+    Raises:
+        TypeError: when a field type is not supported.
+    """
+    encoder = _encoders.get(tp)
+    if encoder is None:
+        encoder = _encoders[tp] = _EncoderCompiler().build(tp)
+    return encoder
+
+
+def _key_fields(
+    cls: type, names: Optional[Sequence[str]] = None
+) -> list[tuple[str, Any]]:
+    """Fields of `cls` that identify a shared object (all of them, or `names`), with their defaults (for fields missing from the JSON)"""
+    defaults = {
+        f.name: None if f.default is dataclasses.MISSING else f.default
+        for f in dataclasses.fields(cls)
+    }
+    return [(name, defaults[name]) for name in names or defaults]
+
+
+_MEMBER_FIELDS = _key_fields(Member)
+_PARTY_FIELDS = _key_fields(Party, PARTY_KEY_FIELDS)
+
+
+def _member_key(d: dict) -> Hashable:
+    return tuple([d.get(name, default) for name, default in _MEMBER_FIELDS])
+
+
+def _party_key(d: dict) -> Hashable:
+    """:func:`party_key` of the JSON object of a party"""
+    handles = tuple([member["handle"] for member in d["members"]])
+    return (handles, *[d.get(name, default) for name, default in _PARTY_FIELDS])
+
+
+def _problem_key(d: dict) -> Hashable:
+    return (d.get("contestId"), d.get("problemsetName"), d["index"])
+
+
+def _json_scalar(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _member_object_key(member: Member) -> Hashable:
+    return tuple([_json_scalar(getattr(member, name)) for name, _ in _MEMBER_FIELDS])
+
+
+def _problem_object_key(problem: Problem) -> Hashable:
+    return (problem.contestId, problem.problemsetName, problem.index)
+
+
+_INTERN_KEYS: dict[type, Callable[[Any], Hashable]] = {
+    Problem: _problem_key,
+    Party: _party_key,
+    Member: _member_key,
+}
+"""Identity of the JSON objects that are shared by an `Interner`"""
+
+_INTERN_OBJECT_KEYS: dict[type, Callable[[Any], Hashable]] = {
+    Problem: _problem_object_key,
+    Party: party_key,
+    Member: _member_object_key,
+}
+"""Same as `_INTERN_KEYS`, for decoded objects"""
+
+
+class Interner:
+    """Decodes API results like :func:`decode`, but shares objects between everything it decodes:
+
+    - one `Problem` per `(contestId, problemsetName, index)`,
+    - one `Party` per :func:`party_key`, and one `Member` per distinct JSON object,
+    - one copy of each string (handles, `programmingLanguage`, problem tags, ...).
+
+    For example, the thousands of submissions of a `contest.status` result then refer to only a few `Problem` objects,
+    and decoding the `contest.standings` with the same interner gives the very same `Party` objects as the submissions.
+    This saves memory, and makes equality checks and dict lookups on those objects much cheaper.
+
+    Only the first occurrence of a `Problem` or `Party` is decoded (and validated), later ones with the same key reuse it.
+    Shared objects must not be modified.
+
+    >>> interner = Interner()
+    >>> problem = {"contestId": 566, "index": "A", "name": "Matching Names", "type": "PROGRAMMING", "tags": []}
+    >>> a, b = interner.decode(list[Problem], [problem, dict(problem)])
+    >>> a is b
+    True
+    """
+
+    def __init__(self):
+        self._tables: dict[type, dict[Hashable, Any]] = {
+            cls: {} for cls in _INTERN_KEYS
+        }
+        self._strings: dict[str, str] = {}
+        self._fields: dict[type, list[str]] = {}
+        self._decoders: dict[
+            tuple[Any, bool, Optional[tuple[str, ...]]], Callable[[Any], Any]
+        ] = {}
+
+    def _interning(
+        self, cls: type, decoder: Callable[[Any], Any]
+    ) -> Callable[[Any], Any]:
+        key_of = _INTERN_KEYS[cls]
+        table = self._tables[cls]
+
+        def decode_interned(d):
+            try:
+                key = key_of(d)
+                obj = table.get(key)
+            except (KeyError, TypeError, AttributeError):
+                # invalid data, let the decoder report it.
+                return decoder(d)
+            if obj is None:
+                obj = table[key] = decoder(d)
+            return obj
+
+        return decode_interned
+
+    def decoder_for(
+        self,
+        tp: Any,
+        *,
+        trusted: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Callable[[Any], Any]:
+        """Same as :func:`decoder_for`, sharing objects using this interner."""
+        key = (tp, trusted, None if fields is None else tuple(fields))
+        decoder = self._decoders.get(key)
+        if decoder is None:
+            decoder = _Compiler(trusted, self).build(tp, key[2])
+            if tp in _INTERN_KEYS and fields is None:
+                decoder = self._interning(tp, decoder)
+            self._decoders[key] = decoder
+        return decoder
+
+    def decode(
+        self,
+        tp: Any,
+        data: Any,
+        *,
+        trusted: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Any:
+        """Same as :func:`decode`, sharing objects using this interner."""
+        return self.decoder_for(tp, trusted=trusted, fields=fields)(data)
+
+    def intern(self, value: Any) -> Any:
+        """Share the objects of an already decoded result (for example loaded from a snapshot, see :mod:`cfutils.api.snapshot`)
+        with everything decoded by this interner. Lists and objects are updated in place.
+
+        Strings are not shared.
+
+        Returns:
+            `value`, or the shared object equal to it.
+        """
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self.intern(item)
+            return value
+
+        cls = type(value)
+        if not dataclasses.is_dataclass(cls):
+            return value
+        key_of = _INTERN_OBJECT_KEYS.get(cls)
+        if key_of is not None:
+            shared = self._tables[cls].setdefault(key_of(value), value)
+            if shared is not value:
+                return shared
+
+        fields = self._fields.get(cls)
+        if fields is None:
+            fields = self._fields[cls] = [f.name for f in dataclasses.fields(cls)]
+        for name in fields:
+            item = getattr(value, name)
+            if isinstance(item, list) or dataclasses.is_dataclass(item):
+                setattr(value, name, self.intern(item))
+        return value
+
+    def sizes(self) -> dict[str, int]:
+        """Number of distinct shared objects, by type"""
+        return {
+            **{cls.__name__: len(table) for cls, table in self._tables.items()},
+            "str": len(self._strings),
+        }
+
+    def clear(self):
+        """Forget the shared objects. Objects decoded later are not shared with the earlier ones."""
+        for table in self._tables.values():
+            table.clear()
+        self._strings.clear()
+
+
+__all__ = ["DecodeError", "Interner", "decode", "decoder_for", "encoder_for"]
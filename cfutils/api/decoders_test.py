@@ -0,0 +1,191 @@
+import json
+from typing import Any
+
+import pytest
+
+from cfutils.api.decoders import (
+    DecodeError,
+    Interner,
+    _party_key,
+    decode,
+    decoder_for,
+    encoder_for,
+)
+from cfutils.api.memo import ResultMemo
+from cfutils.api.methods import Contest_Status
+from cfutils.api.methods_test import MethodExample, methodExamples
+from cfutils.api.objects import Hack, Member, Problem, Submission, Verdict, party_key
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+@pytest.mark.parametrize("example", methodExamples.values(), ids=methodExamples.keys())
+def test_decode_matches_from_dict(example: MethodExample, trusted: bool):
+    method = example.method
+    with open(f"data/examples/api/{method.name()}.json") as inf:
+        data = json.load(inf)["result"]
+
+    resultType = method.resultType()
+    if isinstance(data, list):
+        baseType = resultType.__args__[0]  # type: ignore
+        expected = [
+            elem if baseType in (str, int) else baseType.from_dict(elem)
+            for elem in data
+        ]
+    else:
+        expected = resultType.from_dict(data)  # type: ignore
+
+    assert decode(resultType, data, trusted=trusted) == expected
+
+
+@pytest.mark.parametrize("example", methodExamples.values(), ids=methodExamples.keys())
+def test_encode_roundtrip(example: MethodExample):
+    method = example.method
+    with open(f"data/examples/api/{method.name()}.json") as inf:
+        result: Any = decode(method.resultType(), json.load(inf)["result"])
+
+    data = encoder_for(method.resultType())(result)
+    assert decode(method.resultType(), data) == result
+    if not isinstance(result, list):
+        assert data == result.to_dict()
+
+
+def test_decoder_coercion():
+    problem = decoder_for(Problem)(
+        {
+            "index": "A",
+            "name": "Game",
+            "type": "PROGRAMMING",
+            "tags": [],
+            "contestId": "566",
+            "points": 500,
+        }
+    )
+    assert problem.contestId == 566
+    assert problem == Problem.from_dict(problem.to_dict())
+    assert isinstance(problem.points, float)
+    assert decoder_for(Member)({"handle": 5}).handle == "5"
+
+    with open("data/examples/api/contest.hacks.json") as inf:
+        hack = json.load(inf)["result"][0]
+    assert hack["judgeProtocol"]["manual"] == "false"
+    for trusted in [False, True]:
+        protocol = decoder_for(Hack, trusted=trusted)(hack).judgeProtocol
+        assert protocol is not None and protocol.manual is False
+
+
+def test_decoder_validation():
+    with open("data/examples/api/contest.status.json") as inf:
+        sub = json.load(inf)["result"][0]
+    assert decoder_for(Submission)(sub).verdict == Verdict(sub["verdict"])
+
+    with pytest.raises(DecodeError, match="unknown keys"):
+        decoder_for(Submission)({**sub, "extra": 1})
+    with pytest.raises(DecodeError):
+        decoder_for(Submission)({**sub, "verdict": "NOT_A_VERDICT"})
+    with pytest.raises(DecodeError):
+        decoder_for(Submission)({k: v for k, v in sub.items() if k != "problem"})
+    with pytest.raises(DecodeError):
+        decoder_for(Submission)({**sub, "problem": {**sub["problem"], "x": 1}})
+
+    # trusted decoders do not check the data
+    assert decoder_for(Submission, trusted=True)({**sub, "id": "1"}).id == "1"
+
+
+def test_interner_shares_objects():
+    interner = Interner()
+    status = methodExamples["contest.status"].method
+    submissions = status.get(
+        load_from_file="data/examples/api/contest.status.json", interner=interner
+    )
+    assert submissions == status.get(
+        load_from_file="data/examples/api/contest.status.json"
+    )
+
+    problems = {(sub.problem.contestId, sub.problem.index) for sub in submissions}
+    assert len({id(sub.problem) for sub in submissions}) == len(problems)
+    assert interner.sizes()["Problem"] == len(problems)
+
+    parties = {party_key(sub.author) for sub in submissions}
+    assert len({id(sub.author) for sub in submissions}) == len(parties)
+
+    # the parties of the JSON data and of the decoded objects have the same key
+    with open("data/examples/api/contest.status.json") as inf:
+        authors = [sub["author"] for sub in json.load(inf)["result"]]
+    assert [_party_key(author) for author in authors] == [
+        party_key(sub.author) for sub in submissions
+    ]
+
+    languages = {id(sub.programmingLanguage) for sub in submissions}
+    assert len(languages) == len({sub.programmingLanguage for sub in submissions})
+
+    interner.clear()
+    assert interner.sizes() == {"Problem": 0, "Party": 0, "Member": 0, "str": 0}
+
+
+STATUS_FIELDS = [
+    "id",
+    "verdict",
+    "relativeTimeSeconds",
+    "problem.index",
+    "author.members",
+]
+
+
+@pytest.mark.parametrize("trusted", [False, True])
+def test_decode_fields(trusted: bool):
+    with open("data/examples/api/contest.status.json") as inf:
+        data = json.load(inf)["result"]
+    submissions = decode(list[Submission], data)
+
+    records = decode(list[Submission], data, trusted=trusted, fields=STATUS_FIELDS)
+    assert [
+        (r.id, r.verdict, r.relativeTimeSeconds, r.problem_index, r.author_members)
+        for r in records
+    ] == [
+        (s.id, s.verdict, s.relativeTimeSeconds, s.problem.index, s.author.members)
+        for s in submissions
+    ]
+    assert not hasattr(records[0], "__dict__")
+
+    with open("data/examples/api/contest.hacks.json") as inf:
+        hacks = json.load(inf)["result"]
+    manual = decode(list[Hack], hacks, fields=["judgeProtocol.manual"])
+    assert {record.judgeProtocol_manual for record in manual} <= {False, None}
+
+
+def test_decode_fields_errors():
+    with pytest.raises(ValueError, match="no field 'problemIndex'"):
+        decoder_for(Submission, fields=["problemIndex"])
+    with pytest.raises(ValueError, match="has no fields"):
+        decoder_for(Submission, fields=["id.value"])
+    with pytest.raises(TypeError):
+        decoder_for(list[str], fields=["id"])
+
+    decode_sub = decoder_for(Submission, fields=["id", "problem.index"])
+    assert decode_sub({"id": 1, "problem": {"index": "A"}, "unknown": 0}).id == 1
+    with pytest.raises(DecodeError):
+        decode_sub({"id": 1, "problem": {}})
+
+
+def test_get_fields():
+    status = methodExamples["contest.status"].method
+    data_file = "data/examples/api/contest.status.json"
+    records = status.get(load_from_file=data_file, fields=STATUS_FIELDS)
+    assert (
+        list(status.stream(load_from_file=data_file, fields=STATUS_FIELDS)) == records
+    )
+    assert [r.id for r in records] == [
+        s.id for s in status.get(load_from_file=data_file)
+    ]
+
+    with pytest.raises(ValueError, match="`id` field"):
+        next(
+            Contest_Status(contestId=104491, From=1, count=1).iter_items(
+                load_from_file=data_file, fields=["verdict"]
+            )
+        )
+
+    memo = ResultMemo()
+    assert status.get(load_from_file=data_file, memo=memo) != status.get(
+        load_from_file=data_file, memo=memo, fields=STATUS_FIELDS
+    )
@@ -0,0 +1,57 @@
+"""
+Fake transport for the tests, which serves API calls from local data.
+"""
+import io
+import json
+from typing import Any, BinaryIO, Callable, Optional, Union
+
+from cfutils.api.methods import CFAPIError
+from cfutils.api.transport import Transport
+
+Result = Union[list, Callable[[dict[str, str]], Any]]
+
+
+def page(items: list, params: dict[str, str]) -> list:
+    """Items of the page selected by the `from` (1-based) and `count` parameters, or all of them without these parameters"""
+    if "from" not in params:
+        return items
+    start, count = int(params["from"]), int(params["count"])
+    return items[start - 1 : start - 1 + count]
+
+
+class FakeTransport(Transport):
+    """Serves API calls from local data, and records the name of each called method (in `calls`).
+
+    The data can be changed between calls (or by `after_call`), for example to simulate a running contest.
+
+    Args:
+        results: the result of each API method, by name: a list, which is paged (see :func:`page`),
+            or a function of the query parameters that returns the result (paging it if needed), or raises a `CFAPIError` for a failed call.
+        after_call (optional): called with the transport after every call, once the response is built.
+    """
+
+    def __init__(
+        self,
+        results: dict[str, Result],
+        *,
+        after_call: Optional[Callable[["FakeTransport"], None]] = None,
+    ):
+        self.results = results
+        self.after_call = after_call
+        self.calls: list[str] = []
+
+    def open(self, url: str) -> BinaryIO:
+        path, _, query = url.partition("?")
+        method = path.rsplit("/", 1)[1]
+        params = dict(p.split("=", 1) for p in query.split("&") if p)
+        self.calls.append(method)
+
+        result = self.results[method]
+        try:
+            result = result(params) if callable(result) else page(result, params)
+            payload = {"status": "OK", "result": result}
+        except CFAPIError as e:
+            payload = {"status": "FAILED", "comment": str(e)}
+        if self.after_call is not None:
+            self.after_call(self)
+        return io.BytesIO(json.dumps(payload).encode())
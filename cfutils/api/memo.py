@@ -0,0 +1,151 @@
+"""
+In-memory memoization of parsed API results, with coalescing of identical concurrent calls.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    """calls that waited for an identical call already in flight, instead of making their own"""
+
+
+class ResultMemo:
+    """Short-lived LRU memo of parsed API results, shared by threads and asyncio tasks.
+
+    - A result is reused for `ttl` seconds after it was fetched.
+    - Identical calls made while one is already in flight wait for it and share its result ("single flight"),
+      so only one upstream request is made. Failures are shared with the waiters, but are not memoized.
+
+    Results are shared objects: callers must not modify them.
+
+    Args:
+        ttl: number of seconds a result is reused for.
+        maxsize: maximum number of memoized results.
+    """
+
+    def __init__(self, *, ttl: float = 5.0, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = MemoStats()
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._inflight_async: dict[
+            tuple[asyncio.AbstractEventLoop, str], asyncio.Future
+        ] = {}
+
+    def _lookup(self, key: str) -> tuple[bool, Any]:
+        """Must be called with the lock held."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expiry, result = entry
+            if time.monotonic() < expiry:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return True, result
+            del self._entries[key]
+        return False, None
+
+    def _store(self, key: str, result: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def call(self, key: str, fn: Callable[[], T]) -> T:
+        """Return the memoized result for `key`, or compute it using `fn()`.
+
+        Args:
+            key: identifies the call, usually :meth:`APIMethod.canonicalRequest`.
+            fn: makes the call.
+        """
+        with self._lock:
+            found, result = self._lookup(key)
+            if found:
+                return result
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._inflight[key] = Future()
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def call_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Same as :meth:`call`, for coroutines. Coalesces calls made from the same event loop.
+
+        Args:
+            key: identifies the call, usually :meth:`APIMethod.canonicalRequest`.
+            fn: makes the call.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            found, result = self._lookup(key)
+            if found:
+                return result
+
+            future = self._inflight_async.get((loop, key))
+            leader = future is None
+            if future is None:
+                future = self._inflight_async[(loop, key)] = loop.create_future()
+                self.stats.misses += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # the failure is re-raised below, even if nobody else waits for it
+            raise
+        else:
+            self._store(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight_async[(loop, key)]
+
+    def clear(self):
+        """Forget all memoized results."""
+        with self._lock:
+            self._entries.clear()
+
+
+__all__ = ["MemoStats", "ResultMemo"]
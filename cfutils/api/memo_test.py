@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cfutils.api.memo import ResultMemo
+
+
+def test_memo_single_flight_threads():
+    memo = ResultMemo(ttl=60)
+    calls = 0
+    started = threading.Event()
+
+    def fetch():
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.1)
+        return ["result"]
+
+    with ThreadPoolExecutor(8) as pool:
+        first = pool.submit(memo.call, "user.info?handles=tourist", fetch)
+        started.wait()
+        rest = [
+            pool.submit(memo.call, "user.info?handles=tourist", fetch) for _ in range(7)
+        ]
+        results = [first.result()] + [f.result() for f in rest]
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert memo.stats.misses == 1
+    assert memo.stats.coalesced == 7
+
+
+def test_memo_ttl_and_errors():
+    memo = ResultMemo(ttl=0)
+    assert memo.call("a", lambda: 1) == 1
+    assert memo.call("a", lambda: 2) == 2
+
+    def fail():
+        raise ValueError("API down")
+
+    memo = ResultMemo(ttl=60)
+    with pytest.raises(ValueError):
+        memo.call("a", fail)
+    assert memo.call("a", lambda: 3) == 3
+    assert memo.call("a", lambda: 4) == 3
+    assert memo.stats.hits == 1
+
+
+def test_memo_single_flight_async():
+    memo = ResultMemo(ttl=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    async def run():
+        return await asyncio.gather(*(memo.call_async("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == 1
@@ -1,6 +1,8 @@
 """
 Helpers for `Codeforces API Methods <https://codeforces.com/apiHelp/methods>`_.
 """
+import asyncio
+import functools
 import secrets
 import time
 import hashlib
@@ -8,11 +10,11 @@ import os
 import logging
 import json
 import typing
-from typing import Optional, Any
+import warnings
+from typing import Optional, Any, BinaryIO, Hashable, Iterable, Iterator, Sequence
 from abc import abstractmethod, ABC
-from dataclasses import dataclass, is_dataclass, asdict
-import sh  # type: ignore
-from io import StringIO
+from concurrent.futures import Executor
+from dataclasses import dataclass, is_dataclass, asdict, replace
 from dataclass_wizard import JSONWizard  # type: ignore
 
 from cfutils.api.objects import (
@@ -28,6 +30,24 @@ from cfutils.api.objects import (
     Hack,
     RanklistRow,
     CFObject,
+    party_key,
+)
+from cfutils.api.cache import ResponseCache
+from cfutils.api.decoders import Interner, decode, decoder_for
+from cfutils.api.memo import ResultMemo
+from cfutils.api.ratelimit import (
+    RateLimiter,
+    _delay_rate_limiter,
+    get_default_rate_limiter,
+)
+from cfutils.api.snapshot import load_snapshot, save_snapshot
+from cfutils.api.streaming import ResultStream
+from cfutils.api.table import SubmissionTable
+from cfutils.api.transport import (
+    AsyncTransport,
+    Transport,
+    get_default_async_transport,
+    get_default_transport,
 )
 
 
@@ -82,24 +102,41 @@ class APIMethod(ABC):
             f"type {type(value)} not allowed as a API parameter, cannot serialize."
         )
 
-    def __parse(self, data):
-        resultType = self.resultType()
-
-        if typing.get_origin(resultType) == list:
-            baseType = typing.get_args(resultType)[0]
-            if baseType == str or baseType == int:
-                return data
-            return [baseType.from_dict(elem) for elem in data]
-
-        if issubclass(resultType, JSONWizard):
-            return resultType.from_dict(data)  # type: ignore
-
-        assert f"invalid resultType {resultType}"
+    def __parse(
+        self,
+        data,
+        *,
+        trusted: bool = False,
+        interner: Interner | None = None,
+        fields: Sequence[str] | None = None,
+    ):
+        if interner is not None:
+            return interner.decode(
+                self.resultType(), data, trusted=trusted, fields=fields
+            )
+        return decode(self.resultType(), data, trusted=trusted, fields=fields)
 
     def __get_opts(self) -> dict[str, Any]:
         assert is_dataclass(self) and not isinstance(self, type)
         return asdict(self)
 
+    def canonicalRequest(self, *, auth: bool = False) -> str:
+        """Method name and sorted parameters of the call, without the authorization parameters (`apiKey`, `time`, `apiSig`).
+        Identifies the call, for example in caches.
+
+        Args:
+            auth: authorized call. Appends `#auth`, as authorized calls can return more data.
+
+        >>> Contest_Status(contestId=566, From=1, count=10).canonicalRequest()
+        'contest.status?asManager=False&contestId=566&count=10&from=1'
+        """
+        request = self.buildAPICallURL().removeprefix("https://codeforces.com/api/")
+        return request + ("#auth" if auth else "")
+
+    def _memoKey(self, *, auth: bool, fields: Sequence[str] | None) -> str:
+        key = self.canonicalRequest(auth=auth)
+        return key if fields is None else f"{key}#fields={','.join(fields)}"
+
     def buildAPICallURL(self, *, auth: bool = False):
         """Build the URL to call the CF API
 
@@ -156,42 +193,385 @@ class APIMethod(ABC):
         self,
         *,
         auth: bool = False,
-        delay: float = 2.0,
+        limiter: RateLimiter | None = None,
         output_file: str | None = None,
         load_from_file: str | None = None,
+        transport: Transport | None = None,
+        cache: ResponseCache | None = None,
+        memo: ResultMemo | None = None,
+        trusted: bool = False,
+        interner: Interner | None = None,
+        fields: Sequence[str] | None = None,
+        snapshot: str | None = None,
+        delay: float | None = None,
     ):
         """Execute an API call to codeforces
 
         Args:
             auth: authorized API call, signed using your API key.
-            delay (optional): number of seconds to wait before executing the call. Default is 2s.
+            limiter (optional): rate limiter to wait on before executing the call. Defaults to `get_default_rate_limiter()`, which allows one call every 2s. Not used when loading from a file or cache.
             output_file (optional): write raw API response to file.
             load_from_file (optional): If this file exists, load data from it instead of running the API. Useful if you've already called the API or called it from a different source and saved the response.
+            transport (optional): HTTP backend used for the call. Defaults to `get_default_transport()`, a pooled in-process client.
+            cache (optional): reuse a cached response if it is still fresh, and cache the response of the API call otherwise. Prefer this over `output_file`/`load_from_file`.
+            memo (optional): reuse the parsed result of an identical recent call, or wait for an identical call in flight, instead of making a new one.
+            trusted: skip the validation of the response while parsing it (see :mod:`cfutils.api.decoders`). Faster, but a malformed response is not detected.
+            interner (optional): share equal `Problem`/`Party`/`Member` objects and strings with everything else decoded by this interner, see :class:`Interner`.
+            fields (optional): only decode these fields of the result (or of its elements, for a list), into lightweight records, see :func:`decoder_for`. For example `["id", "verdict", "problem.index"]`.
+            snapshot (optional): binary snapshot file of the parsed result, see :mod:`cfutils.api.snapshot`.
+                If it is up to date (same call, same `cfutils.api.objects`, and `load_from_file` unchanged), the result is loaded from it, without any of the above
+                (except `interner`, which then shares the loaded objects, see :meth:`Interner.intern`).
+                Otherwise, it is written once the result is parsed. Requires `load_from_file`, and cannot be combined with `fields`.
+            delay (optional): deprecated, use `limiter`. Calls with the same `delay` share a `RateLimiter(interval=delay)`.
 
         Raises:
             CFAPIError: when API call fails.
             CFAPIError: when `auth=True` but API key/secret is not provided.
+            ValueError: when both `delay` and `limiter` are given.
+            ValueError: when `snapshot` is given without `load_from_file`, or with `fields`.
 
         Returns:
-            "result" component of the API data returned, parsed appropriately into an object of type `self.resultType()`.
+            "result" component of the API data returned, parsed appropriately into an object of type `self.resultType()`
+            (or records of the selected `fields`).
         """
 
+        if delay is not None:
+            warnings.warn(
+                "`delay` is deprecated, pass a `limiter` instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            if limiter is not None:
+                raise ValueError("pass either `delay` or `limiter`, not both")
+            limiter = _delay_rate_limiter(delay)
+
+        if memo is not None:
+            return memo.call(
+                self._memoKey(auth=auth, fields=fields),
+                functools.partial(
+                    self.get,
+                    auth=auth,
+                    limiter=limiter,
+                    output_file=output_file,
+                    load_from_file=load_from_file,
+                    transport=transport,
+                    cache=cache,
+                    trusted=trusted,
+                    interner=interner,
+                    fields=fields,
+                    snapshot=snapshot,
+                ),
+            )
+
+        if snapshot is not None:
+            if fields is not None:
+                raise ValueError("snapshots store whole objects, not `fields`")
+            if load_from_file is None:
+                # without a source file, nothing tells when the snapshot is stale.
+                raise ValueError("snapshots need a `load_from_file` to check")
+            request = self.canonicalRequest(auth=auth)
+            result = load_snapshot(
+                snapshot, self.resultType(), request=request, source=load_from_file
+            )
+            if result is not None:
+                logging.info("API(%s) load from snapshot: %s", self.name(), snapshot)
+                return result if interner is None else interner.intern(result)
+
+            result = self.get(
+                auth=auth,
+                limiter=limiter,
+                output_file=output_file,
+                load_from_file=load_from_file,
+                transport=transport,
+                cache=cache,
+                trusted=trusted,
+                interner=interner,
+            )
+            logging.info("API(%s) saving snapshot: %s", self.name(), snapshot)
+            save_snapshot(
+                snapshot,
+                self.resultType(),
+                result,
+                request=request,
+                source=load_from_file,
+            )
+            return result
+
         if load_from_file is not None and os.path.isfile(load_from_file):
-            logging.info("API(%s) load from file: %s", self.name(), load_from_file)
-            with open(load_from_file) as inf:
-                data = json.load(inf)
+            return self._complete(
+                None,
+                output_file=output_file,
+                load_from_file=load_from_file,
+                trusted=trusted,
+                interner=interner,
+                fields=fields,
+            )
+
+        if self.auth_required() and not auth:
+            raise CFAPIError("API call requires authorization")
+
+        if cache is not None:
+            cached = cache.load(self, auth=auth)
+            if cached is not None:
+                return self._complete(
+                    cached,
+                    output_file=output_file,
+                    load_from_file=load_from_file,
+                    trusted=trusted,
+                    interner=interner,
+                    fields=fields,
+                )
+
+        # run API call
+        if limiter is None:
+            limiter = get_default_rate_limiter()
+        waited = limiter.acquire()
+        url = self.buildAPICallURL(auth=auth)
+        logging.debug("API(%s) waited %.3fs for the rate limit", self.name(), waited)
+        logging.info("API(%s) call: %s", self.name(), url)
+
+        if transport is None:
+            transport = get_default_transport()
+        with transport.open(url) as body:
+            if cache is None:
+                # decode while reading, without buffering the whole response.
+                data = json.load(body)
+            else:
+                data = payload = body.read()
+
+        result = self._complete(
+            data,
+            output_file=output_file,
+            load_from_file=load_from_file,
+            trusted=trusted,
+            interner=interner,
+            fields=fields,
+        )
+        if cache is not None:
+            cache.store(self, payload, auth=auth, result=result)
+        return result
+
+    async def get_async(
+        self,
+        *,
+        auth: bool = False,
+        limiter: RateLimiter | None = None,
+        output_file: str | None = None,
+        load_from_file: str | None = None,
+        transport: AsyncTransport | None = None,
+        executor: Executor | None = None,
+        cache: ResponseCache | None = None,
+        memo: ResultMemo | None = None,
+        trusted: bool = False,
+        interner: Interner | None = None,
+        fields: Sequence[str] | None = None,
+    ):
+        """Execute an API call to codeforces without blocking the event loop.
+
+        The request is made using a non-blocking transport, and the response is decoded and parsed in `executor`,
+        so that large responses do not stall other tasks.
+
+        Args:
+            auth: authorized API call, signed using your API key.
+            limiter (optional): rate limiter to wait on before executing the call. Defaults to `get_default_rate_limiter()`.
+            output_file (optional): write raw API response to file.
+            load_from_file (optional): If this file exists, load data from it instead of running the API.
+            transport (optional): asyncio HTTP backend used for the call. Defaults to `get_default_async_transport()`.
+            executor (optional): executor used to decode and parse the response. Defaults to the event loop's default executor.
+            cache (optional): response cache, see :meth:`get`.
+            memo (optional): in-memory memo of results, see :meth:`get`.
+            trusted: skip the validation of the response, see :meth:`get`.
+            interner (optional): share objects with other results, see :meth:`get`.
+            fields (optional): only decode these fields, see :meth:`get`.
+
+        Raises:
+            CFAPIError: when API call fails.
+            CFAPIError: when `auth=True` but API key/secret is not provided.
+
+        Returns:
+            Same as :meth:`get`.
+        """
+        if memo is not None:
+            return await memo.call_async(
+                self._memoKey(auth=auth, fields=fields),
+                functools.partial(
+                    self.get_async,
+                    auth=auth,
+                    limiter=limiter,
+                    output_file=output_file,
+                    load_from_file=load_from_file,
+                    transport=transport,
+                    executor=executor,
+                    cache=cache,
+                    trusted=trusted,
+                    interner=interner,
+                    fields=fields,
+                ),
+            )
+
+        loop = asyncio.get_running_loop()
+
+        if load_from_file is not None and os.path.isfile(load_from_file):
+            return await loop.run_in_executor(
+                executor,
+                functools.partial(
+                    self._complete,
+                    None,
+                    output_file=output_file,
+                    load_from_file=load_from_file,
+                    trusted=trusted,
+                    interner=interner,
+                    fields=fields,
+                ),
+            )
+
+        if self.auth_required() and not auth:
+            raise CFAPIError("API call requires authorization")
+
+        if cache is not None:
+            cached = await loop.run_in_executor(
+                None, functools.partial(cache.load, self, auth=auth)
+            )
+            if cached is not None:
+                return await loop.run_in_executor(
+                    executor,
+                    functools.partial(
+                        self._complete,
+                        cached,
+                        output_file=output_file,
+                        load_from_file=load_from_file,
+                        trusted=trusted,
+                        interner=interner,
+                        fields=fields,
+                    ),
+                )
+
+        # run API call
+        if limiter is None:
+            limiter = get_default_rate_limiter()
+        waited = await limiter.acquire_async()
+        url = self.buildAPICallURL(auth=auth)
+        logging.debug("API(%s) waited %.3fs for the rate limit", self.name(), waited)
+        logging.info("API(%s) call: %s", self.name(), url)
+
+        if transport is None:
+            transport = get_default_async_transport()
+        body = await transport.fetch(url)
+
+        result = await loop.run_in_executor(
+            executor,
+            functools.partial(
+                self._complete,
+                body,
+                output_file=output_file,
+                load_from_file=load_from_file,
+                trusted=trusted,
+                interner=interner,
+                fields=fields,
+            ),
+        )
+        if cache is not None:
+            await loop.run_in_executor(
+                None,
+                functools.partial(cache.store, self, body, auth=auth, result=result),
+            )
+        return result
+
+    def stream(
+        self,
+        *,
+        auth: bool = False,
+        limiter: RateLimiter | None = None,
+        load_from_file: str | None = None,
+        transport: Transport | None = None,
+        trusted: bool = False,
+        interner: Interner | None = None,
+        fields: Sequence[str] | None = None,
+        raw: bool = False,
+    ) -> Iterator[Any]:
+        """Execute an API call whose result is a list, and yield the parsed elements one by one while the response is read.
+
+        Unlike :meth:`get`, the whole response is never held in memory, which keeps the peak memory low for large results
+        like `user.ratedList` or `contest.status`, as long as the caller does not keep all the elements.
+
+        Args:
+            auth: authorized API call, signed using your API key.
+            limiter (optional): rate limiter to wait on before executing the call. Defaults to `get_default_rate_limiter()`.
+            load_from_file (optional): If this file exists, read data from it instead of running the API.
+            transport (optional): HTTP backend used for the call. Defaults to `get_default_transport()`.
+            trusted: skip the validation of the elements, see :meth:`get`.
+            interner (optional): share objects with other results, see :meth:`get`.
+            fields (optional): only decode these fields, see :meth:`get`.
+            raw: yield the JSON elements as they are, without parsing them.
+
+        Raises:
+            CFAPIError: when API call fails.
+            CFAPIError: when `auth=True` but API key/secret is not provided.
+            TypeError: when the result of the method is not a list.
+
+        Yields:
+            Elements of the "result" list, parsed into objects of type `T` where `self.resultType()` is `list[T]`.
+        """
+        resultType = self.resultType()
+        if typing.get_origin(resultType) is not list:
+            raise TypeError(f"API({self.name()}) result is not a list: {resultType}")
+        baseType = typing.get_args(resultType)[0]
+        parse = (
+            (lambda elem: elem)
+            if raw or baseType in (str, int)
+            else (interner.decoder_for if interner else decoder_for)(
+                baseType, trusted=trusted, fields=fields
+            )
+        )
+
+        body: BinaryIO
+        if load_from_file is not None and os.path.isfile(load_from_file):
+            logging.info("API(%s) stream from file: %s", self.name(), load_from_file)
+            body = open(load_from_file, "rb")
         else:
             if self.auth_required() and not auth:
                 raise CFAPIError("API call requires authorization")
 
-            # run API call
-            time.sleep(delay)
+            if limiter is None:
+                limiter = get_default_rate_limiter()
+            waited = limiter.acquire()
             url = self.buildAPICallURL(auth=auth)
-            logging.info("API(%s) call: %s", self.name(), url)
+            logging.debug(
+                "API(%s) waited %.3fs for the rate limit", self.name(), waited
+            )
+            logging.info("API(%s) stream: %s", self.name(), url)
 
-            buf = StringIO()
-            sh.curl(url, _out=buf)  # type: ignore
-            data = json.loads(buf.getvalue())
+            if transport is None:
+                transport = get_default_transport()
+            body = transport.open(url)
+
+        with body:
+            response = ResultStream(body)
+            for elem in response:
+                yield parse(elem)
+
+        if response.envelope.get("status") != "OK":
+            raise CFAPIError(response.envelope.get("comment"))
+
+    def _complete(
+        self,
+        data: dict | bytes | None,
+        *,
+        output_file: str | None,
+        load_from_file: str | None,
+        trusted: bool = False,
+        interner: Interner | None = None,
+        fields: Sequence[str] | None = None,
+    ):
+        """Check and parse the API response `data` (raw or decoded JSON). Loads `load_from_file` when `data` is None."""
+        if data is None:
+            assert load_from_file is not None
+            logging.info("API(%s) load from file: %s", self.name(), load_from_file)
+            with open(load_from_file) as inf:
+                data = json.load(inf)
+        elif isinstance(data, bytes):
+            data = json.loads(data)
+        assert isinstance(data, dict)
 
         if data["status"] != "OK":
             raise CFAPIError(data["comment"])
@@ -203,7 +583,142 @@ class APIMethod(ABC):
             with open(output_file, "w") as outf:
                 json.dump(data, outf, indent=2)
 
-        return self.__parse(data["result"])
+        return self.__parse(
+            data["result"], trusted=trusted, interner=interner, fields=fields
+        )
+
+
+async def gather_methods(
+    methods: Iterable[APIMethod],
+    *,
+    auth: bool = False,
+    limiter: RateLimiter | None = None,
+    transport: AsyncTransport | None = None,
+    executor: Executor | None = None,
+) -> list[Any]:
+    """Execute several API calls concurrently, under a shared rate limit.
+
+    Example:
+
+    .. code::
+
+        infos, ratings = await gather_methods([User_Info(handles=["tourist"]), User_Rating(handle="tourist")])
+
+    Args:
+        methods: API calls to execute.
+        auth: authorized API calls, signed using your API key.
+        limiter (optional): rate limiter shared by all calls. Defaults to `get_default_rate_limiter()`.
+        transport (optional): asyncio HTTP backend. Defaults to `get_default_async_transport()`.
+        executor (optional): executor used to decode and parse the responses.
+
+    Returns:
+        One entry per method, in the same order: the parsed result of the call, or the exception it raised (usually a `CFAPIError`).
+    """
+    return await asyncio.gather(
+        *(
+            method.get_async(
+                auth=auth, limiter=limiter, transport=transport, executor=executor
+            )
+            for method in methods
+        ),
+        return_exceptions=True,
+    )
+
+
+class PaginatedAPIMethod(APIMethod):
+    """Base class for API methods that return a slice of a long list, selected using the parameters `From` (1-based) and `count`.
+
+    Use :meth:`iter_pages` and :meth:`iter_items` to lazily fetch the whole list (starting at `From`) in fixed-size pages,
+    instead of a single call with a huge `count`.
+    """
+
+    From: int
+    count: int
+
+    @staticmethod
+    def _page_items(page) -> list:
+        """Items contained in one page of results"""
+        return page
+
+    @staticmethod
+    def _item_key(item) -> Hashable:
+        """Identity of an item, used to drop items repeated across pages"""
+        return item
+
+    def iter_pages(self, *, page_size: int = 1000, **kwargs) -> Iterator[Any]:
+        """Fetch results one page at a time, starting at `self.From`, until the list is exhausted.
+        `self.count` is ignored.
+
+        Args:
+            page_size: number of items requested per call.
+            **kwargs: passed to :meth:`APIMethod.get` for every page.
+                With `fields`, the fields needed to page through the results must be selected (`rows` for standings).
+
+        Yields:
+            Each page, parsed into an object of type `self.resultType()`.
+        """
+        start = self.From
+        while True:
+            page = replace(self, From=start, count=page_size).get(**kwargs)  # type: ignore
+            yield page
+
+            fetched = len(self._page_items(page))
+            if fetched < page_size:
+                return
+            start += fetched
+
+    def iter_items(self, *, page_size: int = 1000, **kwargs) -> Iterator[Any]:
+        """Fetch results one page at a time (see :meth:`iter_pages`), and yield the items one by one.
+        Items that shift to the next page while iterating (for example due to new submissions during a live contest) are only yielded once.
+
+        Caveat:
+            Only the items of the previous page are remembered, so that the memory is bounded by the page size.
+            While the list changes (e.g. the standings of a live contest), an item that moves up to an earlier page is skipped,
+            and an item that moves down by more than a page is yielded twice.
+
+        Args:
+            page_size: number of items requested per call.
+            **kwargs: passed to :meth:`APIMethod.get` for every page.
+        """
+        previous: set[Hashable] = set()
+        for page in self.iter_pages(page_size=page_size, **kwargs):
+            current: set[Hashable] = set()
+            for item in self._page_items(page):
+                key = self._item_key(item)
+                if key not in previous and key not in current:
+                    current.add(key)
+                    yield item
+            previous = current
+
+
+class _PaginatedSubmissions(PaginatedAPIMethod):
+    """Submission lists, which are sorted by decreasing submission id."""
+
+    def iter_items(self, *, page_size: int = 1000, **kwargs) -> Iterator[Submission]:
+        fields = kwargs.get("fields")
+        if fields is not None and "id" not in fields:
+            raise ValueError("iter_items needs the `id` field to skip repeated items")
+
+        # New submissions only push older ones to later pages, so any submission not older than the last one yielded is a repeat.
+        # This keeps the memory bounded by the page size, instead of remembering every id.
+        last_id: Optional[int] = None
+        for page in self.iter_pages(page_size=page_size, **kwargs):
+            for sub in page:
+                if last_id is None or sub.id < last_id:
+                    last_id = sub.id
+                    yield sub
+
+    def table(self, *, interner: Interner | None = None, **kwargs) -> SubmissionTable:
+        """Execute the API call, and store the submissions in a columnar :class:`SubmissionTable`.
+        The table is built from the JSON while the response is read, without creating `Submission` objects.
+
+        Args:
+            interner (optional): used to decode the parties and problems.
+            **kwargs: passed to :meth:`stream`.
+        """
+        return SubmissionTable.from_json(
+            self.stream(raw=True, **kwargs), interner=interner
+        )
 
 
 @dataclass
@@ -292,7 +807,7 @@ class Contest_RatingChanges(APIMethod):
 
 
 @dataclass
-class Contest_Standings(APIMethod):
+class Contest_Standings(PaginatedAPIMethod):
     """Returns the description of the contest and the requested part of the standings."""
 
     contestId: int
@@ -316,9 +831,17 @@ class Contest_Standings(APIMethod):
     def resultType() -> type:
         return Contest_Standings.Result
 
+    @staticmethod
+    def _page_items(page: "Contest_Standings.Result") -> list[RanklistRow]:
+        return page.rows
+
+    @staticmethod
+    def _item_key(row: RanklistRow) -> Hashable:
+        return party_key(row.party)
+
 
 @dataclass
-class Contest_Status(APIMethod):
+class Contest_Status(_PaginatedSubmissions):
     """Returns submissions for specified contest.
     Optionally can return submissions of specified user.
     """
@@ -464,7 +987,7 @@ class User_Rating(APIMethod):
 
 
 @dataclass
-class User_Status(APIMethod):
+class User_Status(_PaginatedSubmissions):
     """Submissions of specified user."""
 
     handle: str
@@ -483,6 +1006,8 @@ class User_Status(APIMethod):
 __all__ = [
     "APIMethod",
     "CFAPIError",
+    "gather_methods",
+    "PaginatedAPIMethod",
     "BlogEntry_Comments",
     "BlogEntry_View",
     "Contest_Hacks",
@@ -1,9 +1,14 @@
+import asyncio
+import json
 import typing
 from dataclasses import dataclass
 import pytest
 
+from cfutils.api.fake_transport_test import FakeTransport, page
 from cfutils.api.methods import (
     APIMethod,
+    CFAPIError,
+    gather_methods,
     BlogEntry_Comments,
     BlogEntry_View,
     Contest_List,
@@ -21,6 +26,8 @@ from cfutils.api.methods import (
     User_Status,
     User_Info,
 )
+from cfutils.api.ratelimit import RateLimiter
+from cfutils.api.transport import AsyncTransport
 
 
 @dataclass
@@ -115,3 +122,85 @@ def test_method(example: MethodExample):
     else:
         # assert resultType.Meta.raise_on_unknown_json_key  # type: ignore
         assert isinstance(obj, resultType)
+
+
+class FixtureTransport(AsyncTransport):
+    """Serves the example responses in `data/examples/api` instead of calling the API."""
+
+    async def fetch(self, url: str) -> bytes:
+        name = url.removeprefix("https://codeforces.com/api/").split("?")[0]
+        with open(f"data/examples/api/{name}.json", "rb") as inf:
+            return inf.read()
+
+
+def test_gather_methods():
+    methods = [
+        methodExamples["user.info"].method,
+        User_Friends(),  # requires auth
+        methodExamples["user.rating"].method,
+    ]
+    results = asyncio.run(
+        gather_methods(
+            methods, limiter=RateLimiter(interval=0), transport=FixtureTransport()
+        )
+    )
+
+    assert [user.handle for user in results[0]] == [
+        "DmitriyH",
+        "Fefer_Ivan",
+        "codelegend",
+    ]
+    assert isinstance(results[1], CFAPIError)
+    assert all(change.handle == "codelegend" for change in results[2])
+
+
+def test_iter_items_contest_status():
+    with open("data/examples/resolverfeed/status_104491.json") as inf:
+        submissions = json.load(inf)["result"]
+    expected_ids = [sub["id"] for sub in submissions]
+
+    def new_submission(transport: FakeTransport):
+        """shifts the older submissions to later pages"""
+        submissions.insert(0, {**submissions[0], "id": submissions[0]["id"] + 1})
+
+    transport = FakeTransport(
+        {"contest.status": submissions}, after_call=new_submission
+    )
+    items = Contest_Status(contestId=104491, From=1, count=1).iter_items(
+        page_size=100, limiter=RateLimiter(interval=0), transport=transport
+    )
+
+    assert [sub.id for sub in items] == expected_ids
+    assert len(transport.calls) == 6
+
+
+def test_iter_items_contest_standings():
+    with open("data/examples/resolverfeed/standings_104491.json") as inf:
+        standings = json.load(inf)["result"]
+    rows = standings["rows"]
+    expected = [
+        tuple(member["handle"] for member in row["party"]["members"]) for row in rows
+    ]
+
+    def new_party(transport: FakeTransport):
+        """added at the top, shifts the others to later pages"""
+        party = {
+            "contestId": rows[0]["party"]["contestId"],
+            "members": [{"handle": f"newcomer{len(transport.calls)}"}],
+            "participantType": "CONTESTANT",
+            "ghost": False,
+        }
+        rows.insert(0, {**rows[0], "party": party})
+
+    transport = FakeTransport(
+        {"contest.standings": lambda params: {**standings, "rows": page(rows, params)}},
+        after_call=new_party,
+    )
+    items = Contest_Standings(contestId=104491, From=1, count=1).iter_items(
+        page_size=20, limiter=RateLimiter(interval=0), transport=transport
+    )
+
+    assert [
+        tuple(member.handle for member in row.party.members) for row in items
+    ] == expected
+    assert len(transport.calls) == len(expected) // 20 + 1
@@ -5,7 +5,7 @@ See https://codeforces.com/apiHelp/objects for a full list and information on ea
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Hashable, Optional
 from dataclass_wizard import JSONWizard  # type: ignore
 
 
@@ -14,7 +14,7 @@ class GlobalJSONMeta(JSONWizard.Meta):
     raise_on_unknown_json_key = True
 
 
-@dataclass
+@dataclass(slots=True)
 class CFObject(JSONWizard):
     """Base class for codeforces API return Objects.
     See https://codeforces.com/apiHelp/objects for a full list.
@@ -25,7 +25,7 @@ class CFObject(JSONWizard):
     #     raise_on_unknown_json_key = True
 
 
-@dataclass
+@dataclass(slots=True)
 class User(CFObject):
     handle: str
     email: Optional[str] = None
@@ -48,7 +48,7 @@ class User(CFObject):
     titlePhoto: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BlogEntry(CFObject):
     id: int
     originalLocale: str
@@ -63,7 +63,7 @@ class BlogEntry(CFObject):
     modificationTimeSeconds: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment(CFObject):
     id: int
     creationTimeSeconds: int
@@ -74,14 +74,14 @@ class Comment(CFObject):
     parentCommentId: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RecentAction(CFObject):
     timeSeconds: int
     blogEntry: Optional[BlogEntry] = None
     comment: Optional[Comment] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RatingChange(CFObject):
     contestId: int
     contestName: str
@@ -106,7 +106,7 @@ class ContestPhase(Enum):
     FINISHED = "FINISHED"
 
 
-@dataclass
+@dataclass(slots=True)
 class Contest(CFObject):
     id: int
     name: str
@@ -127,7 +127,7 @@ class Contest(CFObject):
     season: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Member(CFObject):
     handle: str
     name: Optional[str] = None
@@ -141,7 +141,7 @@ class ParticipantType(Enum):
     OUT_OF_COMPETITION = "OUT_OF_COMPETITION"
 
 
-@dataclass
+@dataclass(slots=True)
 class Party(CFObject):
     members: list[Member]
     participantType: ParticipantType
@@ -153,12 +153,33 @@ class Party(CFObject):
     startTimeSeconds: Optional[int] = None
 
 
+PARTY_KEY_FIELDS = ("participantType", "teamId", "teamName", "ghost")
+"""Fields that identify a party, with the handles of its members (see :func:`party_key`)"""
+
+
+def party_key(party: Party) -> Hashable:
+    """Identifies a party across API results (`Party` objects are not hashable):
+    the handles of its members, and its `PARTY_KEY_FIELDS` (enums by value, like in the JSON).
+    Other fields, like `room`, are not part of it, as some results leave them out.
+
+    >>> party_key(Party(members=[Member(handle="tourist")], participantType=ParticipantType.CONTESTANT))
+    (('tourist',), 'CONTESTANT', None, None, False)
+    """
+    return (
+        tuple([member.handle for member in party.members]),
+        party.participantType.value,
+        party.teamId,
+        party.teamName,
+        party.ghost,
+    )
+
+
 class ProblemType(Enum):
     PROGRAMMING = "PROGRAMMING"
     QUESTION = "QUESTION"
 
 
-@dataclass
+@dataclass(slots=True)
 class Problem(CFObject):
     index: str
     name: str
@@ -170,7 +191,7 @@ class Problem(CFObject):
     rating: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProblemStatistics(CFObject):
     index: str
     solvedCount: int
@@ -214,7 +235,7 @@ class Testset(Enum):
     TESTS10 = "TESTS10"
 
 
-@dataclass
+@dataclass(slots=True)
 class Submission(CFObject):
     id: int
     creationTimeSeconds: int
@@ -242,14 +263,14 @@ class HackVerdict(Enum):
     OTHER = "OTHER"
 
 
-@dataclass
+@dataclass(slots=True)
 class JudgeProtocol:
     manual: bool
     protocol: str
     verdict: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Hack(CFObject):
     id: int
     creationTimeSeconds: int
@@ -266,7 +287,7 @@ class ProblemResultType(Enum):
     PRELIMINARY = "PRELIMINARY"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProblemResult(CFObject):
     points: float
     rejectedAttemptCount: int
@@ -275,7 +296,7 @@ class ProblemResult(CFObject):
     bestSubmissionTimeSeconds: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RanklistRow(CFObject):
     party: Party
     rank: int
@@ -313,4 +334,7 @@ __all__ = [
     "Verdict",
     "JudgeProtocol",
     "HackVerdict",
+    ### Helpers
+    "PARTY_KEY_FIELDS",
+    "party_key",
 ]
@@ -69,3 +69,14 @@ def test_object_Party():
         members=[Member(handle="member1"), Member(handle="member2", name="Person Two")],
         participantType=ParticipantType.CONTESTANT,
     )
+
+
+def test_objects_are_slotted():
+    party = Party(
+        contestId=100,
+        members=[Member(handle="member1")],
+        participantType=ParticipantType.CONTESTANT,
+    )
+    assert not hasattr(party, "__dict__")
+    assert not hasattr(party.members[0], "__dict__")
+    assert Party.from_dict(party.to_dict()) == party
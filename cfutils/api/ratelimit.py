@@ -0,0 +1,164 @@
+"""
+Rate limiting for Codeforces API calls.
+
+Codeforces allows roughly one API call every two seconds per client.
+A :class:`RateLimiter` spaces out calls so that they stay under this limit without sleeping longer than necessary,
+and can be shared by several threads, or (using a lock file) by several processes.
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover (windows)
+    fcntl = None  # type: ignore
+
+
+@dataclass
+class RateLimiterStats:
+    calls: int = 0
+    """number of calls that went through the limiter"""
+
+    total_wait: float = 0.0
+    """total seconds spent waiting, over all calls"""
+
+    last_wait: float = 0.0
+    """seconds the most recent call waited"""
+
+
+class RateLimiter:
+    """Token bucket limiter allowing one call every `interval` seconds, with bursts of up to `burst` calls.
+
+    Only the remainder of the window since the previous call is waited for:
+    a call made long after the previous one goes through immediately.
+
+    Args:
+        interval: minimum average number of seconds between two calls.
+        burst: number of calls that can be made back-to-back after being idle.
+        lock_file (optional): share the limit with other processes using the same file.
+            The file stores the limiter state and is locked (`flock`) while being updated.
+    """
+
+    def __init__(
+        self,
+        interval: float = 2.0,
+        *,
+        burst: int = 1,
+        lock_file: str | None = None,
+    ):
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if lock_file is not None and fcntl is None:
+            raise NotImplementedError("lock files are not supported on this platform")
+
+        self.interval = interval
+        self.burst = burst
+        self.lock_file = lock_file
+        self.stats = RateLimiterStats()
+
+        self._lock = threading.Lock()
+        # theoretical arrival time: the bucket is full again at `_tat + (burst - 1) * interval`.
+        self._tat = 0.0
+
+    def _advance(self, tat: float, now: float) -> tuple[float, float]:
+        tat = max(tat, now)
+        start = max(now, tat - (self.burst - 1) * self.interval)
+        return start - now, tat + self.interval
+
+    def _reserve_shared(self, now: float) -> float:
+        assert self.lock_file is not None
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                tat = float(os.read(fd, 64) or 0.0)
+            except ValueError:
+                tat = 0.0
+            wait, tat = self._advance(tat, now)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.truncate(fd, 0)
+            os.write(fd, repr(tat).encode())
+        finally:
+            os.close(fd)  # also releases the lock
+        return wait
+
+    def reserve(self) -> float:
+        """Reserve a slot for the next call without waiting.
+
+        Returns:
+            Number of seconds the caller must wait before making the call.
+        """
+        with self._lock:
+            now = time.time()
+            if self.lock_file is not None:
+                wait = self._reserve_shared(now)
+            else:
+                wait, self._tat = self._advance(self._tat, now)
+
+            self.stats.calls += 1
+            self.stats.total_wait += wait
+            self.stats.last_wait = wait
+        return wait
+
+    def acquire(self) -> float:
+        """Block until the next call is allowed.
+
+        Returns:
+            Number of seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait (without blocking the event loop) until the next call is allowed.
+
+        Returns:
+            Number of seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_default_rate_limiter = RateLimiter()
+
+
+@functools.lru_cache(maxsize=None)
+def _delay_rate_limiter(delay: float) -> RateLimiter:
+    """Rate limiter of the deprecated `delay` argument of :meth:`APIMethod.get`, shared by the calls with the same delay"""
+    return RateLimiter(interval=delay)
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """Rate limiter used by API calls that do not pass one explicitly.
+    By default allows one call every two seconds, shared by all threads of this process.
+    """
+    return _default_rate_limiter
+
+
+def set_default_rate_limiter(limiter: RateLimiter):
+    """Replace the rate limiter used by API calls that do not pass one explicitly.
+
+    Example: share the limit with other worker processes.
+
+    .. code::
+
+        set_default_rate_limiter(RateLimiter(2.0, lock_file="/tmp/cfutils.ratelimit"))
+    """
+    global _default_rate_limiter
+    _default_rate_limiter = limiter
+
+
+__all__ = [
+    "RateLimiter",
+    "RateLimiterStats",
+    "get_default_rate_limiter",
+    "set_default_rate_limiter",
+]
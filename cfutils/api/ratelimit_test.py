@@ -0,0 +1,41 @@
+import pytest
+
+from cfutils.api.methods import User_Info
+from cfutils.api.ratelimit import RateLimiter, _delay_rate_limiter
+
+
+def test_rate_limiter_waits_only_for_remainder():
+    limiter = RateLimiter(interval=60)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(60, abs=1)
+    assert limiter.reserve() == pytest.approx(120, abs=1)
+    assert limiter.stats.calls == 3
+    assert limiter.stats.total_wait == pytest.approx(180, abs=2)
+
+
+def test_rate_limiter_burst():
+    limiter = RateLimiter(interval=60, burst=3)
+    waits = [limiter.reserve() for _ in range(4)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(60, abs=1)
+
+
+def test_rate_limiter_shared_lock_file(tmp_path):
+    lock_file = str(tmp_path / "ratelimit")
+    worker1 = RateLimiter(interval=60, lock_file=lock_file)
+    worker2 = RateLimiter(interval=60, lock_file=lock_file)
+
+    assert worker1.reserve() == 0
+    assert worker2.reserve() == pytest.approx(60, abs=1)
+    assert worker1.reserve() == pytest.approx(120, abs=1)
+
+
+def test_get_deprecated_delay():
+    method = User_Info(handles=["DmitriyH"])
+    with pytest.warns(DeprecationWarning):
+        result = method.get(load_from_file="data/examples/api/user.info.json", delay=0)
+    assert result[0].handle == "DmitriyH"
+    assert _delay_rate_limiter(0) is _delay_rate_limiter(0)
+
+    with pytest.raises(ValueError), pytest.warns(DeprecationWarning):
+        method.get(delay=0, limiter=RateLimiter())
@@ -0,0 +1,182 @@
+"""
+Rating histories of a whole community, built from one `contest.ratingChanges` call per rated contest
+(instead of one `user.rating` call per handle).
+"""
+import bisect
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from cfutils.api.methods import CFAPIError, Contest_List, Contest_RatingChanges
+from cfutils.api.objects import ContestPhase, RatingChange
+from cfutils.api.snapshot import load_snapshot, save_snapshot
+
+_STRIDE = 4
+"""Fields of a point in the series of a handle: time, contest id, old rating, new rating"""
+
+
+@dataclass(slots=True, frozen=True)
+class RatingPoint:
+    """A rating change of a handle"""
+
+    time: int
+    """`ratingUpdateTimeSeconds`"""
+    contestId: int
+    oldRating: int
+    newRating: int
+
+
+class RatingWarehouse:
+    """Rating history of every handle, indexed by handle and contest.
+
+    The history of each handle is a compact time series (a flat `array` of the points, sorted by time),
+    so queries like "rating of handle X at time T" are binary searches.
+
+    >>> from cfutils.api.objects import RatingChange
+    >>> warehouse = RatingWarehouse()
+    >>> warehouse.add(1, [RatingChange(1, "Round 1", "tourist", 1, 100, 1500, 1700)])
+    >>> warehouse.add(2, [RatingChange(2, "Round 2", "tourist", 1, 200, 1700, 1900)])
+    >>> warehouse.rating("tourist", 150), warehouse.rating("tourist", 99)
+    (1700, None)
+    >>> warehouse.change("tourist", 2)
+    RatingPoint(time=200, contestId=2, oldRating=1700, newRating=1900)
+    """
+
+    _snapshot_version = 1
+    """Version of the layout of `_series` and `_contests`, bumped when it changes (see :meth:`save`)"""
+
+    def __init__(self):
+        self._series: dict[str, array] = {}
+        self._contests: dict[int, Optional[int]] = {}
+
+    def __len__(self) -> int:
+        """Number of handles"""
+        return len(self._series)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._series
+
+    def handles(self) -> Iterable[str]:
+        return self._series.keys()
+
+    def contests(self) -> set[int]:
+        """Ids of the contests already in the warehouse (including unrated ones)"""
+        return set(self._contests)
+
+    @staticmethod
+    def _times(series: array) -> memoryview:
+        return memoryview(series)[::_STRIDE]
+
+    def add(self, contestId: int, changes: Iterable[RatingChange]):
+        """Add the rating changes of a contest (the result of `contest.ratingChanges`, empty for unrated contests).
+
+        Raises:
+            ValueError: if the contest is already in the warehouse.
+        """
+        if contestId in self._contests:
+            raise ValueError(f"contest {contestId} is already in the warehouse")
+
+        updated = None
+        for change in changes:
+            updated = change.ratingUpdateTimeSeconds
+            point = (updated, contestId, change.oldRating, change.newRating)
+            series = self._series.get(change.handle)
+            if series is None:
+                self._series[change.handle] = array("q", point)
+            elif series[-_STRIDE] <= updated:
+                series.extend(point)
+            else:
+                i = bisect.bisect_right(self._times(series), updated) * _STRIDE
+                series[i:i] = array("q", point)
+        self._contests[contestId] = updated
+
+    def _point(self, series: array, i: int) -> RatingPoint:
+        return RatingPoint(*series[i * _STRIDE : (i + 1) * _STRIDE])
+
+    def history(self, handle: str) -> list[RatingPoint]:
+        """All rating changes of a handle, oldest first"""
+        series = self._series.get(handle, array("q"))
+        return [self._point(series, i) for i in range(len(series) // _STRIDE)]
+
+    def rating(self, handle: str, at: int) -> Optional[int]:
+        """Rating of a handle at a time (in seconds), after all the changes up to that time, or `None` if it was unrated then."""
+        series = self._series.get(handle)
+        if series is None:
+            return None
+        i = bisect.bisect_right(self._times(series), at)
+        return series[(i - 1) * _STRIDE + 3] if i else None
+
+    def change(self, handle: str, contestId: int) -> Optional[RatingPoint]:
+        """Rating change of a handle in a contest, or `None` if it was not rated in the contest"""
+        series = self._series.get(handle)
+        updated = self._contests.get(contestId)
+        if series is None or updated is None:
+            return None
+        times = self._times(series)
+        i = bisect.bisect_left(times, updated)
+        while i < len(times) and times[i] == updated:
+            if series[i * _STRIDE + 1] == contestId:
+                return self._point(series, i)
+            i += 1
+        return None
+
+    def update(self, *, settle_seconds: int = 2 * 24 * 60 * 60, **kwargs) -> int:
+        """Fetch the rating changes of the finished contests that are not in the warehouse yet, oldest first:
+        one `contest.list` call, and one `contest.ratingChanges` call per new contest.
+
+        Args:
+            settle_seconds: a contest without rating changes is considered unrated once it has been over for this long.
+                Until then, it is fetched again by the next update, as its ratings may not be updated yet.
+            **kwargs: passed to :meth:`APIMethod.get` for every call.
+
+        Returns:
+            Number of contests added.
+        """
+        now = time.time()
+        contests = [
+            contest
+            for contest in Contest_List().get(**kwargs)
+            if contest.phase == ContestPhase.FINISHED
+            and contest.id not in self._contests
+        ]
+        contests.sort(key=lambda contest: (contest.startTimeSeconds or 0, contest.id))
+
+        added = 0
+        for contest in contests:
+            try:
+                changes = Contest_RatingChanges(contestId=contest.id).get(**kwargs)
+            except CFAPIError as e:
+                # unrated contests (e.g. with unusual rules) fail with this comment, other errors must not be mistaken for them.
+                if "unavailable" not in str(e):
+                    raise
+                logging.info("no rating changes for contest %d: %s", contest.id, e)
+                changes = []
+            end = (contest.startTimeSeconds or 0) + contest.durationSeconds
+            if not changes and now - end < settle_seconds:
+                continue
+            self.add(contest.id, changes)
+            added += 1
+        return added
+
+    def save(self, path: str):
+        """Write the warehouse to a snapshot file, see :mod:`cfutils.api.snapshot`."""
+        save_snapshot(path, _SnapshotState, (self._series, self._contests))
+
+    @classmethod
+    def load(cls, path: str) -> "RatingWarehouse":
+        """Read a warehouse written by :meth:`save`, or an empty one if the file does not exist (or is stale)."""
+        warehouse = cls()
+        state = load_snapshot(path, _SnapshotState)
+        if state is not None:
+            warehouse._series, warehouse._contests = state
+        return warehouse
+
+
+_SnapshotState = tuple[
+    RatingWarehouse, RatingPoint, dict[str, array], dict[int, Optional[int]]
+]
+"""Type of the snapshots of a warehouse: its version, the fields of the points of its series, and its state"""
+
+__all__ = ["RatingPoint", "RatingWarehouse"]
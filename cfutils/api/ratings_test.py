@@ -0,0 +1,118 @@
+import json
+from typing import Any
+
+from cfutils.api.fake_transport_test import FakeTransport
+from cfutils.api.methods import CFAPIError, Contest_RatingChanges
+from cfutils.api.objects import RatingChange
+from cfutils.api.ratelimit import RateLimiter
+from cfutils.api.ratings import RatingPoint, RatingWarehouse
+
+RATING_CHANGES_FILE = "data/examples/api/contest.ratingChanges.json"
+
+
+def test_rating_warehouse_queries():
+    changes = Contest_RatingChanges(contestId=566).get(
+        load_from_file=RATING_CHANGES_FILE
+    )
+    warehouse = RatingWarehouse()
+    # an older and a newer contest, added after the middle one.
+    warehouse.add(566, changes)
+    later = [
+        RatingChange(
+            600,
+            "later",
+            c.handle,
+            c.rank,
+            c.ratingUpdateTimeSeconds + 100,
+            c.newRating,
+            c.newRating + 1,
+        )
+        for c in changes
+    ]
+    earlier = [
+        RatingChange(
+            500,
+            "earlier",
+            c.handle,
+            c.rank,
+            c.ratingUpdateTimeSeconds - 100,
+            c.oldRating - 1,
+            c.oldRating,
+        )
+        for c in changes[:10]
+    ]
+    warehouse.add(600, later)
+    warehouse.add(500, earlier)
+
+    assert len(warehouse) == len(changes)
+    assert warehouse.contests() == {500, 566, 600}
+    change = changes[0]
+    t = change.ratingUpdateTimeSeconds
+    assert [p.contestId for p in warehouse.history(change.handle)] == [500, 566, 600]
+    assert warehouse.rating(change.handle, t - 101) is None
+    assert warehouse.rating(change.handle, t - 100) == change.oldRating
+    assert warehouse.rating(change.handle, t) == change.newRating
+    assert warehouse.rating(change.handle, t + 1000) == change.newRating + 1
+    assert warehouse.rating("nobody", t) is None
+
+    assert warehouse.change(change.handle, 566) == RatingPoint(
+        t, 566, change.oldRating, change.newRating
+    )
+    assert warehouse.change(changes[-1].handle, 500) is None
+    assert warehouse.change(change.handle, 1) is None
+
+
+def test_rating_warehouse_update(tmp_path):
+    with open(RATING_CHANGES_FILE) as inf:
+        changes = json.load(inf)["result"]
+
+    def contest(id: int, phase: str = "FINISHED") -> dict:
+        return {
+            "id": id,
+            "name": f"Round {id}",
+            "type": "CF",
+            "phase": phase,
+            "frozen": False,
+            "durationSeconds": 7200,
+            "startTimeSeconds": 1438273200,
+        }
+
+    contests = [contest(566), contest(567), contest(568, "CODING")]
+
+    def rating_changes(params: dict[str, str]) -> list[dict]:
+        if params["contestId"] != "566":
+            raise CFAPIError(
+                "contestId: Rating changes are unavailable for this contest"
+            )
+        return changes
+
+    transport = FakeTransport(
+        {"contest.list": contests, "contest.ratingChanges": rating_changes}
+    )
+    kwargs: dict[str, Any] = {
+        "limiter": RateLimiter(interval=0),
+        "transport": transport,
+    }
+
+    warehouse = RatingWarehouse()
+    assert warehouse.update(**kwargs) == 2
+    assert transport.calls == [
+        "contest.list",
+        "contest.ratingChanges",
+        "contest.ratingChanges",
+    ]
+    assert warehouse.contests() == {566, 567}
+    assert len(warehouse) == len(changes)
+
+    path = str(tmp_path / "ratings.snapshot")
+    warehouse.save(path)
+    loaded = RatingWarehouse.load(path)
+    handle = changes[0]["handle"]
+    assert loaded.history(handle) == warehouse.history(handle)
+
+    # only the new contest is fetched.
+    contests.append(contest(569))
+    transport.calls = []
+    assert loaded.update(**kwargs) == 1
+    assert transport.calls == ["contest.list", "contest.ratingChanges"]
+    assert RatingWarehouse.load(str(tmp_path / "missing")).contests() == set()
@@ -0,0 +1,195 @@
+"""
+Binary snapshots of parsed API results, which reload much faster than re-parsing the JSON response.
+
+A snapshot is a pickle of the result objects, after a header that identifies what it contains:
+
+- the snapshot format version,
+- a hash of the structure of the result type (see :func:`schema_hash`), so that snapshots are invalidated when `cfutils.api.objects` changes,
+- (optionally) the API request, and the modification time and size of the JSON file the result was loaded from.
+
+A snapshot whose header does not match is stale, and is ignored.
+Snapshots are pickles: only load snapshots that you wrote yourself.
+"""
+import dataclasses
+import functools
+import gc
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import typing
+from enum import Enum
+from typing import Any, Optional
+
+SNAPSHOT_VERSION = 1
+"""Version of the snapshot format, bumped on incompatible changes."""
+
+_MAGIC = b"cfutils-snapshot\n"
+
+
+def _describe(tp: Any, seen: set[type]) -> str:
+    """Structure of the type `tp`: its fields (recursively), or its members for enums."""
+    origin = typing.get_origin(tp)
+    if origin is not None:
+        args = ", ".join(_describe(arg, seen) for arg in typing.get_args(tp))
+        return f"{getattr(origin, '__qualname__', origin)}[{args}]"
+    if not isinstance(tp, type):
+        return repr(tp)
+
+    name = f"{tp.__module__}.{tp.__qualname__}"
+    if tp in seen:
+        return name
+    seen.add(tp)
+    if issubclass(tp, Enum):
+        return f"{name}{[member.value for member in tp]}"
+    if dataclasses.is_dataclass(tp):
+        hints = typing.get_type_hints(tp)
+        fields = ", ".join(
+            f"{f.name}: {_describe(hints[f.name], seen)}"
+            for f in dataclasses.fields(tp)
+        )
+        return f"{name}({fields})"
+    version = getattr(tp, "_snapshot_version", None)
+    if version is not None:
+        return f"{name}@{version}"
+    return name
+
+
+@functools.cache
+def schema_hash(tp: Any) -> str:
+    """Hash of the structure of the type `tp`: the fields and field types of all dataclasses it contains, and the members of its enums.
+    Other classes are described by their name, and their `_snapshot_version` attribute if they have one (to bump when the state they save changes).
+
+    >>> from cfutils.api.objects import Member
+    >>> schema_hash(Member) == schema_hash(list[Member])
+    False
+    """
+    return hashlib.sha256(_describe(tp, set()).encode("utf-8")).hexdigest()[:16]
+
+
+def _source_stamp(source: Optional[str]) -> Optional[list[int]]:
+    if source is None:
+        return None
+    try:
+        stat = os.stat(source)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _header(tp: Any, request: Optional[str], source: Optional[str]) -> dict[str, Any]:
+    return {
+        "version": SNAPSHOT_VERSION,
+        "schema": schema_hash(tp),
+        "request": request,
+        "source": _source_stamp(source),
+    }
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles dataclasses as a call to their constructor, and enum members by reference.
+
+    The default pickling of slotted objects stores their fields in a dict per object, and enum members are looked up by value when loading,
+    both of which are much slower to load.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fields: dict[type, Optional[tuple[str, ...]]] = {}
+
+    def _field_names(self, cls: type) -> Optional[tuple[str, ...]]:
+        if cls not in self._fields:
+            fields = dataclasses.fields(cls) if dataclasses.is_dataclass(cls) else ()
+            self._fields[cls] = (
+                tuple(f.name for f in fields)
+                if fields and all(f.init for f in fields)
+                else None
+            )
+        return self._fields[cls]
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Enum):
+            return f"{type(obj).__qualname__}.{obj.name}"
+        names = self._field_names(type(obj))
+        if names is None:
+            return NotImplemented
+        return type(obj), tuple([getattr(obj, name) for name in names])
+
+
+def save_snapshot(
+    path: str,
+    tp: Any,
+    result: Any,
+    *,
+    request: Optional[str] = None,
+    source: Optional[str] = None,
+):
+    """Write a snapshot of `result`. The file is replaced atomically.
+
+    Args:
+        path: snapshot file.
+        tp: type of `result`.
+        result: parsed API result.
+        request (optional): the API request (see :meth:`APIMethod.canonicalRequest`) that returned `result`.
+        source (optional): the JSON file `result` was loaded from. The snapshot is stale once this file changes.
+    """
+    header = json.dumps(_header(tp, request, source)).encode("utf-8")
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as outf:
+            outf.write(_MAGIC + header + b"\n")
+            _Pickler(outf, protocol=pickle.HIGHEST_PROTOCOL).dump(result)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_snapshot(
+    path: str,
+    tp: Any,
+    *,
+    request: Optional[str] = None,
+    source: Optional[str] = None,
+) -> Any:
+    """Load a snapshot written by :func:`save_snapshot` with the same arguments.
+
+    >>> import os, tempfile
+    >>> from cfutils.api.objects import Member
+    >>> path = os.path.join(tempfile.mkdtemp(), "members.snapshot")
+    >>> save_snapshot(path, list[Member], [Member(handle="tourist")])
+    >>> load_snapshot(path, list[Member])
+    [Member(handle='tourist', name=None)]
+    >>> load_snapshot(path, list[Member], request="user.info?handles=tourist") is None
+    True
+
+    Returns:
+        The snapshot result, or `None` if the snapshot does not exist or is stale.
+    """
+    try:
+        with open(path, "rb") as inf:
+            if inf.readline() != _MAGIC:
+                logging.warning("not a snapshot, ignoring it: %s", path)
+                return None
+            if json.loads(inf.readline()) != _header(tp, request, source):
+                logging.info("stale snapshot, ignoring it: %s", path)
+                return None
+
+            # the loaded objects have no reference cycles, so collecting while loading them is wasted work
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(inf)
+            finally:
+                if enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except (EOFError, pickle.UnpicklingError, ValueError) as e:
+        logging.warning("corrupt snapshot, ignoring it: %s (%s)", path, e)
+        return None
+
+
+__all__ = ["SNAPSHOT_VERSION", "load_snapshot", "save_snapshot", "schema_hash"]
@@ -0,0 +1,114 @@
+import dataclasses
+import os
+import shutil
+
+import pytest
+
+from cfutils.api.decoders import Interner
+from cfutils.api.methods import Contest_Standings, Contest_Status
+from cfutils.api.objects import Member
+from cfutils.api.snapshot import load_snapshot, save_snapshot, schema_hash
+
+STATUS_FILE = "data/examples/resolverfeed/status_104491.json"
+STANDINGS_FILE = "data/examples/resolverfeed/standings_104491.json"
+
+
+def test_snapshot_roundtrip(tmp_path):
+    path = str(tmp_path / "status.snapshot")
+    method = Contest_Status(contestId=104491, From=1, count=10000)
+    submissions = method.get(load_from_file=STATUS_FILE, interner=Interner())
+
+    save_snapshot(path, method.resultType(), submissions)
+    loaded = load_snapshot(path, method.resultType())
+    assert loaded == submissions
+
+    # objects shared by the interner are still shared
+    parties = {id(sub.author) for sub in submissions}
+    assert len({id(sub.author) for sub in loaded}) == len(parties) < len(loaded)
+    problems = {id(sub.problem) for sub in submissions}
+    assert len({id(sub.problem) for sub in loaded}) == len(problems) < len(loaded)
+
+
+def test_snapshot_stale(tmp_path):
+    source = str(tmp_path / "members.json")
+    with open(source, "w") as outf:
+        outf.write("[]")
+    path = str(tmp_path / "members.snapshot")
+    members = [Member(handle="tourist")]
+
+    save_snapshot(path, list[Member], members, request="req", source=source)
+    assert load_snapshot(path, list[Member], request="req", source=source) == members
+    assert load_snapshot(path, list[Member], request="other", source=source) is None
+    assert load_snapshot(path, Member, request="req", source=source) is None
+
+    os.utime(source, ns=(0, 0))
+    assert load_snapshot(path, list[Member], request="req", source=source) is None
+    assert load_snapshot(str(tmp_path / "missing"), list[Member]) is None
+
+    with open(path, "r+b") as outf:
+        outf.truncate(os.path.getsize(path) - 4)
+    assert load_snapshot(path, list[Member], request="req") is None
+
+
+def test_schema_hash():
+    first = dataclasses.make_dataclass("Member", [("handle", str)])
+    second = dataclasses.make_dataclass("Member", [("handle", int)])
+    assert schema_hash(first) != schema_hash(second)
+    assert schema_hash(list[Member]) == schema_hash(list[Member])
+
+    # classes that are not dataclasses are versioned by hand
+    first = type("Warehouse", (), {"_snapshot_version": 1})
+    second = type("Warehouse", (), {"_snapshot_version": 2})
+    assert schema_hash(first) != schema_hash(second)
+
+
+def test_get_snapshot(tmp_path, monkeypatch):
+    source = str(tmp_path / "status.json")
+    shutil.copy(STATUS_FILE, source)
+    path = str(tmp_path / "status.snapshot")
+    method = Contest_Status(contestId=104491, From=1, count=10000)
+
+    submissions = method.get(load_from_file=source, snapshot=path)
+    assert os.path.isfile(path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parsed the response instead of loading the snapshot")
+
+    with monkeypatch.context() as m:
+        m.setattr(Contest_Status, "_complete", fail)
+        assert method.get(load_from_file=source, snapshot=path) == submissions
+        with pytest.raises(AssertionError):
+            Contest_Status(contestId=104491, From=1, count=10).get(
+                load_from_file=source, snapshot=path
+            )
+
+    with pytest.raises(ValueError):
+        method.get(load_from_file=source, snapshot=path, fields=["id"])
+    # a snapshot of an API call would never be stale
+    with pytest.raises(ValueError):
+        method.get(snapshot=path)
+
+
+def test_get_snapshot_interner(tmp_path):
+    status = Contest_Status(contestId=104491, From=1, count=10000)
+    standings = Contest_Standings(contestId=104491, From=1, count=10000)
+    for method, source in [(status, STATUS_FILE), (standings, STANDINGS_FILE)]:
+        method.get(load_from_file=source, snapshot=str(tmp_path / method.name()))
+
+    # objects loaded from snapshots are shared like decoded ones
+    interner = Interner()
+    submissions = status.get(
+        load_from_file=STATUS_FILE,
+        snapshot=str(tmp_path / status.name()),
+        interner=interner,
+    )
+    result = standings.get(
+        load_from_file=STANDINGS_FILE,
+        snapshot=str(tmp_path / standings.name()),
+        interner=interner,
+    )
+    parties = {id(row.party): row.party for row in result.rows}
+    shared = [sub for sub in submissions if id(sub.author) in parties]
+    assert len({id(sub.author) for sub in shared}) == len(parties)
+    assert all(sub.author is parties[id(sub.author)] for sub in shared)
+    assert len({id(sub.problem) for sub in submissions}) == len(result.problems)
@@ -0,0 +1,404 @@
+"""
+Local SQLite store of API results, to run repeated analyses as SQL queries instead of calling the API (and parsing JSON) again.
+"""
+import json
+import sqlite3
+import time
+from typing import Any, Optional, Sequence, TypeVar
+
+from cfutils.api.decoders import decoder_for, encoder_for
+from cfutils.api.objects import (
+    Contest,
+    Problem,
+    RanklistRow,
+    RatingChange,
+    Submission,
+    User,
+    Verdict,
+    party_key,
+)
+from cfutils.api.methods import Contest_Status, User_Status
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contests (
+    id INTEGER PRIMARY KEY,
+    startTimeSeconds INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contests_time ON contests (startTimeSeconds);
+
+CREATE TABLE IF NOT EXISTS problems (
+    problem TEXT PRIMARY KEY,
+    contestId INTEGER,
+    rating INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS problems_contest ON problems (contestId);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    contestId INTEGER,
+    problem TEXT NOT NULL,
+    creationTimeSeconds INTEGER NOT NULL,
+    verdict TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_contest ON submissions (contestId, creationTimeSeconds);
+CREATE INDEX IF NOT EXISTS submissions_problem ON submissions (problem);
+CREATE INDEX IF NOT EXISTS submissions_time ON submissions (creationTimeSeconds);
+
+CREATE TABLE IF NOT EXISTS submission_handles (
+    handle TEXT NOT NULL,
+    submission INTEGER NOT NULL,
+    PRIMARY KEY (handle, submission)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ranklist_rows (
+    contestId INTEGER NOT NULL,
+    party TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (contestId, party)
+);
+
+CREATE TABLE IF NOT EXISTS ranklist_handles (
+    handle TEXT NOT NULL,
+    contestId INTEGER NOT NULL,
+    party TEXT NOT NULL,
+    PRIMARY KEY (handle, contestId, party)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS users (
+    handle TEXT PRIMARY KEY,
+    rating INTEGER,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rating_changes (
+    handle TEXT NOT NULL,
+    contestId INTEGER NOT NULL,
+    ratingUpdateTimeSeconds INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (handle, contestId)
+);
+CREATE INDEX IF NOT EXISTS rating_changes_contest ON rating_changes (contestId);
+CREATE INDEX IF NOT EXISTS rating_changes_time ON rating_changes (ratingUpdateTimeSeconds);
+
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+_TABLES: dict[type, str] = {
+    Contest: "contests",
+    Problem: "problems",
+    Submission: "submissions",
+    RanklistRow: "ranklist_rows",
+    User: "users",
+    RatingChange: "rating_changes",
+}
+"""Table of each stored type, all of which have the JSON of the object in the column `data`"""
+
+_UPSERTS: dict[type, str] = {
+    Contest: """INSERT INTO contests VALUES (?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET startTimeSeconds = excluded.startTimeSeconds, data = excluded.data""",
+    Problem: """INSERT INTO problems VALUES (?, ?, ?, ?)
+        ON CONFLICT (problem) DO UPDATE SET rating = excluded.rating, data = excluded.data""",
+    Submission: """INSERT INTO submissions VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET verdict = excluded.verdict, data = excluded.data""",
+    RanklistRow: """INSERT INTO ranklist_rows VALUES (?, ?, ?, ?)
+        ON CONFLICT (contestId, party) DO UPDATE SET rank = excluded.rank, data = excluded.data""",
+    User: """INSERT INTO users VALUES (?, ?, ?)
+        ON CONFLICT (handle) DO UPDATE SET rating = excluded.rating, data = excluded.data""",
+    RatingChange: """INSERT INTO rating_changes VALUES (?, ?, ?, ?)
+        ON CONFLICT (handle, contestId) DO UPDATE SET data = excluded.data""",
+}
+
+
+def problem_key(problem: Problem) -> str:
+    """Identifier of a problem in the store, like `566A`, or `acmsguru/100A` for problemset problems without a contest."""
+    if problem.contestId is not None:
+        return f"{problem.contestId}{problem.index}"
+    return f"{problem.problemsetName}/{problem.index}"
+
+
+def _party_key(row: RanklistRow) -> str:
+    """:func:`party_key` of the party of a row, as a string"""
+    return json.dumps(party_key(row.party))
+
+
+def _cursor_name(method: Contest_Status | User_Status) -> str:
+    """The request, without the page (`from` and `count`)"""
+    name, _, params = method.canonicalRequest().partition("?")
+    kept = [p for p in params.split("&") if not p.startswith(("from=", "count="))]
+    return f"{name}?{'&'.join(kept)}"
+
+
+class Store:
+    """SQLite database of API results: contests, problems, submissions, standings rows, users and rating changes.
+
+    Objects are upserted (a newer version of an object replaces the stored one), and stored as their JSON,
+    next to indexed columns (contest, handle, problem, time) to query them.
+    Query using SQL (see :attr:`connection`), and get the objects back as dataclasses using :meth:`select`.
+
+    >>> from cfutils.api.objects import User
+    >>> store = Store(":memory:")
+    >>> store.add([User(handle="tourist", rating=3800), User(handle="Petr")])
+    2
+    >>> store.select(User, "rating > ?", [3000])  # doctest: +ELLIPSIS
+    [User(handle='tourist', ...rating=3800...)]
+
+    Args:
+        path: database file, created if it does not exist (`":memory:"` for a temporary in-memory database).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        """The SQLite connection, to run queries directly."""
+        self.connection.executescript(_SCHEMA)
+
+    def _rows(self, tp: type, objects: list[Any], contestId: Optional[int]) -> list:
+        encode = encoder_for(tp)
+        if tp is Contest:
+            return [(c.id, c.startTimeSeconds, json.dumps(encode(c))) for c in objects]
+        if tp is Problem:
+            return [
+                (problem_key(p), p.contestId, p.rating, json.dumps(encode(p)))
+                for p in objects
+            ]
+        if tp is Submission:
+            return [
+                (
+                    s.id,
+                    s.contestId,
+                    problem_key(s.problem),
+                    s.creationTimeSeconds,
+                    s.verdict and s.verdict.value,
+                    json.dumps(encode(s)),
+                )
+                for s in objects
+            ]
+        if tp is RanklistRow:
+            return [
+                (
+                    row.party.contestId or contestId,
+                    _party_key(row),
+                    row.rank,
+                    json.dumps(encode(row)),
+                )
+                for row in objects
+            ]
+        if tp is User:
+            return [(u.handle, u.rating, json.dumps(encode(u))) for u in objects]
+        assert tp is RatingChange
+        return [
+            (r.handle, r.contestId, r.ratingUpdateTimeSeconds, json.dumps(encode(r)))
+            for r in objects
+        ]
+
+    def _collect(
+        self, result: Any, groups: dict[type, list[Any]], contestId: Optional[int]
+    ) -> Optional[int]:
+        if isinstance(result, list):
+            for item in result:
+                self._collect(item, groups, contestId)
+        elif type(result) in _TABLES:
+            groups[type(result)].append(result)
+        elif hasattr(result, "__dataclass_fields__"):
+            # results with several parts, like `contest.standings`.
+            contest = getattr(result, "contest", None)
+            if isinstance(contest, Contest):
+                contestId = contest.id
+            for name in result.__dataclass_fields__:
+                self._collect(getattr(result, name), groups, contestId)
+        return contestId
+
+    def add(self, result: Any) -> int:
+        """Upsert the objects of an API result in a single transaction: a supported object, a list of them,
+        or a result with several parts (like the result of `contest.standings`, with its contest, problems and rows).
+        Other objects are ignored.
+
+        Returns:
+            Number of upserted objects.
+        """
+        with self.connection:
+            return self._add(result)
+
+    def _add(self, result: Any) -> int:
+        """Same as :meth:`add`, in the current transaction"""
+        groups: dict[type, list[Any]] = {tp: [] for tp in _TABLES}
+        contestId = self._collect(result, groups, None)
+        for tp, objects in groups.items():
+            if objects:
+                self.connection.executemany(
+                    _UPSERTS[tp], self._rows(tp, objects, contestId)
+                )
+
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO submission_handles VALUES (?, ?)",
+            [(m.handle, s.id) for s in groups[Submission] for m in s.author.members],
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO ranklist_handles VALUES (?, ?, ?)",
+            [
+                (m.handle, row.party.contestId or contestId, _party_key(row))
+                for row in groups[RanklistRow]
+                for m in row.party.members
+            ],
+        )
+        return sum(map(len, groups.values()))
+
+    def select(
+        self,
+        tp: type[T],
+        where: str = "",
+        params: Sequence[Any] = (),
+        *,
+        order_by: str = "rowid",
+    ) -> list[T]:
+        """Stored objects of type `tp` (one of the stored types), decoded back into dataclasses.
+
+        Args:
+            tp: type of the objects, which selects the table.
+            where (optional): SQL condition on the columns of the table.
+            params: parameters of the condition.
+            order_by: SQL ordering of the objects.
+        """
+        sql = f"SELECT data FROM {_TABLES[tp]}"
+        if where:
+            sql += f" WHERE {where}"
+        decode = decoder_for(tp, trusted=True)
+        rows = self.connection.execute(f"{sql} ORDER BY {order_by}", params)
+        return [decode(json.loads(data)) for (data,) in rows]
+
+    def submissions(
+        self,
+        *,
+        contestId: Optional[int] = None,
+        handle: Optional[str] = None,
+        problem: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        verdict: Optional[Verdict] = None,
+    ) -> list[Submission]:
+        """Stored submissions matching all the given filters, oldest first.
+
+        Args:
+            contestId (optional): contest id.
+            handle (optional): handle of a member of the party.
+            problem (optional): problem, see :func:`problem_key`.
+            since (optional): earliest `creationTimeSeconds`.
+            until (optional): latest `creationTimeSeconds`.
+            verdict (optional): verdict.
+        """
+        conditions = []
+        params: list[Any] = []
+        for condition, value in [
+            ("contestId = ?", contestId),
+            (
+                "id IN (SELECT submission FROM submission_handles WHERE handle = ?)",
+                handle,
+            ),
+            ("problem = ?", problem),
+            ("creationTimeSeconds >= ?", since),
+            ("creationTimeSeconds <= ?", until),
+            ("verdict = ?", verdict and verdict.value),
+        ]:
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        return self.select(
+            Submission,
+            " AND ".join(conditions),
+            params,
+            order_by="creationTimeSeconds, id",
+        )
+
+    def ranklist(self, contestId: int) -> list[RanklistRow]:
+        """Stored standings rows of a contest, by rank."""
+        return self.select(
+            RanklistRow, "contestId = ?", [contestId], order_by="rank, rowid"
+        )
+
+    def rating_history(self, handle: str) -> list[RatingChange]:
+        """Stored rating changes of a user, oldest first."""
+        return self.select(
+            RatingChange, "handle = ?", [handle], order_by="ratingUpdateTimeSeconds"
+        )
+
+    def cursor(self, name: str) -> Any:
+        """Value of the sync cursor `name`, or `None` if it is not set."""
+        row = self.connection.execute(
+            "SELECT value FROM cursors WHERE name = ?", [name]
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set_cursor(self, name: str, value: Any):
+        """Set the sync cursor `name` to `value` (JSON)."""
+        with self.connection:
+            self._set_cursor(name, value)
+
+    def _set_cursor(self, name: str, value: Any):
+        """Same as :meth:`set_cursor`, in the current transaction"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)",
+            [name, json.dumps(value), time.time()],
+        )
+
+    def sync_submissions(
+        self, method: Contest_Status | User_Status, *, page_size: int = 1000, **kwargs
+    ) -> int:
+        """Fetch the submissions of `method` that are new since the last sync (and the ones that were still being judged), and upsert them.
+
+        The cursor of the method (named after its request, without the page) is the submission id up to which every stored submission has a final verdict.
+        So, like :class:`ContestStatusSync`, a sync only fetches pages until it reaches that id.
+        The submissions and the cursor are written in a single transaction, so that an interrupted sync leaves both unchanged.
+
+        Args:
+            method: `contest.status` or `user.status` call.
+            page_size: number of submissions requested per call.
+            **kwargs: passed to :meth:`APIMethod.get` for every page.
+
+        Returns:
+            Number of upserted submissions.
+        """
+        name = _cursor_name(method)
+        stop_id = self.cursor(name)
+
+        fetched: list[Submission] = []
+        for page in method.iter_pages(page_size=page_size, **kwargs):
+            fetched += page
+            if stop_id is not None and page and page[-1].id <= stop_id:
+                break
+        fetched = [sub for sub in fetched if stop_id is None or sub.id > stop_id]
+        if not fetched:
+            return 0
+
+        pending = [
+            sub.id
+            for sub in fetched
+            if sub.verdict is None or sub.verdict == Verdict.TESTING
+        ]
+        with self.connection:
+            count = self._add(fetched)
+            self._set_cursor(
+                name, min(pending) - 1 if pending else max(s.id for s in fetched)
+            )
+        return count
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "Store":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+__all__ = ["Store", "problem_key"]
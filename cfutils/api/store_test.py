@@ -0,0 +1,121 @@
+import dataclasses
+import json
+
+import pytest
+
+from cfutils.api.fake_transport_test import FakeTransport
+from cfutils.api.methods import (
+    Contest_List,
+    Contest_RatingChanges,
+    Contest_Standings,
+    Contest_Status,
+    User_Info,
+)
+from cfutils.api.objects import RatingChange, Verdict
+from cfutils.api.ratelimit import RateLimiter
+from cfutils.api.store import Store, problem_key
+
+STATUS_FILE = "data/examples/resolverfeed/status_104491.json"
+STANDINGS_FILE = "data/examples/resolverfeed/standings_104491.json"
+
+
+def test_store_add_and_select():
+    store = Store(":memory:")
+    submissions = Contest_Status(contestId=104491, From=1, count=1).get(
+        load_from_file=STATUS_FILE
+    )
+    standings = Contest_Standings(contestId=104491, From=1, count=1).get(
+        load_from_file=STANDINGS_FILE
+    )
+    assert store.add(submissions) == len(submissions)
+    assert store.add(standings) == 1 + len(standings.problems) + len(standings.rows)
+
+    # upserts replace the stored objects
+    judged = submissions[0]
+    store.add([dataclasses.replace(judged, verdict=None)])
+    assert store.submissions(contestId=104491)[-1] != judged
+    store.add(submissions)
+    assert sorted(store.submissions(), key=lambda s: s.id) == sorted(
+        submissions, key=lambda s: s.id
+    )
+
+    handle = submissions[0].author.members[0].handle
+    assert store.submissions(handle=handle, problem="104491A", verdict=Verdict.OK) == [
+        sub
+        for sub in sorted(submissions, key=lambda s: (s.creationTimeSeconds, s.id))
+        if handle in [m.handle for m in sub.author.members]
+        and problem_key(sub.problem) == "104491A"
+        and sub.verdict == Verdict.OK
+    ]
+    assert store.ranklist(104491) == sorted(standings.rows, key=lambda r: r.rank)
+    assert store.select(type(standings.contest)) == [standings.contest]
+    (count,) = store.connection.execute(
+        "SELECT COUNT(*) FROM ranklist_handles WHERE handle = ?", [handle]
+    ).fetchone()
+    assert count >= 1
+
+
+def test_store_example_results():
+    store = Store(":memory:")
+    for method in [
+        Contest_List(),
+        Contest_RatingChanges(contestId=566),
+        User_Info(handles=["tourist"]),
+    ]:
+        result = method.get(load_from_file=f"data/examples/api/{method.name()}.json")
+        assert store.add(result) == len(result)
+        stored = store.select(method.resultType().__args__[0])  # type: ignore
+        assert sorted(map(repr, stored)) == sorted(map(repr, result))
+
+    change = store.select(RatingChange, order_by="handle")[0]
+    assert store.rating_history(change.handle) == [change]
+
+
+def test_store_sync_submissions():
+    with open(STATUS_FILE) as inf:
+        submissions = json.load(inf)["result"]
+    live = submissions[30:]
+    live[:5] = [{**sub, "verdict": "TESTING"} for sub in live[:5]]
+
+    transport = FakeTransport({"contest.status": live})
+    kwargs = {"limiter": RateLimiter(interval=0), "transport": transport}
+    method = Contest_Status(contestId=104491, From=1, count=1)
+    store = Store(":memory:")
+
+    assert store.sync_submissions(method, page_size=20, **kwargs) == len(live)
+    assert store.cursor("contest.status?asManager=False&contestId=104491") == (
+        live[4]["id"] - 1
+    )
+
+    transport.results["contest.status"] = submissions
+    transport.calls = []
+    assert store.sync_submissions(method, page_size=20, **kwargs) == 35
+    assert len(transport.calls) == 2
+    assert len(store.submissions(verdict=Verdict.TESTING)) == 0
+    assert len(store.submissions()) == len(submissions)
+
+    transport.calls = []
+    assert store.sync_submissions(method, page_size=20, **kwargs) == 0
+    assert len(transport.calls) == 1
+
+
+def test_store_sync_submissions_is_atomic(monkeypatch):
+    with open(STATUS_FILE) as inf:
+        submissions = json.load(inf)["result"]
+    transport = FakeTransport({"contest.status": submissions})
+    kwargs = {"limiter": RateLimiter(interval=0), "transport": transport}
+    method = Contest_Status(contestId=104491, From=1, count=1)
+    store = Store(":memory:")
+
+    def crash(*args):
+        raise KeyboardInterrupt
+
+    # interrupted before the cursor is written: the submissions are not stored either
+    with monkeypatch.context() as m:
+        m.setattr(Store, "_set_cursor", crash)
+        with pytest.raises(KeyboardInterrupt):
+            store.sync_submissions(method, page_size=100, **kwargs)
+    assert store.submissions() == []
+    assert store.cursor("contest.status?asManager=False&contestId=104491") is None
+
+    assert store.sync_submissions(method, page_size=100, **kwargs) == len(submissions)
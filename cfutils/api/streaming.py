@@ -0,0 +1,110 @@
+"""
+Incremental decoding of API responses, to process large result lists without holding the whole response in memory.
+"""
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+
+class ResultStream:
+    """Iterate over the elements of the `result` list of an API response, decoding them one at a time while reading `stream`.
+
+    The other top-level fields of the response (`status`, `comment`) are collected in :attr:`envelope`,
+    which is complete once the iteration is over.
+
+    >>> import io
+    >>> stream = ResultStream(io.BytesIO(b'{"status": "OK", "result": [{"handle": "tourist"}, {"handle": "Petr"}]}'))
+    >>> list(stream)
+    [{'handle': 'tourist'}, {'handle': 'Petr'}]
+    >>> stream.envelope
+    {'status': 'OK'}
+
+    Args:
+        stream: binary stream of the response body (a file or an HTTP response).
+        chunk_size: number of bytes read at a time.
+    """
+
+    def __init__(self, stream: BinaryIO, *, chunk_size: int = 1 << 16):
+        self.envelope: dict[str, Any] = {}
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read more data into the buffer. Returns False at the end of the stream."""
+        if self._eof:
+            return False
+        # read at least as much as is pending, so that a large value needs O(log size) retries.
+        size = max(self._chunk_size, len(self._buf) - self._pos)
+        data = self._stream.read(size)
+        self._eof = not data
+        self._buf = self._buf[self._pos :] + self._utf8.decode(data, final=self._eof)
+        self._pos = 0
+        return not self._eof
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, without consuming it ("" at the end of the stream)."""
+        while True:
+            match = _NON_WHITESPACE.search(self._buf, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buf[self._pos]
+            self._pos = len(self._buf)
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        c = self._peek()
+        if c == "" or c not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self._buf, self._pos
+            )
+        self._pos += 1
+        return c
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # a number that ends with the buffer could continue in the next chunk.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def __iter__(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key == "result" and self._peek() == "[":
+                self._expect("[")
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                self.envelope[key] = self._value()
+
+            if self._expect(",}") == "}":
+                return
+
+
+__all__ = ["ResultStream"]
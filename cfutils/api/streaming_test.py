@@ -0,0 +1,35 @@
+import io
+import json
+
+import pytest
+
+from cfutils.api.methods import CFAPIError, User_Friends
+from cfutils.api.methods_test import methodExamples
+from cfutils.api.streaming import ResultStream
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_result_stream_chunks(chunk_size):
+    with open("data/examples/api/contest.status.json", "rb") as inf:
+        data = inf.read()
+    expected = json.loads(data)
+
+    stream = ResultStream(io.BytesIO(data), chunk_size=chunk_size)
+    assert list(stream) == expected["result"]
+    assert stream.envelope == {"status": "OK"}
+
+
+@pytest.mark.parametrize("name", ["user.ratedList", "contest.status", "user.friends"])
+def test_stream_matches_get(name):
+    method = methodExamples[name].method
+    data_file = f"data/examples/api/{name}.json"
+    assert list(method.stream(load_from_file=data_file)) == method.get(
+        load_from_file=data_file
+    )
+
+
+def test_stream_failed_call(tmp_path):
+    data_file = tmp_path / "failed.json"
+    data_file.write_text('{"status": "FAILED", "comment": "handles: User not found"}')
+    with pytest.raises(CFAPIError, match="User not found"):
+        list(User_Friends().stream(load_from_file=str(data_file)))
@@ -0,0 +1,102 @@
+"""
+Incremental synchronization of contest submissions, for polling running contests.
+"""
+import logging
+from typing import Optional
+
+from cfutils.api.methods import Contest_Status
+from cfutils.api.objects import Submission, Verdict
+
+
+class ContestStatusSync:
+    """Local copy of the submissions of a contest, kept up to date by polling `contest.status`.
+
+    Each :meth:`poll` only fetches the newest pages, until it reaches submissions that are already known and judged.
+    Submissions that are still being tested (or have no verdict yet) are fetched again until they get a final verdict.
+    So a poll costs requests proportional to the activity since the last poll, not to the size of the contest.
+
+    Caveat:
+        Changes to submissions that already had a final verdict (e.g. rejudges) are not detected.
+
+    Args:
+        contestId: contest to follow.
+        asManager: see :class:`Contest_Status`.
+        handle (optional): only follow submissions of this user.
+        page_size: number of submissions requested per call.
+    """
+
+    def __init__(
+        self,
+        contestId: int,
+        *,
+        asManager: bool = False,
+        handle: Optional[str] = None,
+        page_size: int = 500,
+    ):
+        self.method = Contest_Status(
+            contestId=contestId,
+            From=1,
+            count=page_size,
+            asManager=asManager,
+            handle=handle,
+        )
+        self.page_size = page_size
+
+        self.submissions: dict[int, Submission] = {}
+        """All known submissions, by id"""
+
+        self.max_id: Optional[int] = None
+        """Highest submission id seen so far"""
+
+        self._pending: set[int] = set()
+
+    @property
+    def pending(self) -> set[int]:
+        """Ids of known submissions without a final verdict"""
+        return set(self._pending)
+
+    @staticmethod
+    def _is_pending(sub: Submission) -> bool:
+        return sub.verdict is None or sub.verdict == Verdict.TESTING
+
+    def poll(self, **kwargs) -> list[Submission]:
+        """Fetch new submissions, and new verdicts of pending submissions, and merge them into `self.submissions`.
+
+        Args:
+            **kwargs: passed to :meth:`APIMethod.get` for every page.
+
+        Returns:
+            The new or updated submissions, newest first.
+        """
+        # every submission with an id up to `stop_id` is already known, and judged.
+        stop_id = min(self._pending, default=self.max_id)
+
+        changed: list[Submission] = []
+        pages = 0
+        for page in self.method.iter_pages(page_size=self.page_size, **kwargs):
+            pages += 1
+            for sub in page:
+                if self.submissions.get(sub.id) != sub:
+                    self.submissions[sub.id] = sub
+                    changed.append(sub)
+                if self.max_id is None or sub.id > self.max_id:
+                    self.max_id = sub.id
+                if self._is_pending(sub):
+                    self._pending.add(sub.id)
+                else:
+                    self._pending.discard(sub.id)
+
+            if stop_id is not None and page and page[-1].id <= stop_id:
+                break
+
+        logging.info(
+            "contest %d: %d new or updated submissions (%d pages), %d pending",
+            self.method.contestId,
+            len(changed),
+            pages,
+            len(self._pending),
+        )
+        return changed
+
+
+__all__ = ["ContestStatusSync"]
@@ -0,0 +1,38 @@
+import json
+
+from cfutils.api.fake_transport_test import FakeTransport
+from cfutils.api.ratelimit import RateLimiter
+from cfutils.api.sync import ContestStatusSync
+
+
+def test_contest_status_sync():
+    with open("data/examples/resolverfeed/status_104491.json") as inf:
+        submissions = json.load(inf)["result"]
+
+    # the contest so far: all but the newest 30 submissions, the newest 5 of which are still being tested.
+    live = submissions[30:]
+    live[:5] = [{**sub, "verdict": "TESTING"} for sub in live[:5]]
+
+    transport = FakeTransport({"contest.status": live})
+    kwargs = {"limiter": RateLimiter(interval=0), "transport": transport}
+    sync = ContestStatusSync(104491, page_size=20)
+
+    assert len(sync.poll(**kwargs)) == len(live)
+    assert len(sync.pending) == 5
+    assert len(transport.calls) == len(live) // 20 + 1
+
+    # 30 new submissions, and the pending ones are judged.
+    transport.results["contest.status"] = submissions
+    transport.calls = []
+    changed = sync.poll(**kwargs)
+
+    assert [sub.id for sub in changed] == [sub["id"] for sub in submissions[:35]]
+    assert len(transport.calls) == 2
+    assert sync.pending == set()
+    assert sync.max_id == submissions[0]["id"]
+    assert len(sync.submissions) == len(submissions)
+
+    # nothing new: a single call.
+    transport.calls = []
+    assert sync.poll(**kwargs) == []
+    assert len(transport.calls) == 1
@@ -0,0 +1,376 @@
+"""
+Columnar storage of submissions, for analytics on large `contest.status`/`user.status` results.
+"""
+import math
+import operator
+from array import array
+from collections import Counter
+from itertools import compress, islice
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional, Sequence
+
+from cfutils.api.decoders import Interner
+from cfutils.api.objects import Party, Problem, Submission, Testset, Verdict
+
+
+def _verdict(value: Optional[str]) -> Optional[Verdict]:
+    return None if value is None else Verdict(value)
+
+
+def _chunks(items: Iterable[Any], size: int = 1 << 12) -> Iterator[list[Any]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _gatherer(rows: Iterable[int]) -> Callable[[Sequence[Any]], Iterable[Any]]:
+    """Function that selects the `rows` of a column (in that order), without a Python loop:
+    a slice for a contiguous range of rows, an `operator.itemgetter` otherwise.
+    """
+    if isinstance(rows, range) and rows.step == 1:
+        return operator.itemgetter(slice(rows.start, rows.stop))
+    rows = list(rows)
+    if len(rows) == 1:
+        # `itemgetter` of a single item returns the item, not a tuple.
+        return lambda col: [col[rows[0]]]
+    return operator.itemgetter(*rows) if rows else lambda col: []
+
+
+class DictColumn:
+    """Dictionary-encoded column: row `i` has the value `values[codes[i]]`.
+
+    Args:
+        values: distinct values of the column.
+        codes: index into `values` of each row.
+    """
+
+    def __init__(self, values: Iterable[Any] = (), codes: Iterable[int] = ()):
+        self.values: list[Any] = list(values)
+        self.codes = array("i", codes)
+        self._index: dict[Any, int] = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value: Any) -> int:
+        """Code of `value`, adding it to the dictionary if needed"""
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: Any):
+        self.codes.append(self.code(value))
+
+    def extend(self, keys: list[Any], convert: Optional[Callable[[Any], Any]] = None):
+        """Add rows.
+
+        Args:
+            keys: the values of the rows, or keys that `convert` maps to the values.
+            convert (optional): called once per distinct key.
+        """
+        codes = {
+            key: self.code(key if convert is None else convert(key))
+            for key in dict.fromkeys(keys)
+        }
+        self.codes.extend(map(codes.__getitem__, keys))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __repr__(self) -> str:
+        return f"DictColumn({list(self)!r})"
+
+
+class SubmissionTable:
+    """Submissions stored column by column, instead of as a list of :class:`Submission` objects.
+
+    Columns:
+
+    - numbers, in `array`: `id`, `creationTimeSeconds`, `relativeTimeSeconds`, `passedTestCount`,
+      `timeConsumedMillis`, `memoryConsumedBytes` and `points` (`nan` when missing).
+    - ids of the shared `Party` and `Problem` objects, in `array`: `party` and `problem`.
+      The objects are :attr:`parties`\\ `[id]` and :attr:`problems`\\ `[id]`.
+    - dictionary-encoded values, in :class:`DictColumn`: `index` (of the problem), `verdict`,
+      `programmingLanguage`, `testset` and `contestId`.
+
+    Queries run on the integer codes and arrays, without creating `Submission` objects.
+    The conditions of :meth:`where` and the counts of :meth:`count_by` cost a few C-level operations per row,
+    but :meth:`take` (and so :meth:`where`) copies the selected rows of every column, and :meth:`first_by` sorts the rows:
+    these are only somewhat faster than a loop over `Submission` objects.
+    The arrays support the buffer protocol, e.g. `numpy.frombuffer(table["id"], dtype=numpy.int64)` does not copy.
+
+    >>> from cfutils.api.methods import Contest_Status
+    >>> table = Contest_Status(contestId=566, From=34500, count=200).table(
+    ...     load_from_file="data/examples/api/contest.status.json"
+    ... )
+    >>> len(table)
+    200
+    >>> table.where(verdict=Verdict.OK).count_by("index").most_common(2)
+    [('F', 82), ('D', 2)]
+
+    Args:
+        interner (optional): used to decode the parties and problems, can be shared with other decoded results.
+    """
+
+    NUMBER_COLUMNS: dict[str, str] = {
+        "id": "q",
+        "creationTimeSeconds": "q",
+        "relativeTimeSeconds": "q",
+        "passedTestCount": "q",
+        "timeConsumedMillis": "q",
+        "memoryConsumedBytes": "q",
+        "points": "d",
+        "party": "i",
+        "problem": "i",
+    }
+    DICT_COLUMNS: tuple[str, ...] = (
+        "index",
+        "verdict",
+        "programmingLanguage",
+        "testset",
+        "contestId",
+    )
+
+    _INT_FIELDS = (
+        "id",
+        "creationTimeSeconds",
+        "relativeTimeSeconds",
+        "passedTestCount",
+        "timeConsumedMillis",
+        "memoryConsumedBytes",
+    )
+    _VALUE_FIELDS = ("verdict", "programmingLanguage", "testset", "contestId")
+
+    def __init__(self, *, interner: Optional[Interner] = None):
+        self.interner = interner if interner is not None else Interner()
+        self.parties: list[Party] = []
+        self.problems: list[Problem] = []
+        self.columns: dict[str, array | DictColumn] = {
+            **{name: array(tc) for name, tc in self.NUMBER_COLUMNS.items()},
+            **{name: DictColumn() for name in self.DICT_COLUMNS},
+        }
+
+        self._party_ids: dict[int, int] = {}
+        self._problem_ids: dict[int, int] = {}
+        self._decode_party = self.interner.decoder_for(Party)
+        self._decode_problem = self.interner.decoder_for(Problem)
+
+    @classmethod
+    def from_json(
+        cls, items: Iterable[dict], *, interner: Optional[Interner] = None
+    ) -> "SubmissionTable":
+        """Build a table from the JSON objects of the `result` of an API response, without creating `Submission` objects."""
+        table = cls(interner=interner)
+        table.extend_json(items)
+        return table
+
+    @classmethod
+    def from_submissions(
+        cls, submissions: Iterable[Submission], *, interner: Optional[Interner] = None
+    ) -> "SubmissionTable":
+        table = cls(interner=interner)
+        table.extend(submissions)
+        return table
+
+    def _extend_ids(self, objects: list, ids: dict[int, int], shared: list) -> array:
+        """Dense ids of the (shared) objects"""
+        for key, obj in {id(obj): obj for obj in objects}.items():
+            if key not in ids:
+                ids[key] = len(shared)
+                shared.append(obj)
+        return array("i", map(ids.__getitem__, map(id, objects)))
+
+    def _extend(
+        self,
+        numbers: dict[str, list],
+        parties: list[Party],
+        problems: list[Problem],
+        values: dict[str, tuple[list, Optional[Callable[[Any], Any]]]],
+    ):
+        cols = self.columns
+        for name, column in numbers.items():
+            cols[name].extend(column)  # type: ignore
+        cols["party"].extend(self._extend_ids(parties, self._party_ids, self.parties))  # type: ignore
+        cols["problem"].extend(self._extend_ids(problems, self._problem_ids, self.problems))  # type: ignore
+        cols["index"].extend([problem.index for problem in problems])  # type: ignore
+        for name, (keys, convert) in values.items():
+            cols[name].extend(keys, convert)  # type: ignore
+
+    def extend(self, submissions: Iterable[Submission]):
+        """Add rows. Parties and problems are identified by identity (decode them with an `Interner` to share them)."""
+        for chunk in _chunks(submissions):
+            self._extend(
+                {
+                    name: [getattr(sub, name) for sub in chunk]
+                    for name in self._INT_FIELDS
+                }
+                | {
+                    "points": [
+                        math.nan if sub.points is None else sub.points for sub in chunk
+                    ]
+                },
+                [sub.author for sub in chunk],
+                [sub.problem for sub in chunk],
+                {
+                    name: ([getattr(sub, name) for sub in chunk], None)
+                    for name in self._VALUE_FIELDS
+                },
+            )
+
+    def append(self, sub: Submission):
+        self.extend([sub])
+
+    def extend_json(self, items: Iterable[dict]):
+        """Add rows from the JSON objects of submissions, without creating `Submission` objects."""
+        for chunk in _chunks(items):
+            self._extend(
+                {name: [d[name] for d in chunk] for name in self._INT_FIELDS}
+                | {
+                    "points": [
+                        math.nan if (points := d.get("points")) is None else points
+                        for d in chunk
+                    ]
+                },
+                list(map(self._decode_party, [d["author"] for d in chunk])),
+                list(map(self._decode_problem, [d["problem"] for d in chunk])),
+                {
+                    "verdict": ([d.get("verdict") for d in chunk], _verdict),
+                    "programmingLanguage": (
+                        [d["programmingLanguage"] for d in chunk],
+                        None,
+                    ),
+                    "testset": ([d["testset"] for d in chunk], Testset),
+                    "contestId": ([d.get("contestId") for d in chunk], None),
+                },
+            )
+
+    def append_json(self, d: dict):
+        self.extend_json([d])
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, name: str) -> array | DictColumn:
+        return self.columns[name]
+
+    def submission(self, row: int) -> Submission:
+        """The submission at `row`, as an object"""
+        cols = self.columns
+        points = cols["points"][row]
+        return Submission(
+            id=cols["id"][row],
+            creationTimeSeconds=cols["creationTimeSeconds"][row],
+            relativeTimeSeconds=cols["relativeTimeSeconds"][row],
+            problem=self.problems[cols["problem"][row]],
+            author=self.parties[cols["party"][row]],
+            programmingLanguage=cols["programmingLanguage"][row],
+            testset=cols["testset"][row],
+            passedTestCount=cols["passedTestCount"][row],
+            timeConsumedMillis=cols["timeConsumedMillis"][row],
+            memoryConsumedBytes=cols["memoryConsumedBytes"][row],
+            verdict=cols["verdict"][row],
+            contestId=cols["contestId"][row],
+            points=None if math.isnan(points) else points,
+        )
+
+    def __iter__(self) -> Iterator[Submission]:
+        return map(self.submission, range(len(self)))
+
+    def take(self, rows: Iterable[int]) -> "SubmissionTable":
+        """New table with the given rows (in that order).
+        The `Party` and `Problem` objects are shared, but not the lists of them, so that either table can be extended.
+
+        Each column is copied with a slice (for a `range` of rows) or an `operator.itemgetter`, but the copy still creates
+        an `int` (or `float`) object per row and column.
+        """
+        gather = _gatherer(rows)
+        table = SubmissionTable(interner=self.interner)
+        table.parties = self.parties.copy()
+        table.problems = self.problems.copy()
+        table._party_ids = self._party_ids.copy()
+        table._problem_ids = self._problem_ids.copy()
+        for name, col in self.columns.items():
+            if isinstance(col, DictColumn):
+                table.columns[name] = DictColumn(col.values, gather(col.codes))
+            else:
+                table.columns[name] = array(col.typecode, gather(col))
+        return table
+
+    def _mask(self, name: str, condition: Any, rows: Sequence[int]) -> Iterable[bool]:
+        """Whether each of the `rows` matches the condition on column `name`"""
+        col = self.columns[name]
+        match: Callable[[Any], bool] = (
+            condition if callable(condition) else lambda value: value == condition
+        )
+        values: Sequence[Any] = col.codes if isinstance(col, DictColumn) else col
+        if len(rows) != len(self):
+            values = [values[row] for row in rows]
+
+        if isinstance(col, DictColumn):
+            # evaluate the condition once per distinct value.
+            codes = {code for code, value in enumerate(col.values) if match(value)}
+            if len(codes) == 1:
+                return map(codes.pop().__eq__, values)
+            return map(codes.__contains__, values)
+        return map(match, values)
+
+    def where(self, **conditions: Any) -> "SubmissionTable":
+        """Rows that match all the conditions.
+
+        Args:
+            **conditions: column name to a value (rows with exactly that value) or a predicate on the values.
+                For example `where(verdict=Verdict.OK, relativeTimeSeconds=lambda t: t < 3600)`.
+        """
+        rows: Sequence[int] = range(len(self))
+        for name, condition in conditions.items():
+            rows = list(compress(rows, self._mask(name, condition, rows)))
+        return self.take(rows)
+
+    def _keys(self, names: tuple[str, ...]) -> Iterator[tuple]:
+        """Per-row group key: the codes of the columns"""
+        cols = [self.columns[name] for name in names]
+        return zip(*[col.codes if isinstance(col, DictColumn) else col for col in cols])
+
+    def _decode_key(self, names: tuple[str, ...], key: tuple) -> Hashable:
+        values = tuple(
+            col.values[k] if isinstance(col, DictColumn) else k
+            for col, k in zip((self.columns[name] for name in names), key)
+        )
+        return values[0] if len(values) == 1 else values
+
+    def count_by(self, *names: str) -> Counter:
+        """Number of rows for each distinct value of the given columns.
+
+        For example, `count_by("index", "verdict")` counts the verdicts of each problem.
+        The keys are the values (a tuple for several columns).
+        """
+        counts = Counter(self._keys(names))
+        return Counter(
+            {self._decode_key(names, key): count for key, count in counts.items()}
+        )
+
+    def first_by(
+        self, *names: str, order: str = "relativeTimeSeconds"
+    ) -> dict[Hashable, int]:
+        """Row with the smallest `order` (the earliest one by default) for each distinct value of the given columns.
+
+        For example, `where(verdict=Verdict.OK).first_by("party", "index")` gives the first accepted submission
+        of each team on each problem. Ties are broken by the position in the table.
+        The rows are sorted by `order` (with a C-level key), so this costs O(n log n) for n rows.
+
+        Returns:
+            Dictionary from the values of the columns (a tuple for several columns) to the row.
+        """
+        keys = list(self._keys(names))
+        rows = sorted(range(len(self)), key=self.columns[order].__getitem__)
+        rows.reverse()
+        # later (i.e. earlier ordered) rows overwrite the previous ones.
+        first = dict(zip(map(keys.__getitem__, rows), rows))
+        return {self._decode_key(names, key): row for key, row in first.items()}
+
+
+__all__ = ["DictColumn", "SubmissionTable"]
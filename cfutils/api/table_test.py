@@ -0,0 +1,102 @@
+import dataclasses
+from collections import Counter
+
+from cfutils.api.decoders import Interner
+from cfutils.api.methods import Contest_Status
+from cfutils.api.objects import Verdict
+from cfutils.api.table import DictColumn, SubmissionTable
+
+STATUS_FILE = "data/examples/resolverfeed/status_104491.json"
+
+
+def load():
+    method = Contest_Status(contestId=104491, From=1, count=25000)
+    return method.get(load_from_file=STATUS_FILE), method.table(
+        load_from_file=STATUS_FILE
+    )
+
+
+def test_dict_column():
+    col = DictColumn()
+    for value in ["A", "B", "A", None, "A"]:
+        col.append(value)
+    assert col.values == ["A", "B", None]
+    assert list(col.codes) == [0, 1, 0, 2, 0]
+    assert list(col) == ["A", "B", "A", None, "A"]
+
+
+def test_table_roundtrip():
+    submissions, table = load()
+    assert len(table) == len(submissions)
+    assert list(table) == submissions
+    assert list(SubmissionTable.from_submissions(submissions)) == submissions
+
+    # parties and problems are shared
+    assert len(table.parties) == len({str(sub.author) for sub in submissions})
+    assert len(table.problems) == len({sub.problem.index for sub in submissions})
+
+
+def test_table_queries():
+    submissions, table = load()
+
+    assert table.count_by("index", "verdict") == Counter(
+        (sub.problem.index, sub.verdict) for sub in submissions
+    )
+
+    accepted = table.where(verdict=Verdict.OK)
+    assert list(accepted) == [sub for sub in submissions if sub.verdict == Verdict.OK]
+    late = table.where(verdict=Verdict.OK, relativeTimeSeconds=lambda t: t > 3600)
+    assert len(late) == sum(
+        sub.verdict == Verdict.OK and sub.relativeTimeSeconds > 3600
+        for sub in submissions
+    )
+
+    # first accepted submission of each team on each problem
+    first: dict[tuple[str, str], int] = {}
+    for sub in sorted(submissions, key=lambda sub: sub.relativeTimeSeconds):
+        if sub.verdict == Verdict.OK:
+            key = (str(sub.author), sub.problem.index)
+            first.setdefault(key, sub.id)
+
+    first_rows = accepted.first_by("party", "index")
+    assert {
+        (str(accepted.parties[party]), index): accepted["id"][row]
+        for (party, index), row in first_rows.items()
+    } == first
+
+
+def test_table_take():
+    submissions, table = load()
+    assert list(table.take(range(10, 20))) == submissions[10:20]
+    assert list(table.take([5, 3, 5])) == [submissions[i] for i in [5, 3, 5]]
+    assert list(table.take([7])) == [submissions[7]]
+    assert list(table.take([])) == []
+    assert len(table.where(verdict=lambda verdict: False)) == 0
+
+
+def test_table_shares_interner():
+    interner = Interner()
+    method = Contest_Status(contestId=104491, From=1, count=25000)
+    submissions = method.get(load_from_file=STATUS_FILE, interner=interner)
+    table = method.table(load_from_file=STATUS_FILE, interner=interner)
+    assert {id(party) for party in table.parties} == {
+        id(sub.author) for sub in submissions
+    }
+
+
+def test_table_take_is_independent():
+    submissions, table = load()
+    accepted = table.where(verdict=Verdict.OK)
+    parties, problems = len(table.parties), len(table.problems)
+
+    # a new party and problem in the derived table do not leak into its parent
+    sub = submissions[0]
+    new = dataclasses.replace(
+        sub,
+        author=dataclasses.replace(sub.author, teamName="newcomers"),
+        problem=dataclasses.replace(sub.problem, index="Z"),
+    )
+    accepted.append(new)
+    assert list(accepted)[-1] == new
+    assert (len(table.parties), len(table.problems)) == (parties, problems)
+    assert list(table) == submissions
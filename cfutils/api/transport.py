@@ -0,0 +1,423 @@
+"""
+HTTP transports used by :class:`cfutils.api.methods.APIMethod` to reach the Codeforces API.
+
+A transport only knows how to fetch a URL and hand back the response body;
+JSON decoding and error handling stay in :mod:`cfutils.api.methods`.
+"""
+import asyncio
+import gzip
+import http.client
+import io
+import threading
+from abc import ABC, abstractmethod
+from io import BytesIO, StringIO
+from typing import BinaryIO, TypeAlias
+from urllib.parse import urlsplit
+
+import sh  # type: ignore
+
+import cfutils
+
+
+class HTTPStatusError(Exception):
+    """The server answered with an HTTP error (or a redirect) instead of an API response.
+
+    Errors reported by the API itself (a JSON body with `"status": "FAILED"`, even with a 4xx status) are not raised by the transports,
+    so that the API methods report their `comment`.
+    """
+
+    def __init__(self, url: str, status: int, reason: str):
+        super().__init__(f"HTTP {status} {reason}: {url}")
+        self.url = url
+        self.status = status
+        self.reason = reason
+
+
+def _check_status(url: str, status: int, reason: str, content_type: str):
+    """Raise :class:`HTTPStatusError` unless the response is an API response"""
+    if status == 200:
+        return
+    if 400 <= status < 500 and content_type.lower().startswith("application/json"):
+        return
+    raise HTTPStatusError(url, status, reason)
+
+
+class Transport(ABC):
+    """Base class for API transports."""
+
+    @abstractmethod
+    def open(self, url: str) -> BinaryIO:
+        """Issue a GET request.
+
+        Args:
+            url: full URL to fetch.
+
+        Returns:
+            Binary stream of the (decompressed) response body. The caller must close it, preferably using a `with` block.
+
+        Raises:
+            HTTPStatusError: the response is not an API response (e.g. a server error or a redirect).
+        """
+
+    def close(self):
+        """Release any resources (e.g. open connections) held by the transport."""
+
+
+class CurlTransport(Transport):
+    """Fetch each URL by running a `curl` subprocess.
+
+    This spawns a new process (and TLS session) for every call, so it is slow for many calls.
+    Useful when `curl` is configured with proxies or certificates that python does not see.
+    """
+
+    def open(self, url: str) -> BinaryIO:
+        buf = StringIO()
+        sh.curl(url, _out=buf)  # type: ignore
+        return BytesIO(buf.getvalue().encode("utf-8"))
+
+
+class _PooledBody(io.BufferedIOBase):
+    """Response body of a pooled connection.
+    The connection is handed back to the pool once the body is read completely and closed.
+    """
+
+    def __init__(
+        self,
+        transport: "HTTPTransport",
+        key: tuple[str, str],
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+    ):
+        self._transport = transport
+        self._key = key
+        self._conn = conn
+        self._resp = resp
+        self._stream: BinaryIO = resp  # type: ignore
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            self._stream = gzip.GzipFile(fileobj=resp)  # type: ignore
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            return self._stream.read()
+        return self._stream.read(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, b) -> int:
+        data = self._stream.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        super().close()
+        if self._resp.isclosed() and not self._resp.will_close:
+            self._transport._release(self._key, self._conn)
+        else:
+            self._resp.close()
+            self._conn.close()
+
+
+class HTTPTransport(Transport):
+    """In-process HTTP client that keeps connections alive across calls.
+
+    Connections are pooled per host and are safe to share between threads:
+    each call checks out an idle connection (or opens a new one) and returns it when the body is closed.
+    Responses are requested gzip-compressed and decompressed while being read.
+
+    Args:
+        timeout: socket timeout in seconds.
+        max_idle: maximum number of idle connections kept per host.
+        compress: request gzip-compressed responses.
+    """
+
+    def __init__(
+        self, *, timeout: float = 60.0, max_idle: int = 4, compress: bool = True
+    ):
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._compress = compress
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, key: tuple[str, str]) -> http.client.HTTPConnection:
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self._timeout)
+        if scheme == "http":
+            return http.client.HTTPConnection(netloc, timeout=self._timeout)
+        raise ValueError(f"unsupported URL scheme: {scheme}")
+
+    def _acquire(self, key: tuple[str, str]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _release(self, key: tuple[str, str], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"User-Agent": f"cfutils/{cfutils.__version__}"}
+        if self._compress:
+            headers["Accept-Encoding"] = "gzip"
+        return headers
+
+    def open(self, url: str) -> BinaryIO:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        conn, reused = self._acquire(key)
+        while True:
+            try:
+                conn.request("GET", path, headers=self._headers())
+                resp = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                if not reused:
+                    raise
+                # the server dropped an idle keep-alive connection, retry on a fresh one.
+                conn, reused = self._connect(key), False
+            except BaseException:
+                conn.close()
+                raise
+
+        body = _PooledBody(self, key, conn, resp)
+        try:
+            _check_status(
+                url, resp.status, resp.reason, resp.getheader("Content-Type", "")
+            )
+        except HTTPStatusError:
+            # read the body, so that the connection can be reused
+            with body:
+                body.read()
+            raise
+        return body  # type: ignore
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class AsyncTransport(ABC):
+    """Base class for asyncio API transports."""
+
+    @abstractmethod
+    async def fetch(self, url: str) -> bytes:
+        """Issue a GET request.
+
+        Args:
+            url: full URL to fetch.
+
+        Returns:
+            The (decompressed) response body.
+
+        Raises:
+            HTTPStatusError: the response is not an API response (e.g. a server error or a redirect).
+        """
+
+    async def aclose(self):
+        """Release any resources (e.g. open connections) held by the transport."""
+
+
+_Stream: TypeAlias = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncHTTPTransport(AsyncTransport):
+    """Non-blocking HTTP/1.1 client built on asyncio streams, that keeps connections alive across calls.
+
+    Connections are pooled per host, for one event loop at a time:
+    the connections of a previous event loop (e.g. of an earlier `asyncio.run`) are dropped when the transport is used from another one.
+    Responses are requested gzip-compressed.
+
+    Args:
+        timeout: timeout in seconds for a single request.
+        max_idle: maximum number of idle connections kept per host.
+        compress: request gzip-compressed responses.
+    """
+
+    def __init__(
+        self, *, timeout: float = 60.0, max_idle: int = 4, compress: bool = True
+    ):
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._compress = compress
+        self._loop: asyncio.AbstractEventLoop | None = None
+        """Event loop of the idle connections"""
+        self._idle: dict[tuple[str, str], list[_Stream]] = {}
+
+    async def _connect(self, scheme: str, netloc: str) -> _Stream:
+        parts = urlsplit(f"{scheme}://{netloc}")
+        if scheme == "https":
+            return await asyncio.open_connection(
+                parts.hostname, parts.port or 443, ssl=True
+            )
+        if scheme == "http":
+            return await asyncio.open_connection(parts.hostname, parts.port or 80)
+        raise ValueError(f"unsupported URL scheme: {scheme}")
+
+    async def _roundtrip(
+        self, stream: _Stream, netloc: str, path: str
+    ) -> tuple[bytes, bool, int, str, str]:
+        """Send a GET request and read the response.
+
+        Returns:
+            The response body, whether the connection can be reused, and the status code, reason and content type of the response.
+        """
+        reader, writer = stream
+
+        headers = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {netloc}",
+            f"User-Agent: cfutils/{cfutils.__version__}",
+        ]
+        if self._compress:
+            headers.append("Accept-Encoding: gzip")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by the server")
+        version, status, reason = (
+            status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+        )[:3]
+
+        response_headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        keep_alive = (
+            version == "HTTP/1.1"
+            and response_headers.get("connection", "").lower() != "close"
+        )
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # trailers
+            body = b"".join(chunks)
+        elif "content-length" in response_headers:
+            body = await reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if response_headers.get("content-encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        content_type = response_headers.get("content-type", "")
+        return body, keep_alive, int(status), reason, content_type
+
+    async def fetch(self, url: str) -> bytes:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._drop_idle()
+            self._loop = loop
+        idle = self._idle.setdefault(key, [])
+        reused = bool(idle)
+        stream = idle.pop() if idle else await self._connect(parts.scheme, parts.netloc)
+        while True:
+            try:
+                body, keep_alive, status, reason, content_type = await asyncio.wait_for(
+                    self._roundtrip(stream, parts.netloc, path), self._timeout
+                )
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                stream[1].close()
+                if not reused:
+                    raise
+                # the server dropped an idle keep-alive connection, retry on a fresh one.
+                stream, reused = await self._connect(parts.scheme, parts.netloc), False
+            except BaseException:
+                stream[1].close()
+                raise
+
+        if keep_alive and len(idle) < self._max_idle:
+            idle.append(stream)
+        else:
+            stream[1].close()
+        _check_status(url, status, reason, content_type)
+        return body
+
+    def _drop_idle(self):
+        """Forget the idle connections, closing them (in their event loop) if it is still open"""
+        idle, self._idle = self._idle, {}
+        if self._loop is None or self._loop.is_closed():
+            return
+        for streams in idle.values():
+            for _, writer in streams:
+                self._loop.call_soon_threadsafe(writer.close)
+
+    async def aclose(self):
+        self._drop_idle()
+        self._loop = None
+
+
+_default_transport: Transport = HTTPTransport()
+_default_async_transport: AsyncTransport = AsyncHTTPTransport()
+
+
+def get_default_transport() -> Transport:
+    """Transport used by API calls that do not pass one explicitly."""
+    return _default_transport
+
+
+def get_default_async_transport() -> AsyncTransport:
+    """Transport used by asyncio API calls that do not pass one explicitly."""
+    return _default_async_transport
+
+
+def set_default_transport(transport: Transport):
+    """Replace the transport used by API calls that do not pass one explicitly.
+
+    Example: switch back to the `curl` subprocess backend.
+
+    .. code::
+
+        set_default_transport(CurlTransport())
+    """
+    global _default_transport
+    _default_transport = transport
+
+
+def set_default_async_transport(transport: AsyncTransport):
+    """Replace the transport used by asyncio API calls that do not pass one explicitly."""
+    global _default_async_transport
+    _default_async_transport = transport
+
+
+__all__ = [
+    "HTTPStatusError",
+    "Transport",
+    "CurlTransport",
+    "HTTPTransport",
+    "AsyncTransport",
+    "AsyncHTTPTransport",
+    "get_default_transport",
+    "set_default_transport",
+    "get_default_async_transport",
+    "set_default_async_transport",
+]
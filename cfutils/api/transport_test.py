@@ -0,0 +1,129 @@
+import asyncio
+import gc
+import gzip
+import json
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cfutils.api.transport import AsyncHTTPTransport, HTTPStatusError, HTTPTransport
+
+PAYLOAD = json.dumps({"status": "OK", "result": ["tourist", "Petr"]}).encode()
+FAILED = json.dumps({"status": "FAILED", "comment": "handle: not found"}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.endswith("/error"):
+            self._send(503, "text/html", b"<html>Service Unavailable</html>")
+        elif self.path.endswith("/redirect"):
+            self._send(302, "text/html", b"", Location="/api/user.friends")
+        elif self.path.endswith("/failed"):
+            self._send(400, "application/json", FAILED)
+        else:
+            self._send(200, "application/json", PAYLOAD)
+        self.server.connections.add(self.client_address)  # type: ignore
+
+    def _send(self, status: int, content_type: str, body: bytes, **headers: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.connections = set()  # type: ignore
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_http_transport_reuses_connection(server, compress):
+    url = f"http://127.0.0.1:{server.server_port}/api/user.friends"
+    transport = HTTPTransport(compress=compress)
+    for _ in range(3):
+        with transport.open(url) as body:
+            assert json.load(body) == json.loads(PAYLOAD)
+    transport.close()
+
+    assert len(server.connections) == 1
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_async_http_transport_reuses_connection(server, compress):
+    url = f"http://127.0.0.1:{server.server_port}/api/user.friends"
+    transport = AsyncHTTPTransport(compress=compress)
+
+    async def run():
+        bodies = [await transport.fetch(url) for _ in range(3)]
+        await transport.aclose()
+        return bodies
+
+    for body in asyncio.run(run()):
+        assert json.loads(body) == json.loads(PAYLOAD)
+    assert len(server.connections) == 1
+
+
+def test_http_transport_status(server):
+    base = f"http://127.0.0.1:{server.server_port}/api"
+    transport = HTTPTransport()
+    for path in ["error", "redirect"]:
+        with pytest.raises(HTTPStatusError):
+            transport.open(f"{base}/{path}")
+    # errors of the API itself are left to the API methods
+    with transport.open(f"{base}/failed") as body:
+        assert body.read() == FAILED
+    transport.close()
+
+    assert len(server.connections) == 1
+
+
+def test_async_http_transport_status(server):
+    base = f"http://127.0.0.1:{server.server_port}/api"
+    transport = AsyncHTTPTransport()
+
+    async def run():
+        for path in ["error", "redirect"]:
+            with pytest.raises(HTTPStatusError):
+                await transport.fetch(f"{base}/{path}")
+        assert await transport.fetch(f"{base}/failed") == FAILED
+        await transport.aclose()
+
+    asyncio.run(run())
+    assert len(server.connections) == 1
+
+
+def test_async_http_transport_event_loops(server):
+    url = f"http://127.0.0.1:{server.server_port}/api/user.friends"
+    transport = AsyncHTTPTransport()
+
+    # without `aclose`, the connections of a finished event loop are dropped (and the loop is not kept alive)
+    loops = []
+
+    async def run():
+        loops.append(weakref.ref(asyncio.get_running_loop()))
+        return await transport.fetch(url)
+
+    assert asyncio.run(run()) == PAYLOAD
+    assert asyncio.run(run()) == PAYLOAD
+    gc.collect()
+    assert loops[0]() is None
+    assert sum(len(idle) for idle in transport._idle.values()) == 1
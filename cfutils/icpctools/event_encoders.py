@@ -0,0 +1,127 @@
+"""
+Fast JSON serialization of event feed events (see :mod:`cfutils.icpctools.event_feed`).
+
+The feed used to serialize each event with `dataclasses.asdict`, dropping the fields that are `None` (except `id` and `icpc_id`),
+and a `default` hook for enums. That copies every nested object, and filters the fields of every object in Python.
+Instead, a function is generated (once) for each event dataclass, which builds the JSON object directly, with the same keys in the same order:
+:func:`serialize_event` returns exactly the same JSON as before.
+"""
+import dataclasses
+import json
+import types
+import typing
+from enum import Enum
+from typing import Any, Callable
+
+from cfutils.icpctools.event_feed import Event
+
+_KEPT = frozenset(["id", "icpc_id"])
+"""Fields that are kept when they are `None`"""
+
+_SCALARS = frozenset([str, int, float, bool])
+
+
+def _encode_any(value: Any) -> Any:
+    """Encode a value whose type is only known at runtime (e.g. `Event.data`)"""
+    if isinstance(value, list):
+        return [_encode_any(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return event_encoder_for(type(value))(value)
+    return value
+
+
+class _EventEncoderCompiler:
+    def __init__(self):
+        self.namespace: dict[str, Any] = {"_encode_any": _encode_any}
+        self._counter = 0
+
+    def _name(self, obj: Any) -> str:
+        self._counter += 1
+        name = f"_encode_{self._counter}"
+        self.namespace[name] = obj
+        return name
+
+    def expr(self, tp: Any, value: str) -> str:
+        """Python expression that converts `value` (an expression of type `tp`, that is not `None`) into JSON data"""
+        origin = typing.get_origin(tp)
+
+        if origin in (typing.Union, types.UnionType):
+            args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+            if len(args) != 1:
+                return f"_encode_any({value})"
+            return self.expr(args[0], value)
+
+        if origin is list:
+            (arg,) = typing.get_args(tp)
+            if arg in _SCALARS:
+                # json.dumps does not need a copy
+                return value
+            return f"[{self.expr(arg, '_x')} for _x in {value}]"
+
+        if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+            return f"{self._name(event_encoder_for(tp))}({value})"
+
+        if isinstance(tp, type) and issubclass(tp, Enum):
+            return f"{value}.value"
+
+        if tp in _SCALARS:
+            return value
+
+        return f"_encode_any({value})"
+
+    def build(self, tp: type) -> Callable[[Any], dict[str, Any]]:
+        hints = typing.get_type_hints(tp)
+        lines = [f"def encode_{tp.__name__}(o):", "    d = {}"]
+        for f in dataclasses.fields(tp):
+            expr = self.expr(hints[f.name], "_v")
+            if f.name in _KEPT:
+                lines += [
+                    f"    _v = o.{f.name}",
+                    f"    d[{f.name!r}] = None if _v is None else {expr}",
+                ]
+            else:
+                lines += [
+                    f"    if (_v := o.{f.name}) is not None:",
+                    f"        d[{f.name!r}] = {expr}",
+                ]
+        lines.append("    return d")
+        source = "\n".join(lines)
+        exec(
+            compile(source, f"<cfutils event encoder {tp.__name__}>", "exec"),
+            self.namespace,
+        )
+        func = self.namespace[f"encode_{tp.__name__}"]
+        func.__doc__ = f"Encode a `{tp.__name__}` into a JSON object\n\n{source}"
+        return func
+
+
+_encoders: dict[type, Callable[[Any], dict[str, Any]]] = {}
+
+
+def event_encoder_for(tp: type) -> Callable[[Any], dict[str, Any]]:
+    """Get the (generated, and cached) encoder function of an event feed dataclass.
+    It converts an object into a JSON object without its `None` fields, except `id` and `icpc_id`, which are always kept.
+
+    >>> from cfutils.icpctools.event_feed import Group
+    >>> event_encoder_for(Group)(Group(id="0", name="default", icpc_id="0"))
+    {'id': '0', 'name': 'default', 'icpc_id': '0'}
+    """
+    encoder = _encoders.get(tp)
+    if encoder is None:
+        encoder = _encoders[tp] = _EventEncoderCompiler().build(tp)
+    return encoder
+
+
+def serialize_event(event: Event) -> str:
+    """One line of the event feed: the JSON of an event (not indented).
+
+    >>> from cfutils.icpctools.event_feed import Event, EventType, Organization
+    >>> serialize_event(Event(type=EventType.organizations, id=None, data=Organization(id="org", name="Org")))
+    '{"type": "organizations", "data": {"id": "org", "name": "Org", "icpc_id": null}, "id": null}'
+    """
+    return json.dumps(event_encoder_for(Event)(event))
+
+
+__all__ = ["event_encoder_for", "serialize_event"]
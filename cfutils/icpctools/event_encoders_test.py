@@ -0,0 +1,104 @@
+import dataclasses
+import json
+
+import cfutils.api as cf
+import cfutils.icpctools.event_feed as feed
+import cfutils.icpctools.feed_generator as feed_gen
+from cfutils.icpctools.event_encoders import serialize_event
+from cfutils.icpctools.event_feed import Event
+
+
+def reference(event: Event) -> str:
+    """The previous serialization of the feed generator"""
+    return json.dumps(
+        dataclasses.asdict(
+            event,
+            dict_factory=lambda x: {
+                k: v for (k, v) in x if k in ["id", "icpc_id"] or v is not None
+            },
+        ),
+        default=lambda x: x.value,
+    )
+
+
+def test_serialize_feed_events():
+    events: list[Event] = []
+
+    class Recorder(feed_gen.EventFeedFromCFContest):
+        @staticmethod
+        def _serialize(event: Event) -> str:
+            events.append(event)
+            return serialize_event(event)
+
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    submissions: list[cf.Submission] = cf.Contest_Status(
+        contestId=104491, From=1, count=25000
+    ).get(load_from_file="data/examples/resolverfeed/status_104491.json")
+    lines = Recorder(
+        config=feed_gen.CFContestConfig(freezeDurationSeconds=60 * 60)
+    ).generate(
+        contest=standings.contest,
+        problems=standings.problems,
+        ranklist=standings.rows,
+        submissions=submissions,
+    )
+    assert lines == [reference(event) for event in events]
+
+
+def test_serialize_nested_events():
+    fileref = feed.Fileref(href="https://example.com/a.png", mime="image/png")
+    imageref = feed.Imageref(href="b.png", mime="image/png", width=64, height=64)
+    data: list[feed.EventData] = [
+        feed.Team(
+            id="1",
+            name="team",
+            icpc_id=None,
+            group_ids=["0", "1"],
+            location=feed.Location1(x=1.5, y=2, rotation=90),
+            photo=[imageref],
+            video=[fileref, fileref],
+        ),
+        feed.Organization(
+            id="org",
+            name="Org",
+            location=feed.Location(latitude=1.0, longitude=2.0),
+            logo=[imageref],
+        ),
+        feed.Person(id="p", name="P", role=feed.Role.contestant, sex=None),
+        feed.Language(
+            id="0",
+            name="C++",
+            entry_point_required=False,
+            extensions=["cpp", "cc"],
+            compiler=feed.Command(command="g++", args="-O2"),
+        ),
+        feed.Judgement(
+            id="1",
+            submission_id="1",
+            start_time="t",
+            start_contest_time="0:00:00.000",
+            end_time=None,
+            end_contest_time=None,
+        ),
+        feed.Commentary(
+            id="c",
+            time="t",
+            contest_time="0:00:00.000",
+            message="m",
+            team_ids=None,
+            problem_ids=[],
+        ),
+        feed.Account(id="a", username="u", type=feed.AccountTypeEnum.team),
+        feed.Award(id="winner", citation="Winner", team_ids=["1"]),
+    ]
+    events = [
+        Event(type=d.eventType(), id=ix, data=d, token=token)
+        for d in data
+        for ix, token in [(None, None), ("x", "tok")]
+    ]
+    events.append(Event(type=feed.EventType.teams, data=data[:1] * 2))
+    events.append(Event(type=feed.EventType.state, data=None))
+    for event in events:
+        assert serialize_event(event) == reference(event)
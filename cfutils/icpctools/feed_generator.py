@@ -1,13 +1,25 @@
-import dataclasses
 import datetime
-import json
+import functools
+import os
+from collections import deque
+from concurrent.futures import Executor, Future
 from dataclasses import dataclass
 import logging
-from typing import Optional
+from typing import (
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    TextIO,
+    TypeAlias,
+)
 
 import cfutils.api as cf
 import cfutils.icpctools.event_feed as feed
+from cfutils.icpctools.event_encoders import serialize_event
 from cfutils.icpctools.event_feed import Event, EventData
+from cfutils.icpctools.standings import StandingsTimeline
 
 
 class EventFeedError(Exception):
@@ -56,21 +68,109 @@ class CFContestConfig:
         return [self.groups[0]]
 
 
+SubmissionRecord: TypeAlias = tuple[int, int, str, str, Optional[cf.Verdict]]
+"""Submission id, relative time, problem index, team id, and verdict of a submission in the feed"""
+
+
+def _submission_event(record: SubmissionRecord) -> Event:
+    """Event of a submission (with or without a verdict)"""
+    number, reltime_seconds, problem_id, team_id, _ = record
+    submission = feed.Submission(
+        id=str(number),
+        language_id="0",
+        problem_id=problem_id,
+        team_id=team_id,
+        time=EventFeedFromCFContest._epochToISO(reltime_seconds),
+        contest_time=EventFeedFromCFContest._secondsToHHMMSS(reltime_seconds),
+        files=[],
+    )
+    return Event(type=submission.eventType(), id=None, data=submission)
+
+
+def _judgement_type(verdict: Optional[cf.Verdict]) -> feed.JudgementTypeId:
+    """Judgement type of a final verdict"""
+    if verdict == cf.Verdict.OK:
+        return feed.JudgementTypeId.AC
+    if verdict in [
+        cf.Verdict.FAILED,
+        cf.Verdict.TIME_LIMIT_EXCEEDED,
+        cf.Verdict.MEMORY_LIMIT_EXCEEDED,
+        cf.Verdict.WRONG_ANSWER,
+        cf.Verdict.RUNTIME_ERROR,
+        cf.Verdict.CHALLENGED,
+        cf.Verdict.IDLENESS_LIMIT_EXCEEDED,
+        cf.Verdict.REJECTED,
+        cf.Verdict.CRASHED,
+        cf.Verdict.PRESENTATION_ERROR,
+        cf.Verdict.PARTIAL,
+    ]:
+        return feed.JudgementTypeId.WA
+    if verdict in [
+        cf.Verdict.COMPILATION_ERROR,
+        cf.Verdict.INPUT_PREPARATION_CRASHED,
+        cf.Verdict.SKIPPED,
+    ]:
+        return feed.JudgementTypeId.CE
+    assert False, f"All verdicts not covered: {verdict}. Please report this bug."
+
+
+def _judgement_event(record: SubmissionRecord) -> Event:
+    """Event of the judgement of a submission with a final verdict"""
+    number, reltime_seconds, _, _, verdict = record
+    sub_id = str(number)
+    timestamp = EventFeedFromCFContest._epochToISO(reltime_seconds)
+    reltime = EventFeedFromCFContest._secondsToHHMMSS(reltime_seconds)
+    judgement = feed.Judgement(
+        id=sub_id,
+        submission_id=sub_id,
+        start_time=timestamp,
+        end_time=timestamp,
+        start_contest_time=reltime,
+        end_contest_time=reltime,
+        judgement_type_id=_judgement_type(verdict),
+    )
+    return Event(type=judgement.eventType(), id=None, data=judgement)
+
+
+def _submission_events(record: SubmissionRecord) -> list[Event]:
+    """Events of a submission and its judgement"""
+    return [_submission_event(record), _judgement_event(record)]
+
+
+def _serialize_submissions(records: list[SubmissionRecord]) -> list[str]:
+    """Serialized events of several submissions (run in the workers of :meth:`EventFeedFromCFContest.iter_events`)"""
+    return [
+        serialize_event(event)
+        for record in records
+        for event in _submission_events(record)
+    ]
+
+
 class EventFeedFromCFContest:
     _config: CFContestConfig
     _contest_events: list[Event]
+    """Events that are not serialized yet"""
+    _events_count: int
 
     _ghost_teams: dict[str, int]
     _individual_teams: dict[str, int]
+    _group_ids: dict[str, str]
+    """Id of each group of the config"""
+    _team_info: dict[Hashable, Optional[ContestTeam]]
+    """Team info by `cf.party_key(party)`: one entry per team, however many `Party` objects refer to it."""
 
     def __init__(self, *, config: CFContestConfig):
         self._config = config
         self._contest_events = []
+        self._events_count = 0
 
         self._ghost_teams = {}
         self._individual_teams = {}
+        self._group_ids = {}
+        self._team_info = {}
 
     @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
     def _epochToISO(s: int) -> str:
         return (
             datetime.datetime.fromtimestamp(s).isoformat(timespec="milliseconds")
@@ -78,6 +178,7 @@ class EventFeedFromCFContest:
         )
 
     @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
     def _secondsToHHMMSS(s: int) -> str:
         res = str(datetime.timedelta(seconds=s)) + ".000"
         if res[1] == ":":
@@ -85,29 +186,57 @@ class EventFeedFromCFContest:
         return res
 
     def _populate_teams(self, ranklist: list[cf.RanklistRow]):
+        self._team_info.clear()
         for row in ranklist:
-            party = row.party
+            self._register_party(row.party)
 
-            if party.teamId is not None:
-                continue
+    def _is_registered(self, party: cf.Party) -> bool:
+        """Whether the party is a CF team, or a ghost or individual with a generated ID"""
+        if party.teamId is not None:
+            return True
+        if party.ghost:
+            return party.teamName in self._ghost_teams
+        return (
+            len(party.members) == 1
+            and party.members[0].handle in self._individual_teams
+        )
 
-            if party.ghost:
-                assert party.teamName is not None, "ghosts must have a teamName"
-                ix = len(self._ghost_teams)
-                self._ghost_teams[party.teamName] = ix
-                continue
+    def _register_party(self, party: cf.Party):
+        """Generate the ID of a ghost or individual"""
+        if party.teamId is not None:
+            return
+
+        if party.ghost:
+            assert party.teamName is not None, "ghosts must have a teamName"
+            ix = len(self._ghost_teams)
+            self._ghost_teams[party.teamName] = ix
+            return
+
+        if len(party.members) == 1:
+            user = party.members[0].handle
+            ix = len(self._individual_teams)
+            self._individual_teams[user] = ix
+            return
+
+        raise EventFeedError(
+            f"Invalid participant in ranklist (not a CF team, ghost, or individual): {party}"
+        )
 
-            if len(party.members) == 1:
-                user = party.members[0].handle
-                ix = len(self._individual_teams)
-                self._individual_teams[user] = ix
-                continue
+    def _get_team_info(self, team: cf.Party) -> Optional[ContestTeam]:
+        """Same as :meth:`_make_team_info`, cached by the value of `team` (see :func:`cf.party_key`).
+        Each team is computed only once, and the cache does not keep the `Party` objects of every submission alive
+        (e.g. when the submissions are streamed without an :class:`cf.Interner`).
+        """
+        key = cf.party_key(team)
+        try:
+            return self._team_info[key]
+        except KeyError:
+            pass
 
-            raise EventFeedError(
-                f"Invalid participant in ranklist (not a CF team, ghost, or individual): {party}"
-            )
+        info = self._team_info[key] = self._make_team_info(team)
+        return info
 
-    def _get_team_info(self, team: cf.Party) -> Optional[ContestTeam]:
+    def _make_team_info(self, team: cf.Party) -> Optional[ContestTeam]:
         """Extract team info from a Party.
         For ghosts and individuals, use the generated IDs.
 
@@ -206,7 +335,7 @@ class EventFeedFromCFContest:
 
         tstart = 0
         tfin = contest.durationSeconds
-        tfrozen = tfin - self._config.freezeDurationSeconds
+        tfrozen = self.freezeTimeSeconds(contest)
 
         # (magic) 300s: buffer time between closing events.
         tthaw = tfin + 300
@@ -224,62 +353,62 @@ class EventFeedFromCFContest:
             )
         )
 
-    def _participantAllowed(self, ptype: cf.ParticipantType) -> bool:
-        if ptype == cf.ParticipantType.CONTESTANT:
-            return True
-        if ptype == cf.ParticipantType.VIRTUAL and self._config.include_virtual:
-            return True
-        if (
-            ptype == cf.ParticipantType.OUT_OF_COMPETITION
-            and self._config.include_out_of_comp
-        ):
-            return True
-        return False
+    def freezeTimeSeconds(self, contest: cf.Contest) -> int:
+        """Time of the standings freeze, relative to the start of the contest"""
+        return contest.durationSeconds - self._config.freezeDurationSeconds
 
-    def generate(
+    def timeline(
         self,
         *,
         contest: cf.Contest,
         problems: list[cf.Problem],
         ranklist: list[cf.RanklistRow],
         submissions: list[cf.Submission],
-    ) -> list[str]:
-        """Generate event feed JSON for the ICPC resolver tool.
+        interval_seconds: int = 5 * 60,
+    ) -> StandingsTimeline:
+        """Standings of the contest over time, with the participants of the generated feed, and a checkpoint at the freeze.
 
-        Caveats:
-            This ignores the true submission times, and instead assumes a start time of 0 (epoch). So the generated feed may not work for tools other than the resolver.
+        For example, the standings shown by the resolver before it starts are
+        `timeline.standings(generator.freezeTimeSeconds(contest) - 1)`.
 
         Args:
-            contest: CF Contest object. Usually obtained using `contest.standings`.
-            problems: CF Problem list. Usually obtained using `contest.standings`.
-            ranklist: CF ranklist row list. Usually obtained using `contest.standings`.
-            submissions: CF submission list. Usually obtained using `contest.status`.
-
-        Returns:
-            A list of stringified JSON events.
-
-        Raises:
-            EventFeedError: submission by a team not in the ranklist
-            EventFeedError: team is neither a CF team, nor a ghost, nor a CF user.
+            contest: CF Contest object.
+            problems: CF Problem list.
+            ranklist: CF ranklist row list.
+            submissions: CF submission list.
+            interval_seconds: time between two checkpoints, see :class:`StandingsTimeline`.
         """
+        freeze = self.freezeTimeSeconds(contest)
+        return StandingsTimeline(
+            problems,
+            [
+                row.party
+                for row in ranklist
+                if self._participantAllowed(row.party.participantType)
+            ],
+            [
+                sub
+                for sub in submissions
+                if self._participantAllowed(sub.author.participantType)
+            ],
+            interval_seconds=interval_seconds,
+            checkpoints=[freeze - 1, freeze],
+        )
 
-        ### Preprocessing
-        ## ignore invalid submissions and participants
-        submissions = [
-            sub
-            for sub in submissions
-            if self._participantAllowed(sub.author.participantType)
-        ]
-        ranklist = [
-            row
-            for row in ranklist
-            if self._participantAllowed(row.party.participantType)
-        ]
-
-        ## generates unique teamIds for ghosts and individuals.
-        self._populate_teams(ranklist)
+    def _participantAllowed(self, ptype: cf.ParticipantType) -> bool:
+        if ptype == cf.ParticipantType.CONTESTANT:
+            return True
+        if ptype == cf.ParticipantType.VIRTUAL and self._config.include_virtual:
+            return True
+        if (
+            ptype == cf.ParticipantType.OUT_OF_COMPETITION
+            and self._config.include_out_of_comp
+        ):
+            return True
+        return False
 
-        ### Contest Feed
+    def _add_contest_events(self, contest: cf.Contest, problems: list[cf.Problem]):
+        """Events of the contest, its judgement types, problems, groups and organizations"""
         ## contest info
         self._add_event(
             feed.Contest(
@@ -321,14 +450,16 @@ class EventFeedFromCFContest:
         )
 
         ## contest problems
-        problem_ids = [problem.index for problem in problems]
+        ordinals: dict[str, int] = {}
+        for ix, problem in enumerate(problems):
+            ordinals.setdefault(problem.index, ix)
         self._add_events(
             [
                 feed.Problem(
                     id=problem.index,
                     label=problem.index,
                     name=problem.name,
-                    ordinal=problem_ids.index(problem.index),
+                    ordinal=ordinals[problem.index],
                     test_data_count=1,
                 )
                 for problem in problems
@@ -337,10 +468,14 @@ class EventFeedFromCFContest:
         logging.info("#problems: %d", len(problems))
 
         ## contest regions
+        groups = self._config.groups
+        self._group_ids = {}
+        for ix, name in enumerate(groups):
+            self._group_ids.setdefault(name, str(ix))
         self._add_events(
             [
                 feed.Group(id=str(ix), name=name, icpc_id=str(ix))
-                for ix, name in enumerate(self._config.groups)
+                for ix, name in enumerate(groups)
             ]
         )
 
@@ -348,129 +483,274 @@ class EventFeedFromCFContest:
         # TODO: add support for multiple orgs
         self._add_events([feed.Organization(id="org_default", name="DefaultOrg")])
 
-        ## teams
-        for row in ranklist:
-            team = self._get_team_info(row.party)
+    def _add_team_event(self, party: cf.Party) -> Optional[ContestTeam]:
+        """Event of a team of the ranklist.
 
-            if team is None:
-                logging.warning("ignoring invalid team: ", row.party)
-                continue
+        Returns:
+            The team, or `None` if the party is ignored.
+        """
+        team = self._get_team_info(party)
 
-            groups = self._config.getGroups(team)
-            groups_ids = [str(self._config.groups.index(group)) for group in groups]
+        if team is None:
+            logging.warning("ignoring invalid team: %s", party)
+            return None
 
-            self._add_event(
-                feed.Team(
-                    id=team.Id,
-                    name=team.fullName,
-                    group_ids=groups_ids,
-                    organization_id="org_default",
-                )
+        groups = self._config.getGroups(team)
+        groups_ids = [self._group_ids[group] for group in groups]
+
+        self._add_event(
+            feed.Team(
+                id=team.Id,
+                name=team.fullName,
+                group_ids=groups_ids,
+                organization_id="org_default",
             )
-        logging.info("#teams: %d", len(ranklist))
+        )
+        return team
 
-        ## start the contest
-        self._show_contest_state(contest=contest)
+    def _submission_record(
+        self, sub: cf.Submission, *, pending: bool = False
+    ) -> Optional[SubmissionRecord]:
+        """What the feed needs from a submission, or `None` if the submission is ignored.
 
-        ## submission data
-        ignored_submissions_count = 0
+        Args:
+            pending: also keep the submissions that are being tested, with the verdict `None`.
+        """
+        if sub.verdict == cf.Verdict.SECURITY_VIOLATED:
+            return None
+        verdict = None if sub.verdict in [None, cf.Verdict.TESTING] else sub.verdict
+        if verdict is None and not pending:
+            return None
+
+        team = self._get_team_info(sub.author)
+
+        if team is None:
+            logging.warning("ignoring invalid submission: %d", sub.id)
+            return None
+
+        return (
+            sub.id,
+            sub.relativeTimeSeconds,
+            sub.problem.index,
+            team.Id,
+            verdict,
+        )
+
+    def _add_submission_events(self, sub: cf.Submission) -> bool:
+        """Events of a submission and its judgement.
+
+        Returns:
+            False if the submission is ignored.
+        """
+        record = self._submission_record(sub)
+        if record is None:
+            return False
+        self._contest_events += _submission_events(record)
+        return True
+
+    @staticmethod
+    def _serialize(event: Event) -> str:
+        ## IMPORTANT: DO NOT INDENT THE JSON, one event entry per line
+        return serialize_event(event)
+
+    def _flush(self) -> Iterator[str]:
+        """Serialize the pending events, and forget them"""
+        for event in self._contest_events:
+            yield self._serialize(event)
+        self._events_count += len(self._contest_events)
+        self._contest_events.clear()
+
+    def generate(
+        self,
+        *,
+        contest: cf.Contest,
+        problems: list[cf.Problem],
+        ranklist: list[cf.RanklistRow],
+        submissions: list[cf.Submission],
+        executor: Executor | None = None,
+        chunk_size: int = 5000,
+    ) -> list[str]:
+        """Generate event feed JSON for the ICPC resolver tool.
+        See :meth:`iter_events` and :meth:`write` to generate the feed without keeping it in memory.
+
+        Caveats:
+            This ignores the true submission times, and instead assumes a start time of 0 (epoch). So the generated feed may not work for tools other than the resolver.
+
+        Args:
+            contest: CF Contest object. Usually obtained using `contest.standings`.
+            problems: CF Problem list. Usually obtained using `contest.standings`.
+            ranklist: CF ranklist row list. Usually obtained using `contest.standings`.
+            submissions: CF submission list. Usually obtained using `contest.status`.
+            executor (optional): serialize the submission and judgement events in parallel, in chunks of `chunk_size` submissions,
+                using this executor (usually a `ProcessPoolExecutor`). The feed is the same as without an executor.
+            chunk_size: number of submissions per task of the executor.
+
+        Returns:
+            A list of stringified JSON events.
+
+        Raises:
+            EventFeedError: submission by a team not in the ranklist
+            EventFeedError: team is neither a CF team, nor a ghost, nor a CF user.
+        """
+        return list(
+            self.iter_events(
+                contest=contest,
+                problems=problems,
+                ranklist=ranklist,
+                submissions=submissions,
+                executor=executor,
+                chunk_size=chunk_size,
+            )
+        )
+
+    def write(
+        self,
+        out: TextIO,
+        *,
+        contest: cf.Contest,
+        problems: list[cf.Problem],
+        ranklist: list[cf.RanklistRow],
+        submissions: Iterable[cf.Submission],
+        executor: Executor | None = None,
+        chunk_size: int = 5000,
+    ) -> int:
+        """Write the event feed to `out` (NDJSON: one event per line), as it is generated. See :meth:`iter_events` and :meth:`generate`.
+
+        Returns:
+            The number of events written.
+        """
+        count = 0
+        for event in self.iter_events(
+            contest=contest,
+            problems=problems,
+            ranklist=ranklist,
+            submissions=submissions,
+            executor=executor,
+            chunk_size=chunk_size,
+        ):
+            out.write(event)
+            out.write("\n")
+            count += 1
+        return count
+
+    def _parallel_submission_events(
+        self,
+        submissions: Iterable[cf.Submission],
+        executor: Executor,
+        chunk_size: int,
+    ) -> Generator[str, None, tuple[int, int]]:
+        """Events of the submissions, serialized by `executor` in chunks, in the order of the submissions.
+
+        Returns:
+            The number of submissions, and the number of ignored submissions.
+        """
+        pending: deque[Future[list[str]]] = deque()
+        max_pending = 2 * (os.cpu_count() or 1)
+
+        def done() -> Iterator[str]:
+            lines = pending.popleft().result()
+            self._events_count += len(lines)
+            yield from lines
+
+        submissions_count = ignored_submissions_count = 0
+        chunk: list[SubmissionRecord] = []
         for sub in submissions:
-            if sub.verdict is None or sub.verdict in [
-                cf.Verdict.TESTING,
-                cf.Verdict.SECURITY_VIOLATED,
-            ]:
+            submissions_count += 1
+            record = self._submission_record(sub)
+            if record is None:
                 ignored_submissions_count += 1
                 continue
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                pending.append(executor.submit(_serialize_submissions, chunk))
+                chunk = []
+                # bound the memory of the submitted chunks, and of their results
+                while len(pending) > max_pending or (pending and pending[0].done()):
+                    yield from done()
+
+        if chunk:
+            pending.append(executor.submit(_serialize_submissions, chunk))
+        while pending:
+            yield from done()
+        return submissions_count, ignored_submissions_count
+
+    def iter_events(
+        self,
+        *,
+        contest: cf.Contest,
+        problems: list[cf.Problem],
+        ranklist: list[cf.RanklistRow],
+        submissions: Iterable[cf.Submission],
+        executor: Executor | None = None,
+        chunk_size: int = 5000,
+    ) -> Iterator[str]:
+        """Same as :meth:`generate`, but yields the events as they are generated.
+        Only the events of the current team or submission are kept in memory, and `submissions` can be a lazy iterable (for example from :meth:`APIMethod.stream`).
+        With an `executor`, the events of at most a few chunks of submissions per worker are kept in memory.
 
-            team = self._get_team_info(sub.author)
+        Yields:
+            Stringified JSON events.
 
-            if team is None:
-                logging.warning("ignoring invalid submission: %d", sub.id)
-                ignored_submissions_count += 1
-                continue
+        Raises:
+            EventFeedError: submission by a team not in the ranklist
+            EventFeedError: team is neither a CF team, nor a ghost, nor a CF user.
+        """
 
-            sub_id = str(sub.id)
-            timestamp = self._epochToISO(sub.relativeTimeSeconds)
-            reltime = self._secondsToHHMMSS(sub.relativeTimeSeconds)
-
-            self._add_event(
-                feed.Submission(
-                    id=sub_id,
-                    language_id="0",
-                    problem_id=sub.problem.index,
-                    team_id=team.Id,
-                    time=timestamp,
-                    contest_time=reltime,
-                    files=[],
-                )
-            )
+        ### Preprocessing
+        ## ignore invalid submissions and participants
+        submissions = (
+            sub
+            for sub in submissions
+            if self._participantAllowed(sub.author.participantType)
+        )
+        ranklist = [
+            row
+            for row in ranklist
+            if self._participantAllowed(row.party.participantType)
+        ]
 
-            verdict: feed.JudgementTypeId
-            if sub.verdict == cf.Verdict.OK:
-                verdict = feed.JudgementTypeId.AC
-            elif sub.verdict in [
-                cf.Verdict.FAILED,
-                cf.Verdict.TIME_LIMIT_EXCEEDED,
-                cf.Verdict.MEMORY_LIMIT_EXCEEDED,
-                cf.Verdict.WRONG_ANSWER,
-                cf.Verdict.RUNTIME_ERROR,
-                cf.Verdict.CHALLENGED,
-                cf.Verdict.IDLENESS_LIMIT_EXCEEDED,
-                cf.Verdict.REJECTED,
-                cf.Verdict.CRASHED,
-                cf.Verdict.PRESENTATION_ERROR,
-                cf.Verdict.PARTIAL,
-            ]:
-                verdict = feed.JudgementTypeId.WA
-            elif sub.verdict in [
-                cf.Verdict.COMPILATION_ERROR,
-                cf.Verdict.INPUT_PREPARATION_CRASHED,
-                cf.Verdict.SKIPPED,
-            ]:
-                verdict = feed.JudgementTypeId.CE
-            else:
-                assert (
-                    False
-                ), f"All verdicts not covered: {sub.verdict}. Please report this bug."
-
-            self._add_event(
-                feed.Judgement(
-                    id=sub_id,
-                    submission_id=sub_id,
-                    start_time=timestamp,
-                    end_time=timestamp,
-                    start_contest_time=reltime,
-                    end_contest_time=reltime,
-                    judgement_type_id=verdict,
-                )
+        ## generates unique teamIds for ghosts and individuals.
+        self._populate_teams(ranklist)
+
+        ### Contest Feed
+        self._add_contest_events(contest, problems)
+
+        ## teams
+        for row in ranklist:
+            yield from self._flush()
+            self._add_team_event(row.party)
+        logging.info("#teams: %d", len(ranklist))
+
+        ## start the contest
+        self._show_contest_state(contest=contest)
+        yield from self._flush()
+
+        ## submission data
+        if executor is None:
+            submissions_count = ignored_submissions_count = 0
+            for sub in submissions:
+                yield from self._flush()
+                submissions_count += 1
+                if not self._add_submission_events(sub):
+                    ignored_submissions_count += 1
+        else:
+            submissions_count, ignored_submissions_count = yield from (
+                self._parallel_submission_events(submissions, executor, chunk_size)
             )
 
         logging.info(
             "#submissions: %d, [ignored: %d]",
-            len(submissions),
+            submissions_count,
             ignored_submissions_count,
         )
 
         ## end the contest
         self._show_contest_state(contest=contest, done=True)
 
-        ### feed generation complete
-        logging.info("#events: %d", len(self._contest_events))
+        yield from self._flush()
 
-        ## IMPORTANT: DO NOT INDENT THE JSON, one event entry per line
-        feed_json = [
-            json.dumps(
-                dataclasses.asdict(
-                    event,
-                    dict_factory=lambda x: {
-                        k: v for (k, v) in x if k in ["id", "icpc_id"] or v is not None
-                    },
-                ),
-                default=lambda x: x.value,  # TODO this is a hack for serializing Enums. SHOULD instead use StrEnum (>= 3.11), and remove this.
-            )
-            for event in self._contest_events
-        ]
-        return feed_json
+        ### feed generation complete
+        logging.info("#events: %d", self._events_count)
 
 
 __all__ = ["EventFeedError", "CFContestConfig", "EventFeedFromCFContest"]
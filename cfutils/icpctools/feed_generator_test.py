@@ -1,3 +1,8 @@
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
 import cfutils.api as cf
 import cfutils.icpctools.feed_generator as feed_gen
 
@@ -25,3 +30,149 @@ def test_feed_generator():
         ranklist=standings.rows,
         submissions=submissions,
     )
+
+
+def test_team_info_cache():
+    interner = cf.Interner()
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(
+        load_from_file="data/examples/resolverfeed/standings_104491.json",
+        interner=interner,
+    )
+    submissions: list[cf.Submission] = cf.Contest_Status(
+        contestId=104491, From=1, count=25000
+    ).get(
+        load_from_file="data/examples/resolverfeed/status_104491.json",
+        interner=interner,
+    )
+
+    gen = feed_gen.EventFeedFromCFContest(
+        config=feed_gen.CFContestConfig(freezeDurationSeconds=60 * 60)
+    )
+    gen._populate_teams(standings.rows)
+    teams = {id(row.party): gen._get_team_info(row.party) for row in standings.rows}
+
+    for sub in submissions:
+        assert gen._get_team_info(sub.author) is teams[id(sub.author)]
+
+    # one entry per team, also when the parties are not shared
+    submissions = cf.Contest_Status(contestId=104491, From=1, count=25000).get(
+        load_from_file="data/examples/resolverfeed/status_104491.json"
+    )
+    for sub in submissions:
+        gen._get_team_info(sub.author)
+    parties = {str(sub.author) for sub in submissions} | {
+        str(row.party) for row in standings.rows
+    }
+    assert len(gen._team_info) == len(parties)
+
+
+def test_feed_generator_streaming():
+    submissions: list[cf.Submission] = cf.Contest_Status(
+        contestId=104491, From=1, count=25000
+    ).get(load_from_file="data/examples/resolverfeed/status_104491.json")
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    config = feed_gen.CFContestConfig(
+        freezeDurationSeconds=60 * 60, include_virtual=True, include_out_of_comp=True
+    )
+    kwargs: dict[str, Any] = {
+        "contest": standings.contest,
+        "problems": standings.problems,
+        "ranklist": standings.rows,
+    }
+
+    events = feed_gen.EventFeedFromCFContest(config=config).generate(
+        submissions=submissions, **kwargs
+    )
+
+    out = io.StringIO()
+    gen = feed_gen.EventFeedFromCFContest(config=config)
+    assert gen.write(out, submissions=iter(submissions), **kwargs) == len(events)
+    assert out.getvalue() == "".join(event + "\n" for event in events)
+    assert not gen._contest_events
+
+    # events are yielded before the submissions are consumed
+    consumed = []
+
+    def lazy():
+        for sub in submissions:
+            consumed.append(sub)
+            yield sub
+
+    stream = feed_gen.EventFeedFromCFContest(config=config).iter_events(
+        submissions=lazy(), **kwargs
+    )
+    first = [next(stream) for _ in range(10)]
+    assert first == events[:10] and not consumed
+    assert first + list(stream) == events
+    assert len(consumed) == len(submissions)
+
+
+def test_feed_generator_groups():
+    class Config(feed_gen.CFContestConfig):
+        @property
+        def groups(self) -> list[str]:
+            return ["A", "B", "C"]
+
+        def getGroups(self, team: feed_gen.ContestTeam) -> list[str]:
+            return ["C", "A"] if team.Id.startswith("user_") else ["B"]
+
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    events = [
+        json.loads(event)
+        for event in feed_gen.EventFeedFromCFContest(
+            config=Config(
+                freezeDurationSeconds=60 * 60,
+                include_virtual=True,
+                include_out_of_comp=True,
+            )
+        ).generate(
+            contest=standings.contest,
+            problems=standings.problems,
+            ranklist=standings.rows,
+            submissions=[],
+        )
+    ]
+
+    teams = [event["data"] for event in events if event["type"] == "teams"]
+    assert teams
+    for team in teams:
+        expected = ["2", "0"] if team["id"].startswith("user_") else ["1"]
+        assert team["group_ids"] == expected
+    problems = [event["data"] for event in events if event["type"] == "problems"]
+    assert [problem["ordinal"] for problem in problems] == list(
+        range(len(standings.problems))
+    )
+
+
+def test_feed_generator_parallel():
+    submissions: list[cf.Submission] = cf.Contest_Status(
+        contestId=104491, From=1, count=25000
+    ).get(load_from_file="data/examples/resolverfeed/status_104491.json")
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    config = feed_gen.CFContestConfig(
+        freezeDurationSeconds=60 * 60, include_virtual=True, include_out_of_comp=True
+    )
+    kwargs: dict[str, Any] = {
+        "contest": standings.contest,
+        "problems": standings.problems,
+        "ranklist": standings.rows,
+        "submissions": submissions,
+    }
+
+    events = feed_gen.EventFeedFromCFContest(config=config).generate(**kwargs)
+    with ProcessPoolExecutor(2) as executor:
+        for chunk_size in [1, 50, 100000]:
+            assert (
+                feed_gen.EventFeedFromCFContest(config=config).generate(
+                    executor=executor, chunk_size=chunk_size, **kwargs
+                )
+                == events
+            )
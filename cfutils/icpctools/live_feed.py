@@ -0,0 +1,187 @@
+"""
+Event feed of a running contest, kept up to date by polling `contest.status` (see :class:`ContestStatusSync`).
+"""
+import logging
+from enum import Enum
+from typing import Iterator, Optional
+
+import cfutils.api as cf
+from cfutils.api.sync import ContestStatusSync
+from cfutils.icpctools import event_feed as feed
+from cfutils.icpctools.feed_generator import (
+    CFContestConfig,
+    EventFeedFromCFContest,
+    _judgement_event,
+    _judgement_type,
+    _submission_event,
+)
+
+
+class LiveEventFeed(EventFeedFromCFContest):
+    """Event feed of a running contest, appended to an NDJSON file (one event per line).
+
+    The teams, problems and verdicts are kept between polls, and each :meth:`poll` only appends the events of the new or updated submissions:
+    a `Submission` event when a submission is first seen (even if it is still being tested), and a `Judgement` event when it gets a final verdict (or a different one).
+    Teams that are not in the initial ranklist get a `Team` event at their first submission.
+    So a poll costs API requests and CPU proportional to the activity since the last poll, not to the size of the contest.
+    The polled submissions are decoded without an :class:`cf.Interner`, so the team info is cached by the value of each party (see :func:`cf.party_key`), once per team.
+
+    Every event has the id of its object (the submission id for submissions and judgements) and a token, its (increasing) line number in the file,
+    so that the feed can be followed by a client that reconnects.
+
+    >>> import os, tempfile
+    >>> from cfutils.api.methods import Contest_Standings
+    >>> standings = Contest_Standings(contestId=104491, From=1, count=10000).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    >>> path = os.path.join(tempfile.mkdtemp(), "feed.json")
+    >>> live = LiveEventFeed(path, contestId=104491, config=CFContestConfig(freezeDurationSeconds=3600))
+    >>> live.start(contest=standings.contest, problems=standings.problems, ranklist=standings.rows) > 0
+    True
+
+    Args:
+        path: the feed file. It is overwritten by :meth:`start`.
+        contestId: contest to follow.
+        config: see :class:`CFContestConfig`.
+        asManager, page_size: see :class:`ContestStatusSync`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        contestId: int,
+        config: CFContestConfig,
+        asManager: bool = False,
+        page_size: int = 500,
+    ):
+        super().__init__(config=config)
+        self.path = path
+        self.sync = ContestStatusSync(
+            contestId, asManager=asManager, page_size=page_size
+        )
+
+        self._teams: set[str] = set()
+        """Ids of the teams in the feed"""
+        self._submitted: set[int] = set()
+        """Ids of the submissions in the feed"""
+        self._judged: dict[int, feed.JudgementTypeId] = {}
+        """Judgement (in the feed) of each judged submission"""
+        self._state: Optional[feed.State] = None
+
+    def _flush(self) -> Iterator[str]:
+        for i, event in enumerate(self._contest_events):
+            if event.id is None:
+                data_id = getattr(event.data, "id", None)
+                event.id = data_id.value if isinstance(data_id, Enum) else data_id
+            event.token = str(self._events_count + i)
+        return super()._flush()
+
+    def _append(self, mode: str = "a") -> int:
+        """Write the pending events to the feed file.
+
+        Returns:
+            The number of events written.
+        """
+        count = len(self._contest_events)
+        with open(self.path, mode) as outf:
+            for line in self._flush():
+                outf.write(line)
+                outf.write("\n")
+        return count
+
+    def _update_state(self, contest: cf.Contest, *, done: bool = False):
+        """`State` event, if the state changed"""
+        self._show_contest_state(contest=contest, done=done)
+        state = self._contest_events[-1].data
+        if state == self._state:
+            self._contest_events.pop()
+        else:
+            assert isinstance(state, feed.State)
+            self._state = state
+
+    def _add_live_team(self, party: cf.Party) -> bool:
+        """Register the party if it is new, and add its `Team` event if it is not in the feed yet.
+
+        Returns:
+            False if the party is ignored.
+        """
+        if not self._is_registered(party) and (party.ghost or len(party.members) == 1):
+            self._register_party(party)
+        team = self._get_team_info(party)
+        if team is None:
+            return False
+        if team.Id not in self._teams:
+            self._add_team_event(party)
+            self._teams.add(team.Id)
+        return True
+
+    def start(
+        self,
+        *,
+        contest: cf.Contest,
+        problems: list[cf.Problem],
+        ranklist: list[cf.RanklistRow],
+    ) -> int:
+        """Write the contest, its problems and teams, and its state, to a new feed file.
+
+        Args:
+            contest, problems, ranklist: see the result of :class:`cf.Contest_Standings`. The ranklist can be empty.
+
+        Returns:
+            The number of events written.
+        """
+        ranklist = [
+            row
+            for row in ranklist
+            if self._participantAllowed(row.party.participantType)
+        ]
+        self._populate_teams(ranklist)
+        self._add_contest_events(contest, problems)
+        for row in ranklist:
+            self._add_live_team(row.party)
+        self._update_state(contest)
+        return self._append("w")
+
+    def poll(self, **kwargs) -> int:
+        """Fetch the new submissions and verdicts (see :meth:`ContestStatusSync.poll`), and append their events.
+
+        Args:
+            **kwargs: passed to :meth:`APIMethod.get` for every page.
+
+        Returns:
+            The number of events written.
+        """
+        for sub in reversed(self.sync.poll(**kwargs)):
+            if not self._participantAllowed(sub.author.participantType):
+                continue
+            if not self._add_live_team(sub.author):
+                logging.warning("ignoring invalid submission: %d", sub.id)
+                continue
+            record = self._submission_record(sub, pending=True)
+            if record is None:
+                continue
+
+            if sub.id not in self._submitted:
+                self._contest_events.append(_submission_event(record))
+                self._submitted.add(sub.id)
+            verdict = record[-1]
+            if verdict is not None:
+                judgement = _judgement_type(verdict)
+                if self._judged.get(sub.id) != judgement:
+                    self._contest_events.append(_judgement_event(record))
+                    self._judged[sub.id] = judgement
+
+        count = self._append()
+        logging.info("contest %d: %d new events", self.sync.method.contestId, count)
+        return count
+
+    def finish(self, *, contest: cf.Contest) -> int:
+        """Append the final state of the contest, once all the submissions are judged (see :meth:`poll`).
+
+        Returns:
+            The number of events written.
+        """
+        self._update_state(contest, done=True)
+        return self._append()
+
+
+__all__ = ["LiveEventFeed"]
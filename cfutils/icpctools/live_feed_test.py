@@ -0,0 +1,108 @@
+import json
+
+import cfutils.api as cf
+import cfutils.icpctools.feed_generator as feed_gen
+from cfutils.api.fake_transport_test import FakeTransport
+from cfutils.api.ratelimit import RateLimiter
+from cfutils.icpctools.live_feed import LiveEventFeed
+
+
+def _submission_data(lines: list[str]) -> dict[tuple[str, str], dict]:
+    """Data of the submission and judgement events, by type and id"""
+    events = [json.loads(line) for line in lines]
+    return {
+        (event["type"], event["data"]["id"]): event["data"]
+        for event in events
+        if event["type"] in ["submissions", "judgements"]
+    }
+
+
+def test_live_event_feed(tmp_path):
+    with open("data/examples/resolverfeed/status_104491.json") as inf:
+        submissions = [
+            sub
+            for sub in json.load(inf)["result"]
+            if sub["author"]["participantType"] != "PRACTICE"
+        ]
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    config = feed_gen.CFContestConfig(
+        freezeDurationSeconds=60 * 60,
+        include_virtual=True,
+        include_out_of_comp=True,
+        strict_mode=True,
+    )
+
+    # practice submissions are not in the feed
+    # the contest so far: all but the newest 30 submissions, the newest 5 of which are still being tested.
+    live = submissions[30:]
+    live[:5] = [{**sub, "verdict": "TESTING"} for sub in live[:5]]
+    transport = FakeTransport({"contest.status": live})
+    kwargs = {"limiter": RateLimiter(interval=0), "transport": transport}
+
+    path = tmp_path / "feed.json"
+    feed = LiveEventFeed(str(path), contestId=104491, config=config, page_size=100)
+    start = feed.start(
+        contest=standings.contest, problems=standings.problems, ranklist=standings.rows
+    )
+    first = feed.poll(**kwargs)
+    lines = path.read_text().splitlines()
+    assert len(lines) == start + first
+    data = _submission_data(lines)
+    assert sum(kind == "submissions" for kind, _ in data) == len(live)
+    assert ("judgements", str(live[0]["id"])) not in data
+
+    # 30 new submissions, and the pending ones are judged.
+    transport.results["contest.status"] = submissions
+    second = feed.poll(**kwargs)
+    lines = path.read_text().splitlines()
+    assert len(lines) == start + first + second
+    new = [json.loads(line)["type"] for line in lines[start + first :]]
+    assert new.count("submissions") == 30
+    assert new.count("judgements") == 35
+    assert len(new) == second
+
+    # nothing new: a single call, and no events.
+    transport.calls = []
+    assert feed.poll(**kwargs) == 0
+    assert len(transport.calls) == 1
+
+    assert feed.finish(contest=standings.contest) == 1
+    assert feed.finish(contest=standings.contest) == 0
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [event["token"] for event in events] == [str(i) for i in range(len(events))]
+    assert all(
+        event["id"] == event["data"].get("id")
+        for event in events
+        if event["type"] != "state"
+    )
+
+    # same submissions and judgements as the feed generated after the contest
+    expected = feed_gen.EventFeedFromCFContest(config=config).generate(
+        contest=standings.contest,
+        problems=standings.problems,
+        ranklist=standings.rows,
+        submissions=cf.Contest_Status(contestId=104491, From=1, count=25000).get(
+            load_from_file="data/examples/resolverfeed/status_104491.json"
+        ),
+    )
+    expected_data = _submission_data(expected)
+    assert _submission_data(path.read_text().splitlines()) == expected_data
+
+    # teams that are not in the ranklist are added at their first submission
+    teams = {
+        data["team_id"]
+        for (kind, _), data in expected_data.items()
+        if kind == "submissions"
+    }
+    feed = LiveEventFeed(str(path), contestId=104491, config=config)
+    feed.start(contest=standings.contest, problems=standings.problems, ranklist=[])
+    feed.poll(**kwargs)
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert sum(event["type"] == "teams" for event in events) == len(teams)
+    # the polled submissions are decoded without an interner: the team info is cached once per team
+    parties = [sub.author for sub in feed.sync.submissions.values()]
+    assert len({id(party) for party in parties}) == len(parties)
+    assert len(feed._team_info) == len(teams)
@@ -0,0 +1,504 @@
+"""
+ICPC standings computed from submissions: updated incrementally, or at any point of time of a finished contest.
+"""
+import bisect
+import random
+from array import array
+from dataclasses import dataclass, field
+from typing import Hashable, Iterable, Iterator, Optional
+
+import cfutils.api as cf
+
+_IGNORED = frozenset([None, cf.Verdict.TESTING, cf.Verdict.SECURITY_VIOLATED])
+"""Verdicts of submissions that do not count (yet)"""
+
+_NO_PENALTY = frozenset(
+    [
+        cf.Verdict.COMPILATION_ERROR,
+        cf.Verdict.INPUT_PREPARATION_CRASHED,
+        cf.Verdict.SKIPPED,
+    ]
+)
+"""Rejections that do not count as attempts"""
+
+_UNRANKED = frozenset([cf.ParticipantType.PRACTICE, cf.ParticipantType.MANAGER])
+"""Parties listed after the ranked ones, with rank 0 (like in `contest.standings`)"""
+
+Key = tuple[int, int, int]
+"""Order of a team in the standings: (-solved, penalty, sequence number)"""
+
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right", "size")
+
+    def __init__(self, key: Key):
+        self.key = key
+        self.priority = random.random()
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.size = 1
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _split(node: Optional[_Node], key: Key) -> tuple[Optional[_Node], Optional[_Node]]:
+    """Split into the keys `< key` and the keys `>= key`."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        node.size = 1 + _size(node.left) + _size(node.right)
+        return node, right
+    left, node.left = _split(node.left, key)
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps, where all keys of `left` are smaller than the keys of `right`."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.size = 1 + _size(left.left) + _size(left.right)
+        return left
+    right.left = _merge(left, right.left)
+    right.size = 1 + _size(right.left) + _size(right.right)
+    return right
+
+
+class OrderStatisticTree:
+    """Set of keys (a treap), with O(log n) insertion, removal and counting of the keys smaller than a given key."""
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def insert(self, key: Key):
+        left, right = _split(self._root, key)
+        self._root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, key: Key):
+        left, right = _split(self._root, key)
+        _, right = _split(right, (key[0], key[1], key[2] + 1))
+        self._root = _merge(left, right)
+
+    def count_less(self, key: tuple[int, ...]) -> int:
+        """Number of keys smaller than `key`"""
+        count = 0
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                count += 1 + _size(node.left)
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def __iter__(self) -> Iterator[Key]:
+        """Keys in increasing order"""
+        stack: list[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+
+@dataclass(slots=True)
+class _Cell:
+    """Counted attempts of a team on a problem: submission id -> (relative time, accepted)"""
+
+    attempts: dict[int, tuple[int, bool]] = field(default_factory=dict)
+
+    def result(self) -> tuple[Optional[int], int]:
+        """Time of the first accepted attempt (or None), and the number of rejected attempts before it"""
+        accepted = [(t, sub_id) for sub_id, (t, ok) in self.attempts.items() if ok]
+        if not accepted:
+            return None, len(self.attempts)
+        first = min(accepted)
+        rejected = sum(
+            1
+            for sub_id, (t, ok) in self.attempts.items()
+            if not ok and (t, sub_id) < first
+        )
+        return first[0], rejected
+
+
+@dataclass(slots=True)
+class _Team:
+    party: cf.Party
+    key: Key
+    cells: dict[str, _Cell] = field(default_factory=dict)
+
+
+def _attempt(sub: cf.Submission) -> Optional[tuple[int, bool]]:
+    """(relative time, accepted) of a counted attempt, or None"""
+    if sub.verdict in _IGNORED or sub.verdict in _NO_PENALTY:
+        return None
+    return sub.relativeTimeSeconds, sub.verdict == cf.Verdict.OK
+
+
+def _ranklist_row(
+    problems: list[cf.Problem],
+    party: cf.Party,
+    cells: dict[str, _Cell],
+    rank: int,
+    solved: int,
+    penalty: int,
+) -> cf.RanklistRow:
+    results = []
+    for problem in problems:
+        cell = cells.get(problem.index)
+        time, rejected = cell.result() if cell is not None else (None, 0)
+        results.append(
+            cf.ProblemResult(
+                points=0.0 if time is None else 1.0,
+                rejectedAttemptCount=rejected,
+                type=cf.ProblemResultType.FINAL,
+                bestSubmissionTimeSeconds=time,
+            )
+        )
+    return cf.RanklistRow(
+        party=party,
+        rank=rank,
+        points=float(solved),
+        penalty=penalty,
+        successfulHackCount=0,
+        unsuccessfulHackCount=0,
+        problemResults=results,
+    )
+
+
+class StandingsEngine:
+    """ICPC standings of a contest, computed from its submissions, and updated after each submission.
+
+    Teams are ranked by the number of solved problems, then by penalty: the sum, over the solved problems, of the minutes until the first accepted submission,
+    plus `penalty_minutes` per rejected attempt before it (compilation errors do not count).
+    Teams with equal results share the same rank. Practice (and manager) parties are listed after the ranked ones, with rank 0.
+    The rows match those of `contest.standings` for ICPC contests.
+
+    The ranked teams are kept in an order-statistic tree, so adding a submission, and getting the rank of a team, take O(log n):
+    dashboards can re-rank after every judged submission, without recomputing the whole ranklist.
+
+    Args:
+        problems: problems of the contest, in the order of the standings columns.
+        penalty_minutes: penalty per rejected attempt on a solved problem.
+    """
+
+    def __init__(self, problems: list[cf.Problem], *, penalty_minutes: int = 20):
+        self.problems = problems
+        self.penalty_minutes = penalty_minutes
+
+        self._teams: dict[Hashable, _Team] = {}
+        self._submissions: dict[int, tuple[Hashable, str]] = {}
+        self._ranked = OrderStatisticTree()
+        self._unranked = OrderStatisticTree()
+        self._by_key: dict[Key, _Team] = {}
+
+    def __len__(self) -> int:
+        """Number of teams"""
+        return len(self._teams)
+
+    def _tree(self, team: _Team) -> OrderStatisticTree:
+        return (
+            self._unranked if team.party.participantType in _UNRANKED else self._ranked
+        )
+
+    def _team(self, party: cf.Party) -> _Team:
+        key = cf.party_key(party)
+        team = self._teams.get(key)
+        if team is None:
+            team = self._teams[key] = _Team(party, (0, 0, len(self._teams)))
+            self._tree(team).insert(team.key)
+            self._by_key[team.key] = team
+        return team
+
+    def add_party(self, party: cf.Party):
+        """Add a team without submissions (for example, from an earlier ranklist), so that it is listed."""
+        self._team(party)
+
+    def _score(self, team: _Team) -> tuple[int, int]:
+        solved = penalty = 0
+        for cell in team.cells.values():
+            time, rejected = cell.result()
+            if time is not None:
+                solved += 1
+                penalty += time // 60 + self.penalty_minutes * rejected
+        return solved, penalty
+
+    def add(self, sub: cf.Submission) -> bool:
+        """Add a submission, or update it (for example, once it is judged, or after a rejudge).
+
+        Returns:
+            True if the result of its team changed.
+        """
+        team = self._team(sub.author)
+        index = sub.problem.index
+        previous = self._submissions.get(sub.id)
+        if previous is not None and previous != (cf.party_key(sub.author), index):
+            raise ValueError(f"submission {sub.id} changed its team or problem")
+
+        cell = team.cells.setdefault(index, _Cell())
+        attempt = _attempt(sub)
+        if cell.attempts.get(sub.id) == attempt:
+            return False
+        if attempt is None:
+            del cell.attempts[sub.id]
+            del self._submissions[sub.id]
+        else:
+            cell.attempts[sub.id] = attempt
+            self._submissions[sub.id] = (cf.party_key(sub.author), index)
+
+        solved, penalty = self._score(team)
+        key = (-solved, penalty, team.key[2])
+        if key != team.key:
+            tree = self._tree(team)
+            tree.remove(team.key)
+            del self._by_key[team.key]
+            team.key = key
+            tree.insert(key)
+            self._by_key[key] = team
+        return True
+
+    def extend(self, submissions: Iterable[cf.Submission]):
+        """Add several submissions, see :meth:`add`."""
+        for sub in submissions:
+            self.add(sub)
+
+    def rank(self, party: cf.Party) -> int:
+        """Rank of a team (0 for unranked parties), in O(log n)."""
+        team = self._teams[cf.party_key(party)]
+        if team.party.participantType in _UNRANKED:
+            return 0
+        return 1 + self._ranked.count_less(team.key[:2])
+
+    def _row(self, team: _Team, rank: int) -> cf.RanklistRow:
+        return _ranklist_row(
+            self.problems, team.party, team.cells, rank, -team.key[0], team.key[1]
+        )
+
+    def row(self, party: cf.Party) -> cf.RanklistRow:
+        """Standings row of a team"""
+        return self._row(self._teams[cf.party_key(party)], self.rank(party))
+
+    def ranklist(self) -> list[cf.RanklistRow]:
+        """All standings rows: the ranked teams by rank (ties in the order the teams were first seen), then the unranked ones."""
+        rows = []
+        rank = 0
+        previous = None
+        for i, key in enumerate(self._ranked):
+            if key[:2] != previous:
+                rank, previous = i + 1, key[:2]
+            rows.append(self._row(self._by_key[key], rank))
+        rows += [self._row(self._by_key[key], 0) for key in self._unranked]
+        return rows
+
+
+_SCORE_SCALE = 1 << 32
+"""Scores of the timeline are packed into integers: `-solved * _SCORE_SCALE + penalty` (smaller is better)"""
+
+
+class StandingsTimeline:
+    """ICPC standings of a finished contest at any point of time ("standings at minute t"), for freeze analysis and replays.
+
+    Built once from the submissions of the contest, with the same rules as :class:`StandingsEngine`. It keeps:
+
+    - per team, its attempts and the times at which its score (solved, penalty) changed;
+    - all score changes of the ranked teams, ordered by time;
+    - a checkpoint every `interval_seconds` (and at the given `checkpoints`): the sorted scores of the ranked teams at that time.
+
+    The rank of a team at time `t` is a binary search in the checkpoint before `t`, corrected by the score changes since then,
+    so it does not replay the contest from the start. :meth:`standings` needs one binary search per team.
+
+    Args:
+        problems: problems of the contest, in the order of the standings columns.
+        parties: teams to list, even without submissions (for example, the parties of the final ranklist).
+        submissions: submissions of the contest, in any order.
+        interval_seconds: time between two checkpoints.
+        checkpoints: additional checkpoint times, for example the start of the freeze.
+        penalty_minutes: penalty per rejected attempt on a solved problem.
+    """
+
+    def __init__(
+        self,
+        problems: list[cf.Problem],
+        parties: Iterable[cf.Party],
+        submissions: Iterable[cf.Submission],
+        *,
+        interval_seconds: int = 5 * 60,
+        checkpoints: Iterable[int] = (),
+        penalty_minutes: int = 20,
+    ):
+        self.problems = problems
+        self.penalty_minutes = penalty_minutes
+
+        self._parties: list[cf.Party] = []
+        self._index: dict[Hashable, int] = {}
+        for party in parties:
+            self._team(party)
+
+        attempts: list[tuple[int, int, int, str, bool]] = []
+        for sub in submissions:
+            attempt = _attempt(sub)
+            if attempt is not None:
+                time, ok = attempt
+                attempts.append(
+                    (time, sub.id, self._team(sub.author), sub.problem.index, ok)
+                )
+        attempts.sort()
+
+        teams = len(self._parties)
+        self._attempts: list[list[tuple[int, int, str, bool]]] = [
+            [] for _ in range(teams)
+        ]
+        self._score_times = [array("q") for _ in range(teams)]
+        self._scores = [array("q") for _ in range(teams)]
+        self._event_times = array("q")
+        self._event_teams = array("q")
+        self._event_old = array("q")
+        self._event_new = array("q")
+
+        # unranked parties (e.g. practice, with huge times) do not need checkpoints
+        times = [
+            attempt[0]
+            for attempt in attempts
+            if self._parties[attempt[2]].participantType not in _UNRANKED
+        ]
+        start = min(times[0], 0) if times else 0
+        end = times[-1] if times else 0
+        self._checkpoint_times = sorted(
+            {start, *range(0, end + 1, interval_seconds)}
+            | {t for t in checkpoints if start <= t}
+        )
+        self._checkpoints: list[array] = []
+
+        scores = [0] * teams
+        solved: list[dict[str, Optional[int]]] = [{} for _ in range(teams)]
+        rejected: list[dict[str, int]] = [{} for _ in range(teams)]
+        for time, sub_id, team, index, ok in attempts:
+            self._checkpoint_until(time - 1, scores)
+            self._attempts[team].append((time, sub_id, index, ok))
+            if solved[team].get(index) is not None:
+                continue
+            if not ok:
+                rejected[team][index] = rejected[team].get(index, 0) + 1
+                continue
+            solved[team][index] = time
+            old = scores[team]
+            scores[team] += (
+                -_SCORE_SCALE
+                + time // 60
+                + self.penalty_minutes * rejected[team].get(index, 0)
+            )
+            self._score_times[team].append(time)
+            self._scores[team].append(scores[team])
+            if self._parties[team].participantType not in _UNRANKED:
+                self._event_times.append(time)
+                self._event_teams.append(team)
+                self._event_old.append(old)
+                self._event_new.append(scores[team])
+        self._checkpoint_until(self._checkpoint_times[-1], scores)
+
+    def _team(self, party: cf.Party) -> int:
+        key = cf.party_key(party)
+        team = self._index.get(key)
+        if team is None:
+            team = self._index[key] = len(self._parties)
+            self._parties.append(party)
+        return team
+
+    def _checkpoint_until(self, time: int, scores: list[int]):
+        """Take the checkpoints up to `time`, with the current `scores`"""
+        while (
+            len(self._checkpoints) < len(self._checkpoint_times)
+            and self._checkpoint_times[len(self._checkpoints)] <= time
+        ):
+            ranked = (
+                score
+                for score, party in zip(scores, self._parties)
+                if party.participantType not in _UNRANKED
+            )
+            self._checkpoints.append(array("q", sorted(ranked)))
+
+    def __len__(self) -> int:
+        """Number of teams"""
+        return len(self._parties)
+
+    def _score(self, team: int, time: int) -> int:
+        i = bisect.bisect_right(self._score_times[team], time)
+        return self._scores[team][i - 1] if i else 0
+
+    def score(self, party: cf.Party, time: int) -> tuple[int, int]:
+        """(solved, penalty) of a team at `time` (relative to the start, in seconds), after the attempts up to that time"""
+        score = self._score(self._index[cf.party_key(party)], time)
+        return -(score // _SCORE_SCALE), score % _SCORE_SCALE
+
+    def rank(self, party: cf.Party, time: int) -> int:
+        """Rank of a team at `time` (0 for unranked parties)"""
+        team = self._index[cf.party_key(party)]
+        if self._parties[team].participantType in _UNRANKED:
+            return 0
+        score = self._score(team, time)
+
+        c = bisect.bisect_right(self._checkpoint_times, time) - 1
+        if c < 0:
+            return 1
+        better = bisect.bisect_left(self._checkpoints[c], score)
+        lo = bisect.bisect_right(self._event_times, self._checkpoint_times[c])
+        hi = bisect.bisect_right(self._event_times, time)
+        for i in range(lo, hi):
+            better += (self._event_new[i] < score) - (self._event_old[i] < score)
+        return 1 + better
+
+    def _row(self, team: int, time: int, rank: int) -> cf.RanklistRow:
+        cells: dict[str, _Cell] = {}
+        for attempt_time, sub_id, index, ok in self._attempts[team]:
+            if attempt_time > time:
+                break
+            cells.setdefault(index, _Cell()).attempts[sub_id] = (attempt_time, ok)
+        score = self._score(team, time)
+        return _ranklist_row(
+            self.problems,
+            self._parties[team],
+            cells,
+            rank,
+            -(score // _SCORE_SCALE),
+            score % _SCORE_SCALE,
+        )
+
+    def row(self, party: cf.Party, time: int) -> cf.RanklistRow:
+        """Standings row of a team at `time`"""
+        return self._row(self._index[cf.party_key(party)], time, self.rank(party, time))
+
+    def standings(self, time: int) -> list[cf.RanklistRow]:
+        """All standings rows at `time`, in the order of :meth:`StandingsEngine.ranklist`."""
+        ranked: list[tuple[int, int]] = []
+        unranked: list[tuple[int, int]] = []
+        for team, party in enumerate(self._parties):
+            teams = unranked if party.participantType in _UNRANKED else ranked
+            teams.append((self._score(team, time), team))
+        ranked.sort()
+        unranked.sort()
+
+        rows = []
+        rank = 0
+        previous = None
+        for i, (score, team) in enumerate(ranked):
+            if score != previous:
+                rank, previous = i + 1, score
+            rows.append(self._row(team, time, rank))
+        rows += [self._row(team, time, 0) for _, team in unranked]
+        return rows
+
+
+__all__ = ["OrderStatisticTree", "StandingsEngine", "StandingsTimeline"]
@@ -0,0 +1,158 @@
+import dataclasses
+import random
+
+import cfutils.api as cf
+import cfutils.icpctools.feed_generator as feed_gen
+from cfutils.icpctools.standings import (
+    OrderStatisticTree,
+    StandingsEngine,
+    StandingsTimeline,
+)
+
+
+def load() -> tuple[cf.Contest_Standings.Result, list[cf.Submission]]:
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=104491, From=1, count=10000, showUnofficial=True
+    ).get(load_from_file="data/examples/resolverfeed/standings_104491.json")
+    submissions: list[cf.Submission] = cf.Contest_Status(
+        contestId=104491, From=1, count=25000
+    ).get(load_from_file="data/examples/resolverfeed/status_104491.json")
+    return standings, submissions
+
+
+def summary(rows: list[cf.RanklistRow]) -> list:
+    """Rows in a canonical order, as the order of tied rows is not specified."""
+    return sorted(
+        (
+            (row.rank, row.points, row.penalty, repr(cf.party_key(row.party))),
+            row.problemResults,
+        )
+        for row in rows
+    )
+
+
+def test_standings_match_contest_standings():
+    standings, submissions = load()
+    engine = StandingsEngine(standings.problems)
+    for row in standings.rows:
+        engine.add_party(row.party)
+    engine.extend(reversed(submissions))
+
+    assert summary(engine.ranklist()) == summary(standings.rows)
+    for row in standings.rows:
+        assert engine.rank(row.party) == row.rank
+
+    # the order of the submissions does not matter
+    shuffled = StandingsEngine(standings.problems)
+    for row in standings.rows:
+        shuffled.add_party(row.party)
+    shuffled.extend(random.Random(0).sample(submissions, len(submissions)))
+    assert summary(shuffled.ranklist()) == summary(standings.rows)
+
+
+def test_standings_incremental_updates():
+    standings, submissions = load()
+    engine = StandingsEngine(standings.problems)
+    accepted = next(
+        sub for sub in reversed(submissions) if sub.verdict == cf.Verdict.OK
+    )
+
+    pending = dataclasses.replace(accepted, verdict=cf.Verdict.TESTING)
+    assert not engine.add(pending)
+    assert engine.row(accepted.author).points == 0
+    assert engine.add(accepted)
+    assert engine.row(accepted.author).points == 1
+    assert engine.rank(accepted.author) == 1
+    assert not engine.add(accepted)
+
+    # rejudged as rejected
+    assert engine.add(dataclasses.replace(accepted, verdict=cf.Verdict.WRONG_ANSWER))
+    row = engine.row(accepted.author)
+    assert row.points == 0
+    assert (
+        row.problemResults[
+            [p.index for p in standings.problems].index(accepted.problem.index)
+        ].rejectedAttemptCount
+        == 1
+    )
+
+
+def test_order_statistic_tree():
+    rng = random.Random(1)
+    tree = OrderStatisticTree()
+    keys: set[tuple[int, int, int]] = set()
+    for i in range(2000):
+        if keys and rng.random() < 0.3:
+            key = rng.choice(sorted(keys))
+            keys.remove(key)
+            tree.remove(key)
+        else:
+            key = (rng.randrange(-5, 0), rng.randrange(100), i)
+            keys.add(key)
+            tree.insert(key)
+        probe = (rng.randrange(-5, 0), rng.randrange(100))
+        assert tree.count_less(probe) == sum(1 for k in keys if k[:2] < probe)
+    assert list(tree) == sorted(keys)
+    assert len(tree) == len(keys)
+
+
+def test_standings_timeline():
+    standings, submissions = load()
+    parties = [row.party for row in standings.rows]
+    timeline = StandingsTimeline(
+        standings.problems, parties, submissions, interval_seconds=30 * 60
+    )
+    end = max(sub.relativeTimeSeconds for sub in submissions)
+    assert summary(timeline.standings(end)) == summary(standings.rows)
+
+    rng = random.Random(2)
+    for time in [
+        -1,
+        0,
+        59,
+        60 * 60,
+        *(rng.randrange(0, 5 * 60 * 60) for _ in range(5)),
+    ]:
+        engine = StandingsEngine(standings.problems)
+        for party in parties:
+            engine.add_party(party)
+        engine.extend(sub for sub in submissions if sub.relativeTimeSeconds <= time)
+
+        assert summary(timeline.standings(time)) == summary(engine.ranklist())
+        for party in parties:
+            assert timeline.rank(party, time) == engine.rank(party)
+            row = engine.row(party)
+            assert timeline.score(party, time) == (row.points, row.penalty)
+
+
+def test_feed_generator_timeline():
+    standings, submissions = load()
+    gen = feed_gen.EventFeedFromCFContest(
+        config=feed_gen.CFContestConfig(freezeDurationSeconds=60 * 60)
+    )
+    freeze = gen.freezeTimeSeconds(standings.contest)
+    assert freeze == standings.contest.durationSeconds - 60 * 60
+
+    timeline = gen.timeline(
+        contest=standings.contest,
+        problems=standings.problems,
+        ranklist=standings.rows,
+        submissions=submissions,
+    )
+    contestants = [
+        row
+        for row in standings.rows
+        if row.party.participantType == cf.ParticipantType.CONTESTANT
+    ]
+    assert len(timeline) == len(contestants)
+
+    engine = StandingsEngine(standings.problems)
+    for row in contestants:
+        engine.add_party(row.party)
+    engine.extend(
+        sub
+        for sub in submissions
+        if sub.relativeTimeSeconds < freeze
+        and sub.author.participantType == cf.ParticipantType.CONTESTANT
+    )
+    assert summary(timeline.standings(freeze - 1)) == summary(engine.ranklist())
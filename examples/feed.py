@@ -1,5 +1,9 @@
 import os
+import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
 import click
 from dotenv import load_dotenv
 
@@ -21,8 +25,37 @@ from cfutils.icpctools.feed_generator import CFContestConfig, EventFeedFromCFCon
 @click.option(
     "--auth", is_flag=True, default=False, help="authorize (sign) the API call"
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="cache API responses in this directory",
+)
+@click.option(
+    "--snapshots",
+    is_flag=True,
+    default=False,
+    help="keep binary snapshots of the parsed JSON files next to them (`<file>.snapshot`), to reload them faster",
+)
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="serialize the submissions of the feed in parallel, using this many processes",
+)
 @click.option("--verbose", is_flag=True, default=False, help="display debug messages")
-def cli(contest_id, status_file, standings_file, feed_file, unofficial, auth, verbose):
+def cli(
+    contest_id,
+    status_file,
+    standings_file,
+    feed_file,
+    unofficial,
+    auth,
+    cache_dir,
+    snapshots,
+    processes,
+    verbose,
+):
     """Tool to download contest standings and generate feed for ICPC resolver.
     All files above are JSON.
 
@@ -42,14 +75,52 @@ def cli(contest_id, status_file, standings_file, feed_file, unofficial, auth, ve
         assert os.getenv("CODEFORCES_API_KEY") is not None
         assert os.getenv("CODEFORCES_API_SECRET") is not None
 
+    cache = cf.ResponseCache(cache_dir) if cache_dir is not None else None
+    # share the parties (and problems) between the submissions and the standings
+    interner = cf.Interner()
+
     # get contest data from codeforces
-    submissions: list[cf.Submission] = cf.Contest_Status(
-        contestId=contest_id, From=1, count=25000
-    ).get(auth=auth, output_file=status_file, load_from_file=status_file)
+    status = cf.Contest_Status(contestId=contest_id, From=1, count=10000)
+    submissions: list[cf.Submission]
+    if os.path.isfile(status_file):
+        submissions = status.get(
+            load_from_file=status_file,
+            interner=interner,
+            snapshot=f"{status_file}.snapshot" if snapshots else None,
+        )
+    else:
+        # fetch all pages, so that large contests are not truncated
+        submissions = list(
+            status.iter_items(
+                page_size=10000, auth=auth, cache=cache, interner=interner
+            )
+        )
+        logging.info("saving submissions to file: %s", status_file)
+        with open(status_file, "w") as outf:
+            result = [sub.to_dict() for sub in submissions]
+            json.dump({"status": "OK", "result": result}, outf, indent=2)
 
-    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+    standings_method = cf.Contest_Standings(
         contestId=contest_id, From=1, count=10000, showUnofficial=unofficial
-    ).get(auth=auth, output_file=standings_file, load_from_file=standings_file)
+    )
+    standings: cf.Contest_Standings.Result
+    if os.path.isfile(standings_file):
+        standings = standings_method.get(
+            load_from_file=standings_file,
+            interner=interner,
+            snapshot=f"{standings_file}.snapshot" if snapshots else None,
+        )
+    else:
+        # the contest and its problems, then all pages of rows, so that large contests are not truncated
+        kwargs = {"auth": auth, "cache": cache, "interner": interner}
+        header = replace(standings_method, count=1).get(**kwargs)
+        rows = list(standings_method.iter_items(page_size=10000, **kwargs))
+        standings = cf.Contest_Standings.Result(
+            contest=header.contest, problems=header.problems, rows=rows
+        )
+        logging.info("saving standings to file: %s", standings_file)
+        with open(standings_file, "w") as outf:
+            json.dump({"status": "OK", "result": standings.to_dict()}, outf, indent=2)
 
     # generate the event feed
     feedGen = EventFeedFromCFContest(
@@ -60,17 +131,18 @@ def cli(contest_id, status_file, standings_file, feed_file, unofficial, auth, ve
             strict_mode=True,
         )
     )
-    feed = feedGen.generate(
-        contest=standings.contest,
-        problems=standings.problems,
-        ranklist=standings.rows,
-        submissions=submissions,
-    )
-
-    with open(feed_file, "w") as outf:
-        for event in feed:
-            outf.write(event)
-            outf.write("\n")
+    # the worker processes are shut down even if the generation fails
+    with (
+        ProcessPoolExecutor(processes) if processes else nullcontext()
+    ) as executor, open(feed_file, "w") as outf:
+        feedGen.write(
+            outf,
+            contest=standings.contest,
+            problems=standings.problems,
+            ranklist=standings.rows,
+            submissions=submissions,
+            executor=executor,
+        )
     logging.info(f"Contest {standings.contest.id} feed generated! Wrote to {feed_file}")
 
 
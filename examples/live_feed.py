@@ -0,0 +1,90 @@
+import os
+import time
+import logging
+import click
+from dotenv import load_dotenv
+
+import cfutils.api as cf
+from cfutils.icpctools.feed_generator import CFContestConfig
+from cfutils.icpctools.live_feed import LiveEventFeed
+
+
+@click.command()  # type: ignore
+@click.argument("contest_id", type=int)
+@click.argument("feed_file", type=click.Path(dir_okay=False))
+@click.option(
+    "--interval",
+    type=float,
+    default=60,
+    show_default=True,
+    help="seconds between polls",
+)
+@click.option(
+    "--unofficial",
+    is_flag=True,
+    default=False,
+    help="also include virtual and out of competition participants",
+)
+@click.option(
+    "--auth", is_flag=True, default=False, help="authorize (sign) the API calls"
+)
+@click.option("--verbose", is_flag=True, default=False, help="display debug messages")
+def cli(contest_id, feed_file, interval, unofficial, auth, verbose):
+    """Tool to follow a running contest, and append its new events to a feed file (for ICPC tools that follow an event feed).
+    Stops when the contest is finished and all the submissions are judged.
+
+    Example usage:
+
+    `python live_feed.py 104491 feed.json --interval 30`
+    """
+
+    logging.basicConfig(
+        format="[%(levelname)s]: %(message)s",
+        level=logging.DEBUG if verbose else logging.INFO,
+    )
+
+    # load API keys if neccessary
+    if auth:
+        assert load_dotenv()
+        assert os.getenv("CODEFORCES_API_KEY") is not None
+        assert os.getenv("CODEFORCES_API_SECRET") is not None
+
+    standings: cf.Contest_Standings.Result = cf.Contest_Standings(
+        contestId=contest_id, From=1, count=10000, showUnofficial=unofficial
+    ).get(auth=auth)
+
+    live = LiveEventFeed(
+        feed_file,
+        contestId=contest_id,
+        config=CFContestConfig(
+            freezeDurationSeconds=60 * 60,
+            include_virtual=unofficial,
+            include_out_of_comp=unofficial,
+        ),
+        asManager=auth,
+    )
+    live.start(
+        contest=standings.contest,
+        problems=standings.problems,
+        ranklist=standings.rows,
+    )
+
+    while True:
+        live.poll(auth=auth)
+        if (
+            standings.contest.phase == cf.ContestPhase.FINISHED
+            and not live.sync.pending
+        ):
+            break
+        time.sleep(interval)
+        # only the contest is needed, not the ranklist
+        standings = cf.Contest_Standings(contestId=contest_id, From=1, count=1).get(
+            auth=auth
+        )
+
+    live.finish(contest=standings.contest)
+    logging.info(f"Contest {contest_id} is over! Wrote to {feed_file}")
+
+
+if __name__ == "__main__":
+    cli()  # type: ignore